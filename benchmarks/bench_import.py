@@ -0,0 +1,57 @@
+"""Measure the cost of importing metexon in a fresh interpreter.
+
+Each statement runs in a new subprocess (so nothing is cached in
+``sys.modules``); the median wall time of the import and whether bleak got
+loaded are reported.
+
+Usage::
+
+    python benchmarks/bench_import.py --runs 15
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import metexon",
+    "from metexon.zellenradschleuse.structures import SystemState",
+    "from metexon import ZellenradschleuseClient",
+]
+
+_PROBE = (
+    "import sys, time\n"
+    "t0 = time.perf_counter()\n"
+    "{stmt}\n"
+    "print(time.perf_counter() - t0, 'bleak' in sys.modules)\n"
+)
+
+
+def measure(stmt: str, runs: int) -> tuple:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    times = []
+    bleak_loaded = False
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(stmt=stmt)], env=env,
+                             capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        bleak_loaded = out[1] == "True"
+    return statistics.median(times), bleak_loaded
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=15)
+    args = ap.parse_args()
+    print(f"{'statement':<64} {'median':>9} {'bleak':>6}")
+    for stmt in STATEMENTS:
+        median_s, bleak_loaded = measure(stmt, args.runs)
+        print(f"{stmt:<64} {median_s * 1000:>7.1f}ms {'yes' if bleak_loaded else 'no':>6}")
+
+
+if __name__ == "__main__":
+    main()
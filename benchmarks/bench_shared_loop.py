@@ -0,0 +1,72 @@
+"""Compare dedicated per-client loop threads with the shared loop thread.
+
+Connects N sync clients to simulated devices, then reads the system state of
+every device from a pool of worker threads (as an application polling a
+fleet would) and reports thread count, connect/disconnect time and read
+throughput.
+
+Usage::
+
+    python benchmarks/bench_shared_loop.py --devices 40 --reads 20 --latency 0.005
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def run(devices: int, reads: int, latency_s: float, shared: bool) -> dict:
+    threads_before = threading.active_count()
+    clients = [
+        ZellenradschleuseClient(f"SIM-{i}", client_factory=SimulatedZellenradschleuse(latency_s=latency_s),
+                                shared_loop=shared)
+        for i in range(devices)
+    ]
+    t0 = time.perf_counter()
+    for c in clients:
+        c.connect()
+    connect_s = time.perf_counter() - t0
+    loop_threads = threading.active_count() - threads_before
+
+    def poll(c: ZellenradschleuseClient) -> None:
+        for _ in range(reads):
+            c.read_system_state()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=devices) as pool:
+        list(pool.map(poll, clients))
+    read_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for c in clients:
+        c.disconnect()
+    disconnect_s = time.perf_counter() - t0
+    return {
+        "loop_threads": loop_threads,
+        "connect_s": connect_s,
+        "reads_per_s": devices * reads / read_s,
+        "disconnect_s": disconnect_s,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--devices", type=int, default=40)
+    ap.add_argument("--reads", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.005, help="Simulated GATT latency [s]")
+    args = ap.parse_args()
+    print(f"{args.devices} devices, {args.reads} reads each, {args.latency * 1000:.1f} ms latency")
+    print(f"{'mode':<10} {'threads':>8} {'connect':>10} {'reads/s':>10} {'disconnect':>11}")
+    for shared in (False, True):
+        r = run(args.devices, args.reads, args.latency, shared)
+        print(f"{'shared' if shared else 'dedicated':<10} {r['loop_threads']:>8} {r['connect_s']:>9.3f}s "
+              f"{r['reads_per_s']:>10.0f} {r['disconnect_s']:>10.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Measure decode + to_json throughput of the Zellenradschleuse structures.
+
+Compares, per structure, the ``asdict`` based ``to_json`` the dataclasses
+used to have, the dataclasses as they are now and the slotted records
+(``SystemStateRecord`` & co.). Each row is ``from_bytes(payload).to_json()``
+(and ``from_bytes`` alone) on a fixed payload. A last table compares reading
+only the two pressures of a system state: full decode versus a lazy
+``SystemStateView`` rebound to each payload.
+
+Usage::
+
+    python benchmarks/bench_structures.py --number 100000
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import timeit
+
+from metexon.zellenradschleuse.structures import (
+    RGB, BlowerPID, BlowerPIDRecord, ManualControl, ManualControlRecord, SystemState, SystemStateRecord,
+)
+from metexon.zellenradschleuse.views import SystemStateView
+
+
+def _asdict_json(obj):
+    # The former implementation of the dataclasses' to_json.
+    d = dataclasses.asdict(obj)
+    if isinstance(obj, SystemState):
+        d['rgb'] = [c.to_tuple() for c in obj.rgb]
+    elif isinstance(obj, ManualControl):
+        d['reserved'] = list(obj.reserved)
+    else:
+        d['reserved_floats'] = list(obj.reserved_floats)
+    return d
+
+
+CASES = [
+    ("SystemState", SystemState, SystemStateRecord,
+     SystemState(3, 101.5, 99.25, 1013.0, 0.75, 512, 128, 800, 1500.5,
+                 [RGB(10, 20, 30), RGB(40, 50, 60)], 42, 9999).to_bytes()),
+    ("BlowerPID", BlowerPID, BlowerPIDRecord,
+     BlowerPID(1.0, 0.5, 0.1, 100.0, 95.0, 5.0, 10.0, 111, 222, 10, 1023, 50, 3, 123456, 0.0, 25.0,
+               (0.0, 0.0, 0.0, 0.0)).to_bytes()),
+    ("ManualControl", ManualControl, ManualControlRecord,
+     ManualControl(1200.0, 55.5, 66.6, 1, 5.0).to_bytes()),
+]
+
+
+def per_call_us(fn, number: int, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--number", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    print(f"{'structure':<14} {'variant':<22} {'decode':>9} {'decode+json':>12} {'calls/s':>10}")
+    for name, cls, record_cls, payload in CASES:
+        variants = [
+            ("dataclass (asdict)", lambda: cls.from_bytes(payload), lambda: _asdict_json(cls.from_bytes(payload))),
+            ("dataclass", lambda: cls.from_bytes(payload), lambda: cls.from_bytes(payload).to_json()),
+            ("record (__slots__)", lambda: record_cls.from_bytes(payload),
+             lambda: record_cls.from_bytes(payload).to_json()),
+        ]
+        for variant, decode, decode_json in variants:
+            decode_us = per_call_us(decode, args.number, args.repeat)
+            total_us = per_call_us(decode_json, args.number, args.repeat)
+            print(f"{name:<14} {variant:<22} {decode_us:>7.2f}us {total_us:>10.2f}us {1e6 / total_us:>10.0f}")
+
+    payload = bytearray(CASES[0][3])
+    view = SystemStateView(payload)
+
+    def view_fields():
+        view.rebind(payload)
+        return view.pressure1, view.pressure2
+
+    def view_pressures():
+        view.rebind(payload)
+        return view.pressures()
+
+    print(f"\n{'pressure1 + pressure2 of a system state':<40} {'per read':>9}")
+    for variant, fn in [
+        ("SystemState.from_bytes", lambda: (lambda s: (s.pressure1, s.pressure2))(SystemState.from_bytes(payload))),
+        ("SystemStateRecord.from_bytes",
+         lambda: (lambda s: (s.pressure1, s.pressure2))(SystemStateRecord.from_bytes(payload))),
+        ("SystemStateView (new per read)", lambda: (lambda v: (v.pressure1, v.pressure2))(SystemStateView(payload))),
+        ("SystemStateView.rebind + 2 fields", view_fields),
+        ("SystemStateView.rebind + pressures()", view_pressures),
+    ]:
+        print(f"{variant:<40} {per_call_us(fn, args.number, args.repeat):>7.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,17 +12,17 @@ Run: python examples/client_no_disconnect.py
 """
 from time import sleep
 
-from metexon import discover_metexon
+from metexon.discovery import discover_metexon_one
 from metexon.zellenradschleuse import ZellenradschleuseClient
 
 
 print("Discovering Metexon devices...")
-found = discover_metexon(timeout=5.0)
+found = discover_metexon_one(timeout=5.0, cache=True)
 if not found:
     print("No Metexon devices found.")
     raise SystemExit(1)
 
-device_info = found[0]
+device_info = found
 addr = device_info["address"]
 print(f"Using device: {addr} ({device_info.get('name')})")
 
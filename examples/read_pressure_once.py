@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """Minimal inline example: discover, read pressures once, print, exit."""
-from metexon import discover_metexon
+from metexon.discovery import discover_metexon_one
 from metexon.zellenradschleuse import ZellenradschleuseClient
 
 # Find devices
-found = discover_metexon(timeout=10.0)
+found = discover_metexon_one(timeout=10.0, cache=True)
 if not found:
     raise SystemExit("No Metexon device found")
-addr = found[0]["address"]
+addr = found["address"]
 
 # Read pressure once
 with ZellenradschleuseClient(addr) as dev:
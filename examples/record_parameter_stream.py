@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Record the parameter stream of a device to a binary file and summarize it.
+
+Usage:
+    python examples/record_parameter_stream.py session.mxps [seconds]
+"""
+from __future__ import annotations
+
+import sys
+
+from metexon.discovery import discover_metexon_one
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.parameter_stream_recording import (
+    ParameterStreamRecorder,
+    ParameterStreamRecording,
+)
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else "session.mxps"
+    duration_s = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+
+    found = discover_metexon_one(timeout=10.0, cache=True)
+    if not found:
+        raise SystemExit("No Metexon device found")
+    address = found["address"]
+
+    with ZellenradschleuseClient(address) as zr:
+        entries = zr.parameter_stream_list()
+        zr.parameter_stream_start(interval_ms=150, ids=[int(e["id"]) for e in entries])
+        with ParameterStreamRecorder(path, entries, metadata={"address": address}) as rec:
+            for frame in zr.iter_parameter_stream_frames(duration_s=duration_s):
+                rec.write(frame)
+        zr.parameter_stream_stop()
+    print(f"Recorded {rec.frames_written} frames to {path}")
+
+    # Replay: records are memory-mapped, not loaded into RAM
+    replay = ParameterStreamRecording(path)
+    names = replay.parameter_names()
+    batch = replay.decode()
+    for pid, name in sorted(names.items()):
+        values = batch.value[batch.parameter_id == pid]
+        if len(values):
+            print(f"  {pid:3d}  {name:<24} n={len(values):6d}  mean={values.mean():.4g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,24 @@
 #!/usr/bin/env python3
 """List available stream parameters and print live binary BLE parameter frames.
 
+Frames are received via GATT notifications when the firmware supports them,
+otherwise by polling the data characteristic.
+
 Usage:
     python examples/stream_parameters.py
 """
 from __future__ import annotations
 
-import time
-from metexon import discover_metexon
+from metexon.discovery import discover_metexon_one
 from metexon.zellenradschleuse import ZellenradschleuseClient
 
 
 def main() -> None:
-    found = discover_metexon(timeout=10.0)
+    found = discover_metexon_one(timeout=10.0, cache=True)
     if not found:
         raise SystemExit("No Metexon device found")
 
-    dev = found[0]
+    dev = found
     address = dev["address"]
     print(f"Using {dev.get('name', 'Metexon')} @ {address}")
 
@@ -32,12 +34,7 @@ def main() -> None:
 
         print("\nTimestamp(us)      ID   Value")
         print("-" * 52)
-        t_end = time.monotonic() + 20.0
-        while time.monotonic() < t_end:
-            frame = zr.read_parameter_stream_frame()
-            if frame is None:
-                time.sleep(0.03)
-                continue
+        for frame in zr.iter_parameter_stream_frames(duration_s=20.0):
             print(f"{frame.timestamp_us:14d}  {frame.parameter_id:3d}  {frame.value}")
 
         zr.parameter_stream_stop()
@@ -10,7 +10,7 @@ from metexon.zellenradschleuse import ZellenradschleuseClient
 from metexon.zellenradschleuse.update_helpers import partial_blower_pid
 
 # Quick discovery
-found = discover_metexon_one(timeout=10.0)
+found = discover_metexon_one(timeout=10.0, cache=True)
 if not found:
     raise SystemExit("No Metexon device found")
 addr = found["address"]
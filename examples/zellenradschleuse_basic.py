@@ -3,17 +3,17 @@
 
 Run: python examples/zellenradschleuse_basic.py
 """
-from metexon import discover_metexon
+from metexon.discovery import discover_metexon_one
 from metexon.zellenradschleuse import ZellenradschleuseClient
 
 # Discover devices
 print("Discovering Metexon devices...")
-found = discover_metexon(timeout=5.0)
+found = discover_metexon_one(timeout=5.0, cache=True)
 if not found:
     print("No Metexon devices found.")
     raise SystemExit(1)
 
-device_info = found[0]
+device_info = found
 print("Using device:", device_info)
 addr = device_info['address']
 
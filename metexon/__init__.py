@@ -14,16 +14,56 @@ Basic example (typed):
         print(zr.read_system_state())
     finally:
         zr.disconnect()
+
+Public names are imported lazily (PEP 562) so ``import metexon`` stays cheap
+and does not load bleak until a client, discovery or reconnect helper is
+actually used.
 """
-from .client import Zellenradschleuse  # noqa: F401
-from .zellenradschleuse import ZellenradschleuseClient  # noqa: F401
-from .zellenradschleuse import sentinels as zsentinels  # noqa: F401
-from .discovery import discover_metexon, adiscover_metexon  # noqa: F401
-
-__all__ = [
-    "Zellenradschleuse",
-    "ZellenradschleuseClient",
-    "zsentinels",
-    "discover_metexon",
-    "adiscover_metexon",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import Zellenradschleuse  # noqa: F401
+    from .zellenradschleuse import ZellenradschleuseClient, AsyncZellenradschleuseClient  # noqa: F401
+    from .zellenradschleuse import sentinels as zsentinels  # noqa: F401
+    from .discovery import discover_metexon, adiscover_metexon  # noqa: F401
+    from .exceptions import MetexonError, ConnectionLostError, OperationTimeoutError  # noqa: F401
+    from .deadlines import call_deadline  # noqa: F401
+    from .supervisor import ReconnectPolicy  # noqa: F401
+    from .tracing import Tracer, set_tracer  # noqa: F401
+
+# name -> (module, attribute); attribute None means the module itself
+_LAZY = {
+    "Zellenradschleuse": (".client", "Zellenradschleuse"),
+    "ZellenradschleuseClient": (".zellenradschleuse.client", "ZellenradschleuseClient"),
+    "AsyncZellenradschleuseClient": (".zellenradschleuse.client", "AsyncZellenradschleuseClient"),
+    "zsentinels": (".zellenradschleuse.sentinels", None),
+    "discover_metexon": (".discovery", "discover_metexon"),
+    "adiscover_metexon": (".discovery", "adiscover_metexon"),
+    "MetexonError": (".exceptions", "MetexonError"),
+    "ConnectionLostError": (".exceptions", "ConnectionLostError"),
+    "OperationTimeoutError": (".exceptions", "OperationTimeoutError"),
+    "call_deadline": (".deadlines", "call_deadline"),
+    "ReconnectPolicy": (".supervisor", "ReconnectPolicy"),
+    "Tracer": (".tracing", "Tracer"),
+    "set_tracer": (".tracing", "set_tracer"),
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
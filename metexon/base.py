@@ -1,60 +1,275 @@
 """Shared base class for Metexon BLE devices.
 
 Encapsulates connection management and optional context manager support.
+
+Devices can be used synchronously (``connect()`` / ``with``), in which case
+coroutines run on a background :class:`~metexon.loop_thread.AsyncLoopThread`
+shared by all sync clients of the process (``shared_loop=False`` gives a
+client its own thread), or natively from asyncio code (``await aconnect()`` / ``async with``), in
+which case they run on the caller's event loop. Pass ``auto_loop=False`` for
+purely asynchronous use to avoid starting the loop thread.
+
+With ``reconnect=True`` (or a :class:`~metexon.supervisor.ReconnectPolicy`)
+the connection is supervised: a dropped link is restored in the background
+and pending operations wait for it, see :mod:`metexon.supervisor`.
+
+Sync calls can be given a deadline: ``call_timeout`` sets the default for
+all calls of a device and :func:`metexon.deadlines.call_deadline` overrides
+it for a block. On expiry the operation is cancelled on the loop and
+:class:`~metexon.exceptions.OperationTimeoutError` is raised;
+:meth:`BaseMetexonDevice.timeout_counts` tells which characteristics hung.
+
+``gatt_cache=True`` (or a :class:`~metexon.gatt_cache.GattCache`) remembers
+the discovered services on disk so reconnects only discover the services in
+``_GATT_SERVICES``.
+
+Every GATT read and write is timed per characteristic UUID into a
+constant-memory latency histogram (:mod:`metexon.gatt_stats`);
+:meth:`BaseMetexonDevice.gatt_stats` returns call/error/byte counts and
+latency quantiles, and ``stats_interval_s`` logs (or passes to
+``stats_callback``) a summary periodically while connected.
+
+``client_factory`` replaces ``BleakClient`` (called as
+``client_factory(address, timeout=...)``), e.g. with
+:class:`~metexon.zellenradschleuse.simulator.SimulatedZellenradschleuse` for
+tests without hardware.
 """
 from __future__ import annotations
 
-from typing import Optional, Any, Coroutine, TypeVar
+import asyncio
+import logging
+from concurrent.futures import Future
+from typing import Optional, Any, Callable, Coroutine, Dict, List, Tuple, TypeVar, Union
+from uuid import UUID
 from bleak import BleakClient
 
-from .loop_thread import AsyncLoopThread
+from .loop_thread import AsyncLoopThread, acquire_shared_loop_thread, release_shared_loop_thread
+from . import constants, tracing
+from .constants import DEVICE_TYPE_UUID
+from .deadlines import deadline_override
+from .exceptions import ConnectionLostError
+from .gatt import GattClient
+from .gatt_cache import GattCache
+from .supervisor import ConnectionSupervisor, ReconnectPolicy
 
 T = TypeVar('T')
 
+_stats_log = logging.getLogger("metexon.gatt_stats")
+
+def _uuid_names() -> Dict[str, str]:
+    """UUID string -> constant name (without ``_UUID``) for stats output."""
+    return {str(v).lower(): k[:-5] for k, v in vars(constants).items()
+            if k.endswith("_UUID") and isinstance(v, UUID)}
+
+
 class BaseMetexonDevice:
-    def __init__(self, address: str, timeout: float = 10.0, auto_loop: bool = True) -> None:
+    # Services used by the client; the GATT cache restricts discovery to
+    # these on reconnect (empty: cache all discovered services).
+    _GATT_SERVICES: Tuple[UUID, ...] = ()
+
+    def __init__(self, address: str, timeout: float = 10.0, auto_loop: bool = True,
+                 client_factory: Optional[Callable[..., Any]] = None, shared_loop: bool = True,
+                 reconnect: Union[bool, ReconnectPolicy] = False,
+                 call_timeout: Optional[float] = None,
+                 gatt_cache: Union[bool, GattCache, None] = None,
+                 stats_interval_s: Optional[float] = None,
+                 stats_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 adapter: Optional[str] = None) -> None:
         self.address = address
         self.timeout = timeout
+        # Bluetooth adapter to connect through (e.g. "hci1" on BlueZ; None: default)
+        self.adapter = adapter
+        # Default deadline for sync calls (None: wait forever)
+        self.call_timeout = call_timeout
+        self._client_factory = client_factory or BleakClient
         self._client: Optional[BleakClient] = None
         self._loop_thread: Optional[AsyncLoopThread] = None
         self._auto_loop = auto_loop
+        self._shared_loop = shared_loop
+        self._supervisor: Optional[ConnectionSupervisor] = None
+        self._gatt = GattClient(self)
+        self._gatt_cache: Optional[GattCache] = (
+            gatt_cache if isinstance(gatt_cache, GattCache) else GattCache() if gatt_cache else None)
+        self._gatt_cache_entry: Optional[Dict[str, Any]] = None
+        # Periodic GATT stats summary while connected (None: off)
+        self.stats_interval_s = stats_interval_s
+        self._stats_callback = stats_callback
+        self._stats_task: Optional[asyncio.Task] = None
+        if reconnect:
+            policy = reconnect if isinstance(reconnect, ReconnectPolicy) else ReconnectPolicy()
+            self._supervisor = ConnectionSupervisor(self, policy)
 
     # -------- public sync API --------
     def connect(self) -> None:
         if self._client:
             return
         if self._auto_loop and not self._loop_thread:
-            self._loop_thread = AsyncLoopThread()
-        self._run(self._aconnect())
+            self._loop_thread = acquire_shared_loop_thread() if self._shared_loop else AsyncLoopThread()
+        try:
+            self._run(self._aconnect(), timeout=None)
+        except BaseException:
+            self._release_loop_thread()
+            raise
 
     def disconnect(self) -> None:
+        try:
+            if self._client:
+                self._run(self._adisconnect(), timeout=None)
+        finally:
+            self._release_loop_thread()
+
+    # -------- public async API --------
+    async def aconnect(self) -> None:
         if self._client:
-            self._run(self._adisconnect())
-        if self._loop_thread:
-            self._loop_thread.close()
-            self._loop_thread = None
+            return
+        await self._aconnect()
+
+    async def adisconnect(self) -> None:
+        await self._adisconnect()
 
     # -------- internal async --------
     async def _aconnect(self) -> None:
-        self._client = BleakClient(self.address, timeout=self.timeout)
-        await self._client.__aenter__()
+        with tracing.span("connect", address=self.address):
+            self._client = await self._anew_client()
+        if self._supervisor is not None:
+            self._supervisor.attach()
+        if self.stats_interval_s:
+            self._stats_task = asyncio.ensure_future(self._areport_stats(self.stats_interval_s))
+
+    async def _anew_client(self) -> Any:
+        kwargs: dict = {"timeout": self.timeout}
+        if self.adapter is not None:
+            kwargs["adapter"] = self.adapter
+        if self._supervisor is not None:
+            kwargs["disconnected_callback"] = self._supervisor.on_disconnected
+        cache = self._gatt_cache
+        if cache is None:
+            return await self._aopen_client(kwargs)
+
+        # The cache reads and writes a JSON file; keep that off the event loop.
+        entry = await asyncio.to_thread(cache.lookup, self.address)
+        client = await self._aopen_client(kwargs if entry is None else {**kwargs, **cache.client_kwargs(entry)})
+        if entry is not None and not cache.matches(entry, self._cacheable_services(client.services)):
+            # Firmware changed (or the cached service list is incomplete):
+            # forget the entry and rediscover everything.
+            await asyncio.to_thread(cache.invalidate, self.address)
+            await client.__aexit__(None, None, None)
+            client = await self._aopen_client(kwargs)
+            entry = None
+        if entry is None:
+            data = await client.read_gatt_char(DEVICE_TYPE_UUID)
+            entry = await asyncio.to_thread(cache.store, self.address, data.decode(errors='replace'),
+                                            self._cacheable_services(client.services))
+        self._gatt_cache_entry = entry
+        return client
+
+    async def _aopen_client(self, kwargs: Dict[str, Any]) -> Any:
+        client = self._client_factory(self.address, **kwargs)
+        await client.__aenter__()
+        return client
+
+    def _cacheable_services(self, services: Any) -> List[Any]:
+        wanted = {str(u).lower() for u in self._GATT_SERVICES}
+        return [svc for svc in services if not wanted or str(svc.uuid).lower() in wanted]
+
+    async def _anote_device_type(self, device_type: str) -> None:
+        """Lazily validate the GATT cache entry against a freshly read device type."""
+        entry = self._gatt_cache_entry
+        cache = self._gatt_cache
+        if entry is None or entry.get("device_type") == device_type or cache is None:
+            return
+        self._gatt_cache_entry = None
+        await asyncio.to_thread(cache.invalidate, self.address)
+        if self._client is not None:
+            self._gatt_cache_entry = await asyncio.to_thread(
+                cache.store, self.address, device_type, self._cacheable_services(self._client.services))
+
+    async def _arestore_session(self, client: Any) -> None:
+        """Re-apply device state after a supervised reconnect.
+
+        Called with the new raw client before pending operations resume.
+        Mixins override this and call ``super()``.
+        """
+
+    async def _areport_stats(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            if self._stats_callback is not None:
+                try:
+                    self._stats_callback(self.gatt_stats())
+                except Exception:
+                    _stats_log.exception("GATT stats callback failed")
+            else:
+                _stats_log.info("%s %s", self.address, self._gatt.stats.format_summary(_uuid_names()))
 
     async def _adisconnect(self) -> None:
+        task, self._stats_task = self._stats_task, None
+        if task is not None:
+            task.cancel()
+        if self._supervisor is not None:
+            await self._supervisor.aclose()
         if self._client:
-            await self._client.__aexit__(None, None, None)
+            with tracing.span("disconnect", address=self.address):
+                await self._client.__aexit__(None, None, None)
             self._client = None
 
     # -------- helpers --------
-    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+    def _release_loop_thread(self) -> None:
+        loop_thread, self._loop_thread = self._loop_thread, None
+        if loop_thread is None or not self._auto_loop:
+            return
+        if self._shared_loop:
+            release_shared_loop_thread(loop_thread)
+        else:
+            loop_thread.close()
+
+    def _run(self, coro: Coroutine[Any, Any, T], timeout: Any = ...) -> T:
+        """Run *coro* on the loop thread with the current deadline.
+
+        *timeout* defaults to the active :func:`~metexon.deadlines.call_deadline`
+        or ``call_timeout``; pass None to wait without a deadline.
+        """
         if not self._loop_thread:
+            coro.close()
             raise RuntimeError("No loop thread (auto_loop=False?)")
-        return self._loop_thread.run(coro)
+        if timeout is ...:
+            timeout = deadline_override(self.call_timeout)
+        return self._loop_thread.run(coro, timeout)
+
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule *coro* as a background task on the loop thread."""
+        if not self._loop_thread:
+            raise RuntimeError("No loop thread (auto_loop=False?)")
+        return self._loop_thread.create_task(coro)
 
     @property
     def client(self) -> BleakClient:
         if not self._client:
+            if self._supervisor is not None and self._supervisor.gave_up is not None:
+                raise ConnectionLostError(f"Connection to {self.address} lost") from self._supervisor.gave_up
             raise RuntimeError("Not connected")
-        return self._client
+        return self._gatt  # type: ignore[return-value]
+
+    def timeout_counts(self) -> Dict[str, int]:
+        """Number of expired call deadlines per pending characteristic UUID."""
+        return dict(self._gatt.timeouts)
+
+    def gatt_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """GATT read/write statistics since creation or :meth:`reset_gatt_stats`.
+
+        ``{characteristic UUID: {"read"|"write": {"calls", "errors", "bytes",
+        "mean_s", "p50_s", "p90_s", "p99_s", "max_s"}}}``; latencies are in
+        seconds. Statistics are kept across reconnects.
+        """
+        return self._gatt.stats.summary()
+
+    def reset_gatt_stats(self) -> None:
+        self._gatt.stats.reset()
+
+    @property
+    def reconnect_count(self) -> int:
+        """Number of successful automatic reconnects (supervised mode)."""
+        return self._supervisor.reconnects if self._supervisor is not None else 0
 
     # -------- context manager --------
     def __enter__(self):  # type: ignore[override]
@@ -64,3 +279,11 @@ class BaseMetexonDevice:
     def __exit__(self, exc_type, exc, tb):  # type: ignore[override]
         self.disconnect()
         return False
+
+    async def __aenter__(self):
+        await self.aconnect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.adisconnect()
+        return False
@@ -18,8 +18,8 @@ from .constants import (
     SYSTEM_STATE_UUID,
 )
 from . import structures as legacy_structs
+from .tracing import traced
 from .zellenradschleuse.client import ZellenradschleuseClient as _TypedClient
-from .loop_thread import AsyncLoopThread
 
 class Zellenradschleuse:
     """High-level convenience wrapper for a Metexon device.
@@ -30,13 +30,14 @@ class Zellenradschleuse:
             print(zr.device_type())
             state = zr.system_state()
             print(state)
+
+    Further keyword arguments (``reconnect=``, ``client_factory=`` ...) are
+    passed to the wrapped `ZellenradschleuseClient`.
     """
-    def __init__(self, mac: str, timeout: float = 10.0) -> None:
-        self._typed = _TypedClient(mac, timeout=timeout)
+    def __init__(self, mac: str, timeout: float = 10.0, **kwargs: Any) -> None:
+        self._typed = _TypedClient(mac, timeout=timeout, **kwargs)
         self.address = mac
         self.timeout = timeout
-        self._loop_thread: Optional[AsyncLoopThread] = None  # retained for minimal changes
-        self._client: Optional[BleakClient] = None
 
     # ------------- Context management -------------
     def __enter__(self) -> 'Zellenradschleuse':
@@ -46,28 +47,28 @@ class Zellenradschleuse:
     def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[override]
         self._typed.disconnect()
 
+    async def __aenter__(self) -> 'Zellenradschleuse':
+        await self._typed.aconnect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._typed.adisconnect()
+
     # ------------- Async connect/disconnect -------------
     async def _connect(self) -> None:
-        # Deprecated path not used; kept for compatibility if someone calls internal async.
-        self._client = BleakClient(self.address, timeout=self.timeout)
-        await self._client.__aenter__()
+        # Kept for compatibility; connects the wrapped typed client.
+        await self._typed.aconnect()
 
     async def _disconnect(self) -> None:
-        if self._client is not None:
-            await self._client.__aexit__(None, None, None)
-            self._client = None
+        await self._typed.adisconnect()
 
     # ------------- Internal helpers -------------
     @property
     def client(self) -> BleakClient:
-        if not self._client:
-            raise RuntimeError("Not connected")
-        return self._client
+        return self._typed.client
 
     def _run(self, coro):  # helper bridging
-        if not self._loop_thread:
-            raise RuntimeError("Loop thread not running")
-        return self._loop_thread.run(coro)
+        return self._typed._run(coro)
 
     # ------------- Public API (sync wrappers) -------------
     def device_type(self) -> str:
@@ -116,17 +117,21 @@ class Zellenradschleuse:
         self._typed.start_ota(url)
 
     # ------------- Async versions (optional external use) -------------
+    @traced
     async def adevice_type(self) -> str:
         data = await self.client.read_gatt_char(DEVICE_TYPE_UUID)
         return data.decode(errors='replace')
 
+    @traced
     async def asystem_state(self) -> legacy_structs.SystemState:
         data = await self.client.read_gatt_char(SYSTEM_STATE_UUID)
         return legacy_structs.SystemState.from_bytes(data)
 
+    @traced
     async def aset_system_state(self, state: legacy_structs.SystemState) -> None:
-        await self.client.write_gatt_char(SYSTEM_STATE_UUID, state.to_bytes())
+        await self.client.write_gatt_char(SYSTEM_STATE_UUID, state.to_bytes(), idempotent=True)
 
-    # Additional async methods could mirror sync ones if needed.
+    # Further async access: use ``self._typed`` (a ZellenradschleuseClient) and
+    # its ``a``-prefixed coroutines.
 
 __all__ = ["Zellenradschleuse"]
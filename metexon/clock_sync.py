@@ -0,0 +1,147 @@
+"""Online alignment of a device clock with the host clock.
+
+Metexon devices timestamp data with their own microsecond clock (e.g.
+``ParameterStreamFrame.timestamp_us``). :class:`ClockSync` estimates the
+offset and drift between that clock and the host's ``time.monotonic_ns()``
+with a linear regression over a sliding window of recent
+``(device_us, host_ns)`` pairs and maps device timestamps to host time.
+
+The host timestamps are arrival times, so the estimate includes the average
+transport latency. Each update costs O(1): the regression sums are updated
+incrementally, and the origin is periodically moved to the oldest sample in
+the window (amortized over ``window`` updates) to keep the sums numerically
+well-conditioned on long runs.
+"""
+from __future__ import annotations
+
+from typing import List, Optional
+
+__all__ = ["ClockSync"]
+
+_NS_PER_US = 1000.0
+
+
+class ClockSync:
+    """Sliding-window linear regression of host time over device time.
+
+    Parameters
+    ----------
+    window:
+        Number of recent samples used for the fit.
+    reset_threshold_us:
+        A device timestamp going backwards by more than this (e.g. after a
+        device reboot) discards the fit and starts over.
+    """
+
+    def __init__(self, window: int = 256, reset_threshold_us: int = 1_000_000) -> None:
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = int(window)
+        self.reset_threshold_us = int(reset_threshold_us)
+        self.reset()
+
+    def reset(self) -> None:
+        self._xs: List[float] = [0.0] * self.window
+        self._ys: List[float] = [0.0] * self.window
+        self._head = 0
+        self._n = 0
+        self._since_rebase = 0
+        self._x0 = 0
+        self._y0 = 0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+        self._last_device_us: Optional[int] = None
+        self._slope = _NS_PER_US
+        self._intercept = 0.0
+
+    @property
+    def samples(self) -> int:
+        return self._n
+
+    @property
+    def drift_ppm(self) -> float:
+        """Host clock rate relative to the device clock, in parts per million."""
+        return (self._slope / _NS_PER_US - 1.0) * 1e6
+
+    def offset_ns(self, device_us: int) -> Optional[int]:
+        """Estimated ``host_ns - device_us * 1000`` at *device_us*."""
+        host_ns = self.to_host_ns(device_us)
+        return None if host_ns is None else host_ns - device_us * 1000
+
+    def update(self, device_us: int, host_ns: int) -> int:
+        """Add a sample and return the host-time estimate for *device_us*."""
+        last = self._last_device_us
+        if last is not None and device_us <= last:
+            if last - device_us > self.reset_threshold_us:
+                self.reset()
+            else:
+                # Repeated or reordered timestamp: estimate only, don't refit.
+                return self.to_host_ns(device_us)  # type: ignore[return-value]
+        if self._n == 0:
+            self._x0 = device_us
+            self._y0 = host_ns
+        self._last_device_us = device_us
+
+        x = float(device_us - self._x0)
+        y = float(host_ns - self._y0)
+        i = self._head
+        if self._n == self.window:
+            ox, oy = self._xs[i], self._ys[i]
+            self._sx -= ox
+            self._sy -= oy
+            self._sxx -= ox * ox
+            self._sxy -= ox * oy
+        else:
+            self._n += 1
+        self._xs[i] = x
+        self._ys[i] = y
+        self._sx += x
+        self._sy += y
+        self._sxx += x * x
+        self._sxy += x * y
+        self._head = (i + 1) % self.window
+
+        self._since_rebase += 1
+        if self._since_rebase >= self.window:
+            self._rebase()
+        self._fit()
+        return self.to_host_ns(device_us)  # type: ignore[return-value]
+
+    def to_host_ns(self, device_us: int) -> Optional[int]:
+        """Map a device timestamp to estimated host ``monotonic_ns`` time."""
+        if self._n == 0:
+            return None
+        x = float(device_us - self._x0)
+        return self._y0 + int(round(self._intercept + self._slope * x))
+
+    def _fit(self) -> None:
+        n = self._n
+        mean_x = self._sx / n
+        mean_y = self._sy / n
+        var_x = self._sxx - self._sx * mean_x
+        if n >= 2 and var_x > 0.0:
+            self._slope = (self._sxy - self._sx * mean_y) / var_x
+        else:
+            self._slope = _NS_PER_US
+        self._intercept = mean_y - self._slope * mean_x
+
+    def _rebase(self) -> None:
+        """Move the origin to the oldest sample and recompute the sums."""
+        self._since_rebase = 0
+        oldest = (self._head - self._n) % self.window
+        dx, dy = self._xs[oldest], self._ys[oldest]
+        self._x0 += int(dx)
+        self._y0 += int(dy)
+        # int() truncation keeps x0/y0 integral; carry the remainder in the samples.
+        dx, dy = float(int(dx)), float(int(dy))
+        sx = sy = sxx = sxy = 0.0
+        for k in range(self._n):
+            j = (oldest + k) % self.window
+            x = self._xs[j] - dx
+            y = self._ys[j] - dy
+            self._xs[j] = x
+            self._ys[j] = y
+            sx += x
+            sy += y
+            sxx += x * x
+            sxy += x * y
+        self._sx, self._sy, self._sxx, self._sxy = sx, sy, sxx, sxy
@@ -0,0 +1,95 @@
+"""Deadlines for calls made through the sync bridge.
+
+:meth:`AsyncLoopThread.run(coro, timeout=...) <metexon.loop_thread.AsyncLoopThread.run>`
+runs *coro* under :func:`run_with_deadline` on the loop: when the deadline
+expires the task is cancelled there (so a hung GATT operation does not keep
+running in the background) and :class:`~metexon.exceptions.OperationTimeoutError`
+is raised in the calling thread.
+
+While the deadline is active, :data:`current_deadline` holds its
+:class:`Deadline`; the GATT layer (:mod:`metexon.gatt`) records which
+operation was pending when it expired.
+
+Sync device methods use the device's ``call_timeout``; :func:`call_deadline`
+overrides it for all calls made by the current thread inside a ``with``
+block::
+
+    with call_deadline(2.0):
+        zr.read_system_state()
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Coroutine, Iterator, Optional, TypeVar
+
+from .exceptions import OperationTimeoutError
+
+__all__ = ["Deadline", "current_deadline", "run_with_deadline", "call_deadline", "deadline_override"]
+
+T = TypeVar("T")
+
+_UNSET: Any = object()
+
+
+class Deadline:
+    __slots__ = ("timeout", "expired", "operation", "characteristic")
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.expired = False
+        self.operation: Optional[str] = None
+        self.characteristic: Optional[str] = None
+
+    def pending(self, operation: str, characteristic: str) -> bool:
+        """Record the pending GATT operation on expiry; True if it is the first one."""
+        if not self.expired or self.operation is not None:
+            return False
+        self.operation = operation
+        self.characteristic = characteristic
+        return True
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("metexon_deadline", default=None)
+# Per-thread override of the device call_timeout, see call_deadline()
+_override: ContextVar[Any] = ContextVar("metexon_deadline_override", default=_UNSET)
+
+
+async def run_with_deadline(coro: Coroutine[Any, Any, T], timeout: float) -> T:
+    """Await *coro*, cancelling it and raising ``OperationTimeoutError`` after *timeout* s."""
+    task = asyncio.current_task()
+    assert task is not None
+    deadline = Deadline(timeout)
+
+    def _expire() -> None:
+        deadline.expired = True
+        task.cancel()
+
+    token = current_deadline.set(deadline)
+    handle = asyncio.get_running_loop().call_later(timeout, _expire)
+    try:
+        return await coro
+    except asyncio.CancelledError:
+        if not deadline.expired:
+            raise
+        raise OperationTimeoutError(timeout, deadline.operation, deadline.characteristic) from None
+    finally:
+        handle.cancel()
+        current_deadline.reset(token)
+
+
+@contextmanager
+def call_deadline(timeout: Optional[float]) -> Iterator[None]:
+    """Use *timeout* (None: no deadline) for sync calls in this block and thread."""
+    token = _override.set(timeout)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+def deadline_override(default: Optional[float]) -> Optional[float]:
+    """Return the :func:`call_deadline` timeout if one is active, else *default*."""
+    value = _override.get()
+    return default if value is _UNSET else value
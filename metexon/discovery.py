@@ -1,129 +1,316 @@
-"""Device discovery utilities for Metexon BLE devices."""
+"""Device discovery utilities for Metexon BLE devices.
+
+Discovery runs on a single callback-based ``BleakScanner``: every
+advertisement is matched as it arrives, so :func:`adiscover_metexon_one`
+returns as soon as the first matching device is heard, and
+:func:`aiter_metexon` streams matching devices while the scan continues::
+
+    async with aiter_metexon(timeout=10.0) as scan:
+        async for found in scan:
+            print(found["address"], found["rssi"])
+
+Matching strategies (``filter_by``):
+
+* ``"name"``: the advertised name contains ``METEXON`` (case-insensitive).
+* ``"service"``: the device advertises the Metexon primary service UUID; the
+  UUID is also passed to the scanner so the OS can filter.
+
+Found devices are dicts with keys ``address``, ``name``, ``rssi`` and
+``service_uuids``.
+
+With ``cache=True`` (or a :class:`~metexon.discovery_cache.DiscoveryCache`)
+every matching advertisement is recorded on disk, and
+:func:`adiscover_metexon_one` resolves cached-or-scan: the most recently seen
+fresh cache entry that matches ``filter_by`` is returned without scanning
+(pass ``use_cached=False`` to always scan). :func:`adiscover_metexon` scans
+by default, since the cache cannot tell whether all devices in range were
+recorded; pass ``use_cached=True`` to get the fresh cache entries instead.
+Cached results additionally carry ``last_seen`` and ``rssi_history``. A
+cache that cannot be written (e.g. read-only home directory) is logged and
+otherwise ignored.
+
+``scanner_factory`` replaces ``BleakScanner`` (called as
+``scanner_factory(detection_callback=..., service_uuids=...)``), e.g. with
+:class:`~metexon.zellenradschleuse.simulator.SimulatedScanner` in tests.
+"""
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
 from bleak import BleakScanner
 from .constants import METEXON_SERVICE_UUID
+from .discovery_cache import DiscoveryCache
 
 __all__ = ["discover_metexon", "adiscover_metexon"]
 __all__ += ["discover_metexon_one", "adiscover_metexon_one"]
+__all__ += ["aiter_metexon", "MetexonScan"]
 
-async def adiscover_metexon(timeout: float = 5.0, filter_by: str = "name") -> List[dict]:
-    """Async discover Metexon devices.
+_log = logging.getLogger(__name__)
 
-    filter_by controls which matching strategy to use:
-      - "name": include devices whose advertised name contains "METEXON" (case-insensitive). This is the default.
-      - "service": include devices that advertise the Metexon primary service UUID.
+_FILTERS = ("name", "service")
+_SERVICE_STR = str(METEXON_SERVICE_UUID).lower()
 
-    Returns a list of dictionaries with keys: address, name, rssi.
-    """
-    devices = await BleakScanner.discover(timeout=timeout)
-    result = []
-    svc_str = str(METEXON_SERVICE_UUID)
-    for d in devices:
-        name = (d.name or "")
-        metadata = getattr(d, 'metadata', {}) or {}
-        uuids = metadata.get('uuids') or []
-        match = False
-        if filter_by == "name":
-            if "metexon" in name.lower():
-                match = True
-        elif filter_by == "service":
-            if svc_str.lower() in [u.lower() for u in uuids]:
-                match = True
-        else:
-            raise ValueError(f"Unknown filter_by value: {filter_by!r}; expected 'name' or 'service'")
-
-        if match:
-            result.append({
-                'address': d.address,
-                'name': d.name,
-                'rssi': getattr(d, 'rssi', None),
-            })
-    return result
-
-
-async def adiscover_metexon_one(timeout: float = 10.0, filter_by: str = "name") -> dict | None:
-    """Async discover a single Metexon device and stop as soon as one is found.
 
-    Returns a dict with keys: address, name, rssi, or None if no device was found within timeout.
-    """
-    svc_str = str(METEXON_SERVICE_UUID).lower()
+def _check_filter(filter_by: str) -> None:
+    if filter_by not in _FILTERS:
+        raise ValueError(f"Unknown filter_by value: {filter_by!r}; expected 'name' or 'service'")
+
+
+def _advertised_name(device: Any, adv: Any) -> Optional[str]:
+    return getattr(adv, "local_name", None) or getattr(device, "name", None)
+
 
-    # Repeated short discovers are used instead of a callback-based scanner so
-    # this works across bleak versions and avoids relying on scanner internals.
-    import asyncio as _asyncio
-    import time as _time
+def _matches(device: Any, adv: Any, filter_by: str) -> bool:
+    if filter_by == "name":
+        return "metexon" in (_advertised_name(device, adv) or "").lower()
+    uuids = getattr(adv, "service_uuids", None) or []
+    return _SERVICE_STR in (u.lower() for u in uuids)
 
-    end_time = _time.time() + float(timeout)
-    scan_interval = min(1.0, float(timeout) or 1.0)
-    if scan_interval <= 0:
-        scan_interval = 0.5
 
-    while _time.time() <= end_time:
-        remaining = end_time - _time.time()
-        this_try = min(scan_interval, remaining) if remaining > 0 else 0
+def _entry_matches(entry: Dict[str, Any], filter_by: str) -> bool:
+    if filter_by == "name":
+        return "metexon" in (entry.get("name") or "").lower()
+    return _SERVICE_STR in entry.get("service_uuids", ())
+
+
+def _resolve_cache(cache: Union[bool, DiscoveryCache, None]) -> Optional[DiscoveryCache]:
+    if isinstance(cache, DiscoveryCache):
+        return cache
+    return DiscoveryCache() if cache else None
+
+
+def _found(device: Any, adv: Any) -> Dict[str, Any]:
+    return {
+        'address': device.address,
+        'name': _advertised_name(device, adv),
+        'rssi': getattr(adv, "rssi", None),
+        'service_uuids': [u.lower() for u in (getattr(adv, "service_uuids", None) or [])],
+    }
+
+
+class MetexonScan:
+    """Async iterator over matching advertisements of one scanner run.
+
+    Scanning starts on the first ``__anext__`` (or ``__aenter__``) and stops
+    when *timeout* elapses (never if None), the iterator is closed, or the
+    ``async with`` block is left. With *dedupe* (default) each address is
+    yielded once, on its first matching advertisement; otherwise every
+    matching advertisement is yielded. Errors of the scanner propagate to
+    the consumer. With a *cache*, every matching advertisement is recorded
+    and the cache is saved when the scan stops.
+
+    Advertisements weaker than *min_rssi* (dBm) are ignored, so a device
+    at the edge of the range is yielded once it comes closer.
+    *scanner_kwargs* are passed to the scanner (e.g. ``adapter="hci1"``).
+    """
+
+    def __init__(self, timeout: Optional[float] = 5.0, filter_by: str = "name", *,
+                 dedupe: bool = True, scanner_factory: Optional[Callable[..., Any]] = None,
+                 maxsize: int = 1024, cache: Optional[DiscoveryCache] = None,
+                 min_rssi: Optional[int] = None, scanner_kwargs: Optional[Dict[str, Any]] = None) -> None:
+        _check_filter(filter_by)
+        self.cache = cache
+        self.min_rssi = min_rssi
+        self._scanner_kwargs = scanner_kwargs or {}
+        self.timeout = timeout
+        self.filter_by = filter_by
+        self.dedupe = dedupe
+        self.dropped = 0
+        self._scanner_factory = scanner_factory or BleakScanner
+        self._maxsize = maxsize
+        self._queue: "Optional[asyncio.Queue[Any]]" = None
+        self._seen: Set[str] = set()
+        self._scanner: Any = None
+        self._deadline_handle: Optional[asyncio.TimerHandle] = None
+        self._stopped = False
+
+    def _on_advertisement(self, device: Any, adv: Any) -> None:
+        if self._stopped or self._queue is None:
+            return
+        item = self._accept(device, adv)
+        if item is None:
+            return
         try:
-            devices = await BleakScanner.discover(timeout=this_try)
-        except Exception:
-            # If discover fails for any reason, short-circuit with None
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _accept(self, device: Any, adv: Any) -> Any:
+        """Item to yield for an advertisement, or None to skip it."""
+        if not _matches(device, adv, self.filter_by):
             return None
+        found = _found(device, adv)
+        if self.cache is not None:
+            self.cache.record(found)
+        if self.min_rssi is not None and (found['rssi'] is None or found['rssi'] < self.min_rssi):
+            return None
+        if self.dedupe:
+            if device.address in self._seen:
+                return None
+            self._seen.add(device.address)
+        return found
 
-        for d in devices:
-            name = (d.name or "")
-            metadata = getattr(d, 'metadata', {}) or {}
-            uuids = metadata.get('uuids') or []
-            match = False
-            if filter_by == "name":
-                if "metexon" in name.lower():
-                    match = True
-            elif filter_by == "service":
-                if svc_str in [u.lower() for u in uuids]:
-                    match = True
-            else:
-                raise ValueError(f"Unknown filter_by value: {filter_by!r}; expected 'name' or 'service'")
-
-            if match:
-                return {
-                    'address': d.address,
-                    'name': d.name,
-                    'rssi': getattr(d, 'rssi', None),
-                }
-
-        # yield to the event loop briefly before next discover
+    def _expire(self) -> None:
+        self._stopped = True
+        assert self._queue is not None
         try:
-            await _asyncio.sleep(0)
-        except Exception:
-            pass
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # Make room for the end marker; the oldest advertisement is lost.
+            self._queue.get_nowait()
+            self.dropped += 1
+            self._queue.put_nowait(None)
 
-    return None
+    async def start(self) -> None:
+        if self._scanner is not None or self._stopped:
+            return
+        self._queue = asyncio.Queue(self._maxsize)
+        service_uuids = [_SERVICE_STR] if self.filter_by == "service" else None
+        scanner = self._scanner_factory(detection_callback=self._on_advertisement,
+                                        service_uuids=service_uuids, **self._scanner_kwargs)
+        await scanner.start()
+        self._scanner = scanner
+        if self.timeout is not None:
+            self._deadline_handle = asyncio.get_running_loop().call_later(self.timeout, self._expire)
 
-def discover_metexon(timeout: float = 10.0, filter_by: str = "name") -> List[dict]:
-    """Synchronous wrapper for `adiscover_metexon`.
+    async def aclose(self) -> None:
+        if not self._stopped and self._queue is not None:
+            self._expire()  # wake a consumer waiting in __anext__
+        self._stopped = True
+        if self._deadline_handle is not None:
+            self._deadline_handle.cancel()
+            self._deadline_handle = None
+        scanner, self._scanner = self._scanner, None
+        if scanner is not None:
+            try:
+                await scanner.stop()
+            finally:
+                if self.cache is not None:
+                    try:
+                        self.cache.save()
+                    except OSError as exc:
+                        _log.warning("Could not save discovery cache %s: %s", self.cache.path, exc)
 
-    See `filter_by` semantics in `adiscover_metexon`.
+    def __aiter__(self) -> "MetexonScan":
+        return self
+
+    async def __anext__(self) -> Any:
+        await self.start()
+        q = self._queue
+        item = None if q is None or (self._stopped and q.empty()) else await q.get()
+        if item is None:
+            await self.aclose()
+            raise StopAsyncIteration
+        return item
+
+    async def __aenter__(self) -> "MetexonScan":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+
+def aiter_metexon(timeout: Optional[float] = 5.0, filter_by: str = "name", *,
+                  scanner_factory: Optional[Callable[..., Any]] = None,
+                  cache: Union[bool, DiscoveryCache, None] = None,
+                  min_rssi: Optional[int] = None) -> MetexonScan:
+    """Yield each matching device as soon as its first advertisement arrives.
+
+    Use as ``async with`` block to guarantee the scanner is stopped when
+    leaving the loop early. *timeout* None scans until closed. The cache
+    is only recorded to, never used to skip the scan. Devices are yielded
+    once they advertise with at least *min_rssi* dBm.
     """
-    import asyncio
+    return MetexonScan(timeout, filter_by, scanner_factory=scanner_factory, cache=_resolve_cache(cache),
+                       min_rssi=min_rssi)
+
+
+async def adiscover_metexon(timeout: float = 5.0, filter_by: str = "name", *,
+                            scanner_factory: Optional[Callable[..., Any]] = None,
+                            cache: Union[bool, DiscoveryCache, None] = None,
+                            use_cached: bool = False) -> List[dict]:
+    """Async discover Metexon devices.
+
+    Scans for *timeout* seconds and returns one dict per matching device
+    (keys: address, name, rssi, service_uuids) with its latest RSSI, in the
+    order the devices were first seen. See the module docstring for
+    ``filter_by`` and *cache*. The scan is recorded to the cache; with
+    *use_cached*, fresh matching cache entries are returned (most recently
+    seen first) without scanning if there are any.
+    """
+    disk = _resolve_cache(cache)
+    if disk is not None and use_cached:
+        cached = [e for e in disk.fresh() if _entry_matches(e, filter_by)]
+        if cached:
+            return cached
+    found: Dict[str, Dict[str, Any]] = {}
+    async with MetexonScan(timeout, filter_by, dedupe=False, scanner_factory=scanner_factory,
+                           cache=disk) as scan:
+        async for rec in scan:
+            prev = found.get(rec['address'])
+            if prev is not None and rec['name'] is None:
+                rec['name'] = prev['name']
+            found[rec['address']] = rec
+    return list(found.values())
+
+
+async def adiscover_metexon_one(timeout: float = 10.0, filter_by: str = "name", *,
+                                scanner_factory: Optional[Callable[..., Any]] = None,
+                                cache: Union[bool, DiscoveryCache, None] = None,
+                                use_cached: bool = True) -> dict | None:
+    """Async discover a single Metexon device and stop as soon as one is found.
+
+    Returns a dict with keys: address, name, rssi, service_uuids, or None if
+    no device was found within timeout. With a *cache*, the most recently
+    seen fresh matching entry is returned instantly.
+    """
+    disk = _resolve_cache(cache)
+    if disk is not None and use_cached:
+        for entry in disk.fresh():
+            if _entry_matches(entry, filter_by):
+                return entry
+    async with MetexonScan(timeout, filter_by, scanner_factory=scanner_factory, cache=disk) as scan:
+        async for rec in scan:
+            return rec
+    return None
+
+
+def _run_sync(name: str, coro: Any) -> Any:
     try:
         loop = asyncio.get_running_loop()
     except RuntimeError:
         loop = None
     if loop and loop.is_running():
-        # Caller already in event loop; user should call adiscover_metexon directly.
-        raise RuntimeError("discover_metexon cannot run inside an existing event loop; use adiscover_metexon")
-    return asyncio.run(adiscover_metexon(timeout=timeout, filter_by=filter_by))
+        # Caller already in event loop; user should call the coroutine directly.
+        coro.close()
+        raise RuntimeError(f"{name} cannot run inside an existing event loop; use a{name}")
+    return asyncio.run(coro)
+
+
+def discover_metexon(timeout: float = 10.0, filter_by: str = "name", *,
+                     scanner_factory: Optional[Callable[..., Any]] = None,
+                     cache: Union[bool, DiscoveryCache, None] = None,
+                     use_cached: bool = False) -> List[dict]:
+    """Synchronous wrapper for `adiscover_metexon`.
+
+    See `filter_by` and `cache` semantics in `adiscover_metexon`.
+    """
+    return _run_sync("discover_metexon",
+                     adiscover_metexon(timeout=timeout, filter_by=filter_by, scanner_factory=scanner_factory,
+                                       cache=cache, use_cached=use_cached))
 
 
-def discover_metexon_one(timeout: float = 10.0, filter_by: str = "name") -> dict | None:
+def discover_metexon_one(timeout: float = 10.0, filter_by: str = "name", *,
+                         scanner_factory: Optional[Callable[..., Any]] = None,
+                         cache: Union[bool, DiscoveryCache, None] = None,
+                         use_cached: bool = True) -> dict | None:
     """Synchronous wrapper for `adiscover_metexon_one`.
 
     Returns a dict for the first found device or None if none found within timeout.
     """
-    import asyncio
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-    if loop and loop.is_running():
-        raise RuntimeError("discover_metexon_one cannot run inside an existing event loop; use adiscover_metexon_one")
-    return asyncio.run(adiscover_metexon_one(timeout=timeout, filter_by=filter_by))
+    return _run_sync("discover_metexon_one",
+                     adiscover_metexon_one(timeout=timeout, filter_by=filter_by, scanner_factory=scanner_factory,
+                                           cache=cache, use_cached=use_cached))
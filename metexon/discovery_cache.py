@@ -0,0 +1,249 @@
+"""On-disk cache of discovered devices.
+
+Short-lived tools usually scan for several seconds only to find addresses
+that never change. A :class:`DiscoveryCache` remembers, per address, what the
+last scans saw: name, last RSSI, last-seen time, advertised service UUIDs and
+a short RSSI history. Discovery functions given ``cache=...``
+(:mod:`metexon.discovery`) record every matching advertisement and, in
+cached-or-scan mode, return fresh entries instantly instead of scanning::
+
+    found = discover_metexon_one(cache=True)  # instant if seen in the last 5 min
+
+:class:`DiscoveryRefresher` keeps the cache fresh from a long-running
+process by scanning periodically.
+
+The file is shared between processes: saving merges with the entries on
+disk, keeping the most recently seen version of each address.
+
+File format (JSON)::
+
+    {"version": 1,
+     "entries": {"<ADDRESS>": {
+         "address": ..., "name": ..., "rssi": ..., "last_seen": <unix time>,
+         "service_uuids": [uuid, ...], "rssi_history": [[<unix time>, rssi], ...]}}}
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+__all__ = ["DiscoveryCache", "DiscoveryRefresher", "default_discovery_cache_path"]
+
+_VERSION = 1
+
+_log = logging.getLogger(__name__)
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def default_discovery_cache_path() -> str:
+    """``$XDG_CACHE_HOME/metexon/discovery.json`` (``~/.cache`` by default)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "metexon", "discovery.json")
+
+
+class DiscoveryCache:
+    """Persistent ``{address: last advertisement}`` cache.
+
+    Parameters
+    ----------
+    path:
+        Cache file; defaults to :func:`default_discovery_cache_path`.
+    max_age_s:
+        Entries seen longer ago than this are not fresh (cached-or-scan
+        resolution scans instead).
+    history:
+        Number of RSSI samples kept per address.
+    history_interval_s:
+        Minimum spacing of RSSI history samples; advertisements arrive many
+        times per second and only the latest one updates ``rssi`` in between.
+    """
+
+    def __init__(self, path: Optional[PathLike] = None, *, max_age_s: float = 300.0,
+                 history: int = 16, history_interval_s: float = 1.0) -> None:
+        self.path = os.fspath(path) if path is not None else default_discovery_cache_path()
+        self.max_age_s = max_age_s
+        self.history = history
+        self.history_interval_s = history_interval_s
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+
+    def _read_file(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("entries", {}) if data.get("version") == _VERSION else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read_file()
+        return self._entries
+
+    def record(self, found: Dict[str, Any], seen: Optional[float] = None) -> Dict[str, Any]:
+        """Update the entry of a discovered device (in memory; see :meth:`save`).
+
+        *found* is a discovery dict (``address``, ``name``, ``rssi``,
+        ``service_uuids``); *seen* defaults to now.
+        """
+        now = time.time() if seen is None else seen
+        address = found["address"].upper()
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(address)
+            if entry is None:
+                entry = entries[address] = {"address": found["address"], "name": None, "rssi": None,
+                                            "last_seen": now, "service_uuids": [], "rssi_history": []}
+            if found.get("name"):
+                entry["name"] = found["name"]
+            if found.get("service_uuids"):
+                entry["service_uuids"] = sorted(set(entry["service_uuids"]) | set(found["service_uuids"]))
+            entry["last_seen"] = now
+            rssi = found.get("rssi")
+            if rssi is not None:
+                entry["rssi"] = rssi
+                hist = entry["rssi_history"]
+                if not hist or now - hist[-1][0] >= self.history_interval_s:
+                    hist.append([now, rssi])
+                    del hist[:-self.history]
+            self._dirty = True
+            return dict(entry)
+
+    def lookup(self, address: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._load().get(address.upper())
+            return None if entry is None else dict(entry)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All entries, most recently seen first."""
+        with self._lock:
+            items = [dict(e) for e in self._load().values()]
+        return sorted(items, key=lambda e: e["last_seen"], reverse=True)
+
+    def fresh(self, max_age_s: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Entries seen within *max_age_s* (default: :attr:`max_age_s`), most recent first."""
+        limit = time.time() - (self.max_age_s if max_age_s is None else max_age_s)
+        return [e for e in self.entries() if e["last_seen"] >= limit]
+
+    def save(self) -> None:
+        """Merge recorded entries into the file (no-op if nothing changed)."""
+        with self._lock:
+            if self._dirty:
+                self._write_merged()
+
+    def _write_merged(self, drop: Optional[str] = None) -> None:
+        merged = self._read_file()
+        merged.pop(drop, None)  # type: ignore[arg-type]
+        for address, entry in (self._entries or {}).items():
+            other = merged.get(address)
+            if other is None or other.get("last_seen", 0) <= entry["last_seen"]:
+                merged[address] = entry
+        self._entries = merged
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": _VERSION, "entries": merged}, f, indent=1)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def invalidate(self, address: str) -> None:
+        """Drop *address* (e.g. after connecting to it failed)."""
+        with self._lock:
+            self._load().pop(address.upper(), None)
+            try:
+                self._write_merged(drop=address.upper())
+            except OSError as exc:
+                _log.warning("Could not save discovery cache %s: %s", self.path, exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump({"version": _VERSION, "entries": {}}, f)
+            except OSError as exc:
+                _log.warning("Could not clear discovery cache %s: %s", self.path, exc)
+                return
+            self._dirty = False
+
+
+class DiscoveryRefresher:
+    """Scan periodically to keep a :class:`DiscoveryCache` fresh.
+
+    Every *interval_s* seconds a scan of *scan_s* seconds records all
+    matching devices and saves the cache. Run it on an event loop with
+    ``await start()`` / ``await aclose()``, or from sync code with
+    :meth:`start_background` / :meth:`stop`, which use the shared loop
+    thread of the sync clients.
+    """
+
+    def __init__(self, cache: DiscoveryCache, *, interval_s: float = 60.0, scan_s: float = 5.0,
+                 filter_by: str = "name", scanner_factory: Optional[Callable[..., Any]] = None) -> None:
+        self.cache = cache
+        self.interval_s = interval_s
+        self.scan_s = scan_s
+        self.filter_by = filter_by
+        self.scanner_factory = scanner_factory
+        self.scans = 0
+        self.last_error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread: Any = None
+
+    async def arefresh(self) -> List[dict]:
+        """Run one scan now and return the devices found."""
+        from .discovery import adiscover_metexon
+
+        found = await adiscover_metexon(self.scan_s, self.filter_by, scanner_factory=self.scanner_factory,
+                                        cache=self.cache, use_cached=False)
+        self.scans += 1
+        return found
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.arefresh()
+                self.last_error = None
+            except Exception as exc:
+                self.last_error = exc
+                _log.warning("Discovery refresh failed: %s", exc)
+            await asyncio.sleep(max(0.0, self.interval_s - self.scan_s))
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def aclose(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def start_background(self) -> None:
+        if self._loop_thread is not None:
+            return
+        from .loop_thread import acquire_shared_loop_thread
+
+        self._loop_thread = acquire_shared_loop_thread()
+        self._loop_thread.run(self.start())
+
+    def stop(self) -> None:
+        loop_thread, self._loop_thread = self._loop_thread, None
+        if loop_thread is None:
+            return
+        from .loop_thread import release_shared_loop_thread
+
+        try:
+            loop_thread.run(self.aclose())
+        finally:
+            release_shared_loop_thread(loop_thread)
@@ -0,0 +1,37 @@
+"""Exceptions raised by the Metexon clients.
+
+Errors reported by the BLE stack itself are passed through as
+``bleak.exc.BleakError``; the exceptions here describe conditions detected
+by this library.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+__all__ = ["MetexonError", "ConnectionLostError", "OperationTimeoutError"]
+
+
+class MetexonError(Exception):
+    """Base class for errors raised by this library."""
+
+
+class ConnectionLostError(MetexonError, ConnectionError):
+    """The link dropped and was not restored in time (supervised mode)."""
+
+
+class OperationTimeoutError(MetexonError, TimeoutError):
+    """A call did not finish within its deadline and was cancelled.
+
+    ``operation`` and ``characteristic`` name the GATT operation (``"read"``,
+    ``"write"``, ...) and characteristic UUID that was pending, if known.
+    """
+
+    def __init__(self, timeout: float, operation: Optional[str] = None,
+                 characteristic: Optional[str] = None) -> None:
+        self.timeout = timeout
+        self.operation = operation
+        self.characteristic = characteristic
+        msg = f"Operation did not complete within {timeout} s"
+        if operation is not None:
+            msg += f" (pending GATT {operation} of {characteristic})"
+        super().__init__(msg)
@@ -0,0 +1,163 @@
+"""GATT access layer between device methods and the ``BleakClient``.
+
+``BaseMetexonDevice.client`` returns a :class:`GattClient`, which forwards
+GATT operations to the current connection (the raw ``BleakClient``, or the
+:class:`~metexon.supervisor.SupervisedClient` in supervised mode) and keeps
+per-device accounting that survives reconnects: when a call deadline
+(:mod:`metexon.deadlines`) expires, the pending operation's characteristic
+is recorded in :attr:`GattClient.timeouts`, and every read and write is
+timed into :attr:`GattClient.stats` (:mod:`metexon.gatt_stats`). GATT
+operations are traced as ``gatt.*`` spans when a tracer is installed
+(:mod:`metexon.tracing`).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, TypeVar
+
+from . import tracing
+from .deadlines import current_deadline
+from .gatt_stats import GattStats
+
+if TYPE_CHECKING:
+    from .base import BaseMetexonDevice
+
+__all__ = ["GattClient"]
+
+T = TypeVar("T")
+
+
+def _char_key(char: Any) -> str:
+    """Normalized UUID string for a characteristic, UUID or UUID string."""
+    return str(getattr(char, "uuid", char)).lower()
+
+
+class GattClient:
+    """``BleakClient`` facade of one device.
+
+    ``read_gatt_char``, ``write_gatt_char``, ``start_notify`` and
+    ``stop_notify`` are instrumented; other attributes (``services``,
+    ``is_connected``, ``mtu_size`` ...) come from the current connection.
+    """
+
+    def __init__(self, device: "BaseMetexonDevice") -> None:
+        self._device = device
+        # characteristic UUID -> number of expired deadlines while it was pending
+        self.timeouts: Counter = Counter()
+        self.stats = GattStats()
+
+    @property
+    def raw(self) -> Any:
+        """The underlying (possibly supervised) client."""
+        device = self._device
+        if device._supervisor is not None:
+            return device._supervisor.client
+        if device._client is None:
+            raise RuntimeError("Not connected")
+        return device._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    async def transaction(self, fn: Callable[[], Awaitable[T]], *, idempotent: bool = False) -> T:
+        """Run *fn*, a sequence of GATT operations that depend on each other.
+
+        Use for requests whose state the device keeps per connection, such as
+        writing a selection and reading the answer. In supervised mode a
+        link loss anywhere within *fn* re-runs all of it after the reconnect
+        if *idempotent*, and raises
+        :class:`~metexon.exceptions.ConnectionLostError` otherwise (see
+        :mod:`metexon.supervisor`). Without supervision *fn* simply runs.
+        """
+        supervisor = self._device._supervisor
+        if supervisor is None:
+            return await fn()
+        return await supervisor.transaction(fn, retry=idempotent)
+
+    async def write_then_read(self, char_specifier: Any, data: Any, *, idempotent: bool = False) -> bytearray:
+        """Write a request to *char_specifier* and read its answer, as one :meth:`transaction`."""
+        async def request() -> bytearray:
+            await self.write_gatt_char(char_specifier, data, response=True)
+            return await self.read_gatt_char(char_specifier)
+
+        return await self.transaction(request, idempotent=idempotent)
+
+    def _cancelled(self, operation: str, char: Any) -> None:
+        deadline = current_deadline.get()
+        if deadline is not None:
+            key = _char_key(char)
+            if deadline.pending(operation, key):
+                self.timeouts[key] += 1
+
+    async def read_gatt_char(self, char_specifier: Any, **kwargs: Any) -> bytearray:
+        key = _char_key(char_specifier)
+        span = tracing.start_span("gatt.read", uuid=key) if tracing.tracer is not None else None
+        start = time.perf_counter_ns()
+        try:
+            data = await self.raw.read_gatt_char(char_specifier, **kwargs)
+        except asyncio.CancelledError as exc:
+            self._cancelled("read", char_specifier)
+            tracing.end_span(span, exc)
+            raise
+        except Exception as exc:
+            self.stats.record("read", key, time.perf_counter_ns() - start, error=True)
+            tracing.end_span(span, exc)
+            raise
+        self.stats.record("read", key, time.perf_counter_ns() - start, len(data))
+        if span is not None:
+            span.set("bytes", len(data))
+            tracing.end_span(span)
+        return data
+
+    async def write_gatt_char(self, char_specifier: Any, data: Any, response: Optional[bool] = None, *,
+                              idempotent: bool = False) -> None:
+        """Write *data*; *idempotent* writes may be re-issued after a reconnect.
+
+        Only mark writes idempotent whose repetition is harmless (see
+        :mod:`metexon.supervisor`); it has no effect without supervision.
+        """
+        key = _char_key(char_specifier)
+        span = (tracing.start_span("gatt.write", uuid=key, bytes=len(data))
+                if tracing.tracer is not None else None)
+        start = time.perf_counter_ns()
+        try:
+            if idempotent and self._device._supervisor is not None:
+                await self.raw.write_gatt_char(char_specifier, data, response=response, idempotent=True)
+            else:
+                await self.raw.write_gatt_char(char_specifier, data, response=response)
+        except asyncio.CancelledError as exc:
+            self._cancelled("write", char_specifier)
+            tracing.end_span(span, exc)
+            raise
+        except Exception as exc:
+            self.stats.record("write", key, time.perf_counter_ns() - start, error=True)
+            tracing.end_span(span, exc)
+            raise
+        self.stats.record("write", key, time.perf_counter_ns() - start, len(data))
+        tracing.end_span(span)
+
+    async def start_notify(self, char_specifier: Any, callback: Callable[..., Any], **kwargs: Any) -> None:
+        span = (tracing.start_span("gatt.start_notify", uuid=_char_key(char_specifier))
+                if tracing.tracer is not None else None)
+        try:
+            await self.raw.start_notify(char_specifier, callback, **kwargs)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                self._cancelled("start_notify", char_specifier)
+            tracing.end_span(span, exc)
+            raise
+        tracing.end_span(span)
+
+    async def stop_notify(self, char_specifier: Any) -> None:
+        span = (tracing.start_span("gatt.stop_notify", uuid=_char_key(char_specifier))
+                if tracing.tracer is not None else None)
+        try:
+            await self.raw.stop_notify(char_specifier)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                self._cancelled("stop_notify", char_specifier)
+            tracing.end_span(span, exc)
+            raise
+        tracing.end_span(span)
@@ -0,0 +1,159 @@
+"""On-disk cache of discovered GATT services to speed up reconnects.
+
+Bleak always runs service discovery while connecting and has no portable way
+to inject a previously discovered attribute table. What it does support is
+narrowing discovery to a list of service UUIDs (``BleakClient(services=...)``)
+and, on Windows, using the OS attribute cache
+(``winrt={"use_cached_services": True}``). :class:`GattCache` remembers, per
+address and ``device_type()``, which services a device exposes plus a
+fingerprint of its attribute table, so later connections only discover the
+services the clients use and skip the rest (GAP, GATT, DIS, vendor debug
+services ...).
+
+Entries are validated lazily, without extra GATT traffic: after every
+connect the fingerprint of the discovered table is compared with the cached
+one, and the device type is compared whenever ``device_type()`` is read.
+On a mismatch (e.g. a firmware update changed handles or services) the entry
+is dropped and the device rediscovered in full.
+
+File format (JSON)::
+
+    {"version": 1,
+     "entries": {"<ADDRESS>|<device type>": {
+         "address": ..., "device_type": ..., "services": [uuid, ...],
+         "fingerprint": "<sha1 of (service, characteristic, handle, properties)>",
+         "updated": <unix time>}}}
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Union
+
+__all__ = ["GattCache", "default_gatt_cache_path", "services_fingerprint"]
+
+_VERSION = 1
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def default_gatt_cache_path() -> str:
+    """``$XDG_CACHE_HOME/metexon/gatt_services.json`` (``~/.cache`` by default)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "metexon", "gatt_services.json")
+
+
+def services_fingerprint(services: Iterable[Any]) -> str:
+    """Stable hash of a ``BleakGATTServiceCollection``'s attribute table."""
+    rows = []
+    for svc in services:
+        for char in svc.characteristics:
+            rows.append((str(svc.uuid).lower(), str(char.uuid).lower(), int(char.handle),
+                         sorted(char.properties)))
+    rows.sort()
+    return hashlib.sha1(json.dumps(rows).encode()).hexdigest()
+
+
+class GattCache:
+    """Persistent ``{address|device_type: services}`` cache.
+
+    Parameters
+    ----------
+    path:
+        Cache file; defaults to :func:`default_gatt_cache_path`.
+    max_age_s:
+        Entries older than this are ignored (None: never expire).
+    """
+
+    def __init__(self, path: Optional[PathLike] = None, *, max_age_s: Optional[float] = None) -> None:
+        self.path = os.fspath(path) if path is not None else default_gatt_cache_path()
+        self.max_age_s = max_age_s
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @staticmethod
+    def _key(address: str, device_type: str) -> str:
+        return f"{address.upper()}|{device_type}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                entries = data.get("entries", {}) if data.get("version") == _VERSION else {}
+            except (OSError, ValueError):
+                entries = {}
+            self._entries = entries
+        return self._entries
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": _VERSION, "entries": self._entries or {}}, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def lookup(self, address: str) -> Optional[Dict[str, Any]]:
+        """Most recent valid entry for *address*, whatever its device type."""
+        prefix = f"{address.upper()}|"
+        now = time.time()
+        with self._lock:
+            candidates = [
+                e for k, e in self._load().items()
+                if k.startswith(prefix)
+                and (self.max_age_s is None or now - e.get("updated", 0) <= self.max_age_s)
+            ]
+        return max(candidates, key=lambda e: e.get("updated", 0), default=None)
+
+    def store(self, address: str, device_type: str, services: Any) -> Dict[str, Any]:
+        """Remember the discovered *services* of a device, replacing older entries for it.
+
+        Pass only the services the client uses; later connections discover
+        just those.
+        """
+        entry = {
+            "address": address.upper(),
+            "device_type": device_type,
+            "services": sorted(str(svc.uuid).lower() for svc in services),
+            "fingerprint": services_fingerprint(services),
+            "updated": time.time(),
+        }
+        with self._lock:
+            entries = self._load()
+            for key in [k for k in entries if k.startswith(f"{address.upper()}|")]:
+                del entries[key]
+            entries[self._key(address, device_type)] = entry
+            self._save()
+        return entry
+
+    def invalidate(self, address: str) -> None:
+        """Drop all entries for *address*."""
+        with self._lock:
+            entries = self._load()
+            keys = [k for k in entries if k.startswith(f"{address.upper()}|")]
+            for key in keys:
+                del entries[key]
+            if keys:
+                self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+    @staticmethod
+    def client_kwargs(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """``BleakClient`` keyword arguments that make use of *entry*."""
+        kwargs: Dict[str, Any] = {"services": list(entry["services"])}
+        if sys.platform == "win32":
+            kwargs["winrt"] = {"use_cached_services": True}
+        return kwargs
+
+    @staticmethod
+    def matches(entry: Dict[str, Any], services: Any) -> bool:
+        """True if the discovered *services* (same selection as stored) match the cached table."""
+        return entry.get("fingerprint") == services_fingerprint(services)
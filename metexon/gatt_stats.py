@@ -0,0 +1,170 @@
+"""Per-characteristic GATT latency histograms.
+
+Every ``read_gatt_char`` / ``write_gatt_char`` issued through a device's
+:class:`~metexon.gatt.GattClient` is recorded in a :class:`GattStats`,
+keyed by operation and characteristic UUID: call count, error count, bytes
+transferred and a latency histogram.
+
+:class:`LatencyHistogram` uses HDR-style log-linear buckets: every power of
+two is split into 16 linear sub-buckets, so quantiles are accurate to
+about 6 % over the full range (1 µs to days) with a fixed array of
+counters, independent of how many operations are recorded.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+__all__ = ["LatencyHistogram", "GattOpStats", "GattStats"]
+
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+# Values up to 2**40 µs (~12.7 days); larger values land in the last bucket.
+_MAX_EXPONENT = 40 - _SUB_BITS
+_BUCKETS = _SUB_COUNT + (_MAX_EXPONENT + 1) * _SUB_COUNT
+
+
+def _bucket(value_us: int) -> int:
+    if value_us < _SUB_COUNT:
+        return max(0, value_us)
+    exponent = value_us.bit_length() - _SUB_BITS - 1
+    if exponent > _MAX_EXPONENT:
+        return _BUCKETS - 1
+    return _SUB_COUNT + exponent * _SUB_COUNT + ((value_us >> exponent) - _SUB_COUNT)
+
+
+def _bucket_mid_us(index: int) -> float:
+    if index < _SUB_COUNT:
+        return float(index)
+    exponent, sub = divmod(index - _SUB_COUNT, _SUB_COUNT)
+    low = (_SUB_COUNT + sub) << exponent
+    return low + ((1 << exponent) - 1) / 2.0
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of durations (microsecond resolution)."""
+
+    __slots__ = ("counts", "count", "total_ns", "min_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * _BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns: Optional[int] = None
+
+    def record(self, duration_ns: int) -> None:
+        self.counts[_bucket(duration_ns // 1000)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if self.max_ns is None or duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total_ns += other.total_ns
+        for attr, pick in (("min_ns", min), ("max_ns", max)):
+            theirs = getattr(other, attr)
+            if theirs is not None:
+                mine = getattr(self, attr)
+                setattr(self, attr, theirs if mine is None else pick(mine, theirs))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate *q*-quantile (0..1) in seconds, None if empty."""
+        if not self.count:
+            return None
+        rank = max(1, int(q * self.count + 0.5))
+        if rank >= self.count:
+            return self.max_ns / 1e9  # type: ignore[operator]
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                value_s = _bucket_mid_us(i) / 1e6
+                # Clamp to the exact extremes, which are tracked separately.
+                return min(max(value_s, self.min_ns / 1e9), self.max_ns / 1e9)  # type: ignore[operator]
+        return self.max_ns / 1e9  # type: ignore[operator]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total_ns / self.count / 1e9 if self.count else None
+
+
+@dataclass
+class GattOpStats:
+    """Counters of one (operation, characteristic) pair."""
+    calls: int = 0
+    errors: int = 0
+    bytes: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def summary(self) -> Dict[str, Any]:
+        h = self.latency
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "mean_s": h.mean,
+            "p50_s": h.quantile(0.5),
+            "p90_s": h.quantile(0.9),
+            "p99_s": h.quantile(0.99),
+            "max_s": None if h.max_ns is None else h.max_ns / 1e9,
+        }
+
+
+class GattStats:
+    """:class:`GattOpStats` per ``(operation, characteristic UUID)``."""
+
+    def __init__(self) -> None:
+        self._ops: Dict[Tuple[str, str], GattOpStats] = {}
+        self.since = time.monotonic()
+
+    def record(self, operation: str, characteristic: str, duration_ns: int,
+               nbytes: int = 0, error: bool = False) -> None:
+        key = (operation, characteristic)
+        st = self._ops.get(key)
+        if st is None:
+            st = self._ops[key] = GattOpStats()
+        st.calls += 1
+        st.bytes += nbytes
+        if error:
+            st.errors += 1
+        st.latency.record(duration_ns)
+
+    def get(self, operation: str, characteristic: str) -> Optional[GattOpStats]:
+        return self._ops.get((operation, characteristic.lower()))
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[str, str], GattOpStats]]:
+        return iter(list(self._ops.items()))
+
+    def reset(self) -> None:
+        self._ops = {}
+        self.since = time.monotonic()
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """``{characteristic: {operation: counters and latency quantiles}}``."""
+        out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (op, char), st in self:
+            out.setdefault(char, {})[op] = st.summary()
+        return out
+
+    def format_summary(self, names: Optional[Dict[str, str]] = None) -> str:
+        """Human-readable table; *names* maps UUIDs to display names."""
+        lines = [f"GATT stats over {time.monotonic() - self.since:.0f} s:"]
+        for (op, char), st in sorted(self, key=lambda kv: kv[0][1]):
+            s = st.summary()
+            label = (names or {}).get(char, char)
+            lines.append(
+                f"  {label} {op}: {s['calls']} calls, {s['errors']} errors, {s['bytes']} B, "
+                f"p50 {_ms(s['p50_s'])} p99 {_ms(s['p99_s'])} max {_ms(s['max_s'])}")
+        return "\n".join(lines)
+
+
+def _ms(value_s: Optional[float]) -> str:
+    return "-" if value_s is None else f"{value_s * 1000:.1f}ms"
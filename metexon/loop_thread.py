@@ -1,18 +1,29 @@
 """Utility to run an asyncio event loop in a background thread.
 
 Allows providing synchronous wrapper methods that internally run coroutines.
+
+Sync device clients share a small process-wide pool of loop threads (see
+:func:`acquire_shared_loop_thread`) instead of starting one thread per
+client: BLE operations spend nearly all their time waiting, so one loop can
+serve many devices. The pool is reference counted; a loop thread is closed
+when its last client releases it.
 """
 from __future__ import annotations
 
 import asyncio
 import threading
 import logging
-from typing import Any, Coroutine, TypeVar, Callable
+from typing import Any, Coroutine, Dict, Optional, TypeVar, Callable
 from concurrent.futures import Future
 from concurrent.futures import TimeoutError as FutureTimeoutError
 
+from .deadlines import run_with_deadline
+from .exceptions import OperationTimeoutError
+
 T = TypeVar('T')
 
+_DEADLINE_GRACE_S = 1.0
+
 class AsyncLoopThread:
     def __init__(self) -> None:
         self._loop = asyncio.new_event_loop()
@@ -27,11 +38,27 @@ class AsyncLoopThread:
         self._started.set()
         self._loop.run_forever()
 
-    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run *coro* on the loop and return its result.
+
+        With a *timeout*, the coroutine is cancelled on the loop when it
+        expires and :class:`~metexon.exceptions.OperationTimeoutError` is
+        raised (see :mod:`metexon.deadlines`).
+        """
         if self._closed:
             raise RuntimeError("Loop thread closed")
-        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        return fut.result()
+        if timeout is None:
+            return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+        fut = asyncio.run_coroutine_threadsafe(run_with_deadline(coro, timeout), self._loop)
+        try:
+            # The deadline is enforced on the loop; the grace period only
+            # matters if the loop itself is blocked.
+            return fut.result(timeout + _DEADLINE_GRACE_S)
+        except FutureTimeoutError as exc:
+            if isinstance(exc, OperationTimeoutError):
+                raise
+            fut.cancel()
+            raise OperationTimeoutError(timeout) from None
 
     def create_task(self, coro: Coroutine[Any, Any, Any]) -> Future:
         if self._closed:
@@ -49,7 +76,6 @@ class AsyncLoopThread:
             t.cancel()
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
-        self._loop.stop()
 
     async def _call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
         return func(*args, **kwargs)
@@ -66,6 +92,9 @@ class AsyncLoopThread:
                     "Timeout while waiting for loop thread shutdown; continuing to close.")
         finally:
             self._closed = True
+            # Stop from a separate callback so the shutdown future's result is
+            # delivered before the loop exits.
+            self._loop.call_soon_threadsafe(self._loop.stop)
             # Give the loop a moment to stop and then close it.
             try:
                 self._thread.join(timeout=0.5)
@@ -78,4 +107,78 @@ class AsyncLoopThread:
                 # Loop may already be closed
                 pass
 
-__all__ = ["AsyncLoopThread"]
+
+class _SharedLoopPool:
+    """Reference-counted pool of up to ``size`` loop threads."""
+
+    def __init__(self, size: int = 1) -> None:
+        self.size = size
+        self._lock = threading.Lock()
+        self._refs: Dict[AsyncLoopThread, int] = {}
+
+    def acquire(self) -> AsyncLoopThread:
+        with self._lock:
+            if len(self._refs) < self.size:
+                thread = AsyncLoopThread()
+                self._refs[thread] = 0
+            else:
+                thread = min(self._refs, key=self._refs.__getitem__)
+            self._refs[thread] += 1
+            return thread
+
+    def release(self, thread: AsyncLoopThread) -> None:
+        with self._lock:
+            refs = self._refs.get(thread)
+            if refs is None:
+                return
+            if refs > 1:
+                self._refs[thread] = refs - 1
+                return
+            del self._refs[thread]
+        thread.close()
+
+    def active(self) -> Dict[AsyncLoopThread, int]:
+        with self._lock:
+            return dict(self._refs)
+
+
+_shared_pool = _SharedLoopPool()
+
+
+def acquire_shared_loop_thread() -> AsyncLoopThread:
+    """Return a shared loop thread, starting one if the pool is not full.
+
+    Threads are handed out least-referenced first. Every call must be paired
+    with :func:`release_shared_loop_thread`.
+    """
+    return _shared_pool.acquire()
+
+
+def release_shared_loop_thread(thread: AsyncLoopThread) -> None:
+    """Drop a reference; the thread is closed when no client uses it anymore."""
+    _shared_pool.release(thread)
+
+
+def set_shared_loop_pool_size(size: int) -> None:
+    """Set the maximum number of shared loop threads (default 1).
+
+    Already running threads are kept; the new size applies to later
+    :func:`acquire_shared_loop_thread` calls.
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    _shared_pool.size = int(size)
+
+
+def shared_loop_threads() -> Dict[AsyncLoopThread, int]:
+    """Return the running shared loop threads and their reference counts."""
+    return _shared_pool.active()
+
+
+__all__ = [
+    "AsyncLoopThread",
+    "acquire_shared_loop_thread",
+    "release_shared_loop_thread",
+    "set_shared_loop_pool_size",
+    "shared_loop_threads",
+]
@@ -0,0 +1,299 @@
+"""Supervised connections with automatic reconnect.
+
+A device created with ``reconnect=True`` (or a :class:`ReconnectPolicy`)
+watches its link through the ``BleakClient`` disconnect callback. When the
+link drops unexpectedly, a :class:`ConnectionSupervisor` reconnects in the
+background with jittered exponential backoff and replays the session:
+
+* notification subscriptions made through ``device.client.start_notify``
+  are re-registered with their original callbacks, then
+* the device restores its own state (``_arestore_session``; e.g. a running
+  parameter stream is restarted with the same ``ids`` and ``interval_ms``).
+
+While the link is down, ``device.client`` is a :class:`SupervisedClient`
+whose GATT operations wait for the reconnect (up to
+``ReconnectPolicy.wait_timeout_s``) instead of failing immediately. A read (or notification
+(un)subscription) that fails because the link dropped while it was in flight
+is retried once the link is back. Writes are only retried when the caller
+marks them ``idempotent=True`` (e.g. writing a complete structure): the
+device may have applied a write before the link dropped, and commands such as
+``nvs_set`` or starting an OTA update must not run twice. Any other write
+that was in flight raises :class:`~metexon.exceptions.ConnectionLostError`
+(the write may or may not have been applied). When the deadline passes or
+the policy gives up, :class:`~metexon.exceptions.ConnectionLostError` is
+raised as well.
+
+Some requests span several operations whose state the device keeps per
+connection, e.g. writing an NVS list offset and reading the page it selected.
+Such pairs run as a :meth:`ConnectionSupervisor.transaction`: the operations
+inside are never retried on their own, and if the link drops anywhere within
+the transaction, the whole transaction is re-run after the reconnect
+(``retry=True``) or fails with ``ConnectionLostError``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from bleak.exc import BleakError
+
+from .exceptions import ConnectionLostError
+from .gatt import _char_key
+
+if TYPE_CHECKING:
+    from .base import BaseMetexonDevice
+
+__all__ = ["ReconnectPolicy", "ConnectionSupervisor", "SupervisedClient"]
+
+_log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Link epoch at the start of the transaction the current task is running, if any
+_transaction_epoch: ContextVar[Optional[int]] = ContextVar("metexon_transaction_epoch", default=None)
+
+
+@dataclass
+class ReconnectPolicy:
+    """Backoff and deadline settings for supervised connections.
+
+    The n-th retry (starting at 0) waits
+    ``min(max_delay_s, initial_delay_s * multiplier**n)``, reduced by a random
+    fraction of up to ``jitter`` so many devices dropping at once do not
+    reconnect in lockstep.
+    """
+    initial_delay_s: float = 0.5
+    max_delay_s: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    # Give up after this many failed attempts (None: retry until disconnect())
+    max_attempts: Optional[int] = None
+    # How long GATT operations wait for the link to come back
+    wait_timeout_s: float = 30.0
+
+    def delay(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        base = min(self.max_delay_s, self.initial_delay_s * self.multiplier ** attempt)
+        return base * (1.0 - self.jitter * (rng or random).random())
+
+
+class ConnectionSupervisor:
+    """Reconnect state machine of one device; all methods run on its loop."""
+
+    def __init__(self, device: "BaseMetexonDevice", policy: ReconnectPolicy) -> None:
+        self.device = device
+        self.policy = policy
+        self.client = SupervisedClient(self)
+        self.reconnects = 0
+        # Incremented whenever the link is lost; transactions compare it
+        self.epoch = 0
+        self.last_error: Optional[BaseException] = None
+        # uuid -> (char_specifier, callback, kwargs) for replay after reconnect
+        self.subscriptions: Dict[str, Tuple[Any, Callable[..., Any], Dict[str, Any]]] = {}
+        self._rng = random.Random()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._up: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._gave_up: Optional[BaseException] = None
+        self._closing = False
+
+    @property
+    def link_up(self) -> bool:
+        return self._up is not None and self._up.is_set()
+
+    @property
+    def gave_up(self) -> Optional[BaseException]:
+        """The last reconnect error if the policy gave up, else None."""
+        return self._gave_up
+
+    def attach(self) -> None:
+        """Called after the initial connect (on the device's loop)."""
+        self._loop = asyncio.get_running_loop()
+        self._up = asyncio.Event()
+        self._up.set()
+        self._gave_up = None
+        self._closing = False
+        self.subscriptions.clear()
+
+    async def aclose(self) -> None:
+        """Stop supervising (intentional disconnect)."""
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        self.subscriptions.clear()
+
+    def on_disconnected(self, client: Any) -> None:
+        """``disconnected_callback`` for the ``BleakClient``; may run on any thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._link_lost, client)
+
+    def _link_lost(self, client: Any) -> None:
+        if self._closing or client is not self.device._client or self._up is None:
+            return
+        if self._task is not None and not self._task.done():
+            return
+        _log.warning("Connection to %s lost; reconnecting", self.device.address)
+        self.epoch += 1
+        self._up.clear()
+        self._task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        while not self._closing:
+            await asyncio.sleep(self.policy.delay(attempt, self._rng))
+            attempt += 1
+            try:
+                client = await self.device._anew_client()
+            except Exception as exc:
+                self.last_error = exc
+                _log.info("Reconnect attempt %d to %s failed: %s", attempt, self.device.address, exc)
+                if self.policy.max_attempts is not None and attempt >= self.policy.max_attempts:
+                    self._give_up(exc)
+                    return
+                continue
+            self.device._client = client
+            try:
+                await self._restore(client)
+            except Exception as exc:
+                self.last_error = exc
+                _log.warning("Restoring session on %s failed: %s", self.device.address, exc)
+                if not client.is_connected:
+                    continue
+            self.reconnects += 1
+            _log.info("Reconnected to %s after %d attempt(s)", self.device.address, attempt)
+            assert self._up is not None
+            self._up.set()
+            return
+
+    async def _restore(self, client: Any) -> None:
+        for char, callback, kwargs in list(self.subscriptions.values()):
+            await client.start_notify(char, callback, **kwargs)
+        await self.device._arestore_session(client)
+
+    def _give_up(self, exc: BaseException) -> None:
+        _log.error("Giving up reconnecting to %s: %s", self.device.address, exc)
+        self._gave_up = exc
+        self.device._client = None
+        assert self._up is not None
+        self._up.set()  # wake waiters so they fail now instead of at their deadline
+
+    async def _wait_up(self, deadline: float) -> None:
+        assert self._up is not None and self._loop is not None
+        if not self._up.is_set():
+            remaining = deadline - self._loop.time()
+            try:
+                await asyncio.wait_for(self._up.wait(), max(0.0, remaining))
+            except asyncio.TimeoutError:
+                raise ConnectionLostError(
+                    f"Connection to {self.device.address} not restored within "
+                    f"{self.policy.wait_timeout_s} s") from self.last_error
+        if self._gave_up is not None or self.device._client is None:
+            raise ConnectionLostError(f"Connection to {self.device.address} lost") from self._gave_up
+
+    async def call(self, name: str, *args: Any, retry: bool = True, **kwargs: Any) -> Any:
+        """Run ``client.<name>(*args, **kwargs)``, waiting for reconnects.
+
+        If the link drops while the operation is in flight, it is re-issued
+        after the reconnect when *retry* is true; otherwise
+        :class:`~metexon.exceptions.ConnectionLostError` is raised.
+        """
+        if self._loop is None or self._up is None:
+            return await getattr(self.device._client, name)(*args, **kwargs)
+        tx_epoch = _transaction_epoch.get()
+        deadline = self._loop.time() + self.policy.wait_timeout_s
+        while True:
+            self._check_transaction(tx_epoch, name)
+            await self._wait_up(deadline)
+            self._check_transaction(tx_epoch, name)
+            client = self.device._client
+            try:
+                return await getattr(client, name)(*args, **kwargs)
+            except (BleakError, OSError, EOFError) as exc:
+                if self._closing or client.is_connected:
+                    raise
+                # The link dropped during the operation; the disconnect
+                # callback may not have arrived yet.
+                self._link_lost(client)
+                if tx_epoch is not None:
+                    raise ConnectionLostError(
+                        f"Connection to {self.device.address} lost during {name} in a transaction") from exc
+                if not retry:
+                    raise ConnectionLostError(
+                        f"Connection to {self.device.address} lost during {name}; "
+                        "not retried because it may have been applied") from exc
+
+
+    def _check_transaction(self, tx_epoch: Optional[int], name: str) -> None:
+        if tx_epoch is not None and tx_epoch != self.epoch:
+            raise ConnectionLostError(
+                f"Connection to {self.device.address} was lost before {name} in a transaction")
+
+    async def transaction(self, fn: Callable[[], Awaitable[T]], *, retry: bool) -> T:
+        """Run the GATT operations of *fn* as one unit across reconnects.
+
+        If the link drops before *fn* completes, *fn* is run again from the
+        start once the link is back when *retry* is true; otherwise
+        :class:`~metexon.exceptions.ConnectionLostError` is raised.
+        """
+        if self._loop is None or self._up is None:
+            return await fn()
+        deadline = self._loop.time() + self.policy.wait_timeout_s
+        while True:
+            await self._wait_up(deadline)
+            token = _transaction_epoch.set(self.epoch)
+            try:
+                return await fn()
+            except ConnectionLostError as exc:
+                if self._closing or self._gave_up is not None:
+                    raise
+                if not retry:
+                    raise ConnectionLostError(
+                        f"Connection to {self.device.address} lost during a transaction; "
+                        "not retried because it may have been applied") from exc
+                _log.info("Link to %s dropped during a transaction; running it again", self.device.address)
+            finally:
+                _transaction_epoch.reset(token)
+
+
+class SupervisedClient:
+    """``BleakClient`` stand-in that survives reconnects.
+
+    GATT operations go through :meth:`ConnectionSupervisor.call`; other
+    attributes (``services``, ``is_connected``, ``mtu_size`` ...) are read
+    from the current underlying client.
+    """
+
+    def __init__(self, supervisor: ConnectionSupervisor) -> None:
+        self._supervisor = supervisor
+
+    def __getattr__(self, name: str) -> Any:
+        client = self._supervisor.device._client
+        if client is None:
+            raise RuntimeError("Not connected")
+        return getattr(client, name)
+
+    async def read_gatt_char(self, char_specifier: Any, **kwargs: Any) -> bytearray:
+        return await self._supervisor.call("read_gatt_char", char_specifier, **kwargs)
+
+    async def write_gatt_char(self, char_specifier: Any, data: Any, response: Optional[bool] = None, *,
+                              idempotent: bool = False) -> None:
+        await self._supervisor.call("write_gatt_char", char_specifier, data, response=response,
+                                    retry=idempotent)
+
+    async def start_notify(self, char_specifier: Any, callback: Callable[..., Any], **kwargs: Any) -> None:
+        await self._supervisor.call("start_notify", char_specifier, callback, **kwargs)
+        self._supervisor.subscriptions[_char_key(char_specifier)] = (char_specifier, callback, kwargs)
+
+    async def stop_notify(self, char_specifier: Any) -> None:
+        self._supervisor.subscriptions.pop(_char_key(char_specifier), None)
+        if self._supervisor.link_up:
+            await self._supervisor.call("stop_notify", char_specifier)
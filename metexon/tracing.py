@@ -0,0 +1,218 @@
+"""Span hooks for client methods and GATT operations.
+
+Install a :class:`Tracer` with :func:`set_tracer` to be called at the start
+and end of every public client method (``read_system_state``, ``nvs_list``,
+``write_rgb_led`` ...) and every GATT read/write underneath it::
+
+    class PrintTracer(Tracer):
+        def on_end(self, span):
+            print("  " * span.depth, span.name, span.attributes, f"{span.duration_s * 1000:.1f} ms")
+
+    set_tracer(PrintTracer())
+
+Spans form a tree: the span active when another one starts becomes its
+parent. The current span is kept in a :class:`~contextvars.ContextVar`, and
+``asyncio.run_coroutine_threadsafe`` copies the caller's context, so a span
+opened around sync calls (``with span("calibrate"): zr.read_system_state()``)
+is the parent of the spans created on the loop thread. Tasks started with
+``asyncio.gather`` (e.g. ``snapshot``) inherit it the same way.
+
+Span attributes used by this package:
+
+* client methods: ``address``
+* GATT operations (``gatt.read`` / ``gatt.write``): ``uuid``, ``bytes``,
+  ``error`` (exception type name) on failure
+* paged list reads (``nvs_list.page``, ``parameter_stream_list.page``):
+  ``offset``, ``entries``
+
+While no tracer is installed every hook reduces to a check of the
+module-level :data:`tracer`; nothing is allocated.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+__all__ = ["Span", "Tracer", "RecordingTracer", "tracer", "set_tracer", "current_span",
+           "start_span", "end_span", "span", "annotate", "traced"]
+
+_log = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class Span:
+    __slots__ = ("name", "attributes", "parent", "depth", "start_ns", "end_ns", "error",
+                 "_tracer", "_token")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"],
+                 tracer: "Tracer") -> None:
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self._tracer = tracer
+        self._token: Optional[Token] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e9
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.attributes!r}, duration_s={self.duration_s})"
+
+
+class Tracer:
+    """Base class of span hooks; override the ones you need.
+
+    Hooks run synchronously on the thread executing the operation (usually
+    the event loop) and should return quickly. Exceptions they raise are
+    logged and otherwise ignored.
+    """
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+class RecordingTracer(Tracer):
+    """Keeps finished spans in :attr:`spans` (bounded by *max_spans*)."""
+
+    def __init__(self, max_spans: int = 10_000) -> None:
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+
+    def on_end(self, span: Span) -> None:
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+
+    def children(self, parent: Span) -> List[Span]:
+        return [s for s in self.spans if s.parent is parent]
+
+
+#: The installed tracer (None: tracing disabled)
+tracer: Optional[Tracer] = None
+
+current_span: ContextVar[Optional[Span]] = ContextVar("metexon_span", default=None)
+
+
+def set_tracer(new: Optional[Tracer]) -> Optional[Tracer]:
+    """Install *new* (None disables tracing); return the previous tracer."""
+    global tracer
+    previous, tracer = tracer, new
+    return previous
+
+
+def start_span(name: str, **attributes: Any) -> Optional[Span]:
+    """Open a child of the current span; None while tracing is disabled.
+
+    Must be closed with :func:`end_span` in the same task or thread.
+    """
+    t = tracer
+    if t is None:
+        return None
+    s = Span(name, attributes, current_span.get(), t)
+    s._token = current_span.set(s)
+    try:
+        t.on_start(s)
+    except Exception:
+        _log.exception("Tracer.on_start failed")
+    return s
+
+
+def end_span(s: Optional[Span], error: Optional[BaseException] = None) -> None:
+    if s is None:
+        return
+    s.end_ns = time.perf_counter_ns()
+    if error is not None:
+        s.error = error
+        s.attributes.setdefault("error", type(error).__name__)
+    if s._token is not None:
+        current_span.reset(s._token)
+        s._token = None
+    try:
+        s._tracer.on_end(s)
+    except Exception:
+        _log.exception("Tracer.on_end failed")
+
+
+class _SpanContext:
+    __slots__ = ("_name", "_attributes", "span")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]) -> None:
+        self._name = name
+        self._attributes = attributes
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Optional[Span]:
+        self.span = start_span(self._name, **self._attributes)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end_span(self.span, exc)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """``with span(name, **attributes) as s:`` (``s`` is None while disabled)."""
+    if tracer is None:
+        return _NO_SPAN
+    return _SpanContext(name, attributes)
+
+
+def annotate(**attributes: Any) -> None:
+    """Add attributes to the current span, if any."""
+    if tracer is None:
+        return
+    s = current_span.get()
+    if s is not None:
+        s.attributes.update(attributes)
+
+
+def traced(func: F) -> F:
+    """Trace a device coroutine method as a span named after its sync twin.
+
+    The leading ``a`` of the coroutine name is dropped, so ``aread_system_state``
+    (and ``read_system_state``, which runs it) yields ``read_system_state``
+    spans carrying the device ``address``.
+    """
+    name = func.__name__[1:] if func.__name__.startswith("a") else func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if tracer is None:
+            return await func(self, *args, **kwargs)
+        s = start_span(name, address=getattr(self, "address", None))
+        try:
+            result = await func(self, *args, **kwargs)
+        except BaseException as exc:
+            end_span(s, exc)
+            raise
+        end_span(s)
+        return result
+
+    return wrapper  # type: ignore[return-value]
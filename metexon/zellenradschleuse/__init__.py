@@ -1,8 +1,57 @@
 """Zellenradschleuse (Metexon feeder system) specific code.
 
 This namespace hosts all data structures and client classes specific to the
-Zellenradschleuse device family.
+Zellenradschleuse device family. Names are imported lazily, so the data
+structures can be used without loading the BLE stack.
 """
-from .structures import SystemState, ManualControl, BlowerPID, RGB  # noqa: F401
-from .client import ZellenradschleuseClient  # noqa: F401
-from .parameter_stream_client import ParameterStreamFrame  # noqa: F401
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .structures import SystemState, ManualControl, BlowerPID, RGB  # noqa: F401
+    from .structures import SystemStateRecord, ManualControlRecord, BlowerPIDRecord  # noqa: F401
+    from .views import SystemStateView, ManualControlView, BlowerPIDView  # noqa: F401
+    from .client import ZellenradschleuseClient, AsyncZellenradschleuseClient  # noqa: F401
+    from .parameter_stream_client import ParameterStreamFrame, ParameterStreamDecoder  # noqa: F401
+    from .fleet import ZellenradschleuseFleet, FleetResult  # noqa: F401
+    from .snapshot import ZellenradschleuseSnapshot  # noqa: F401
+    from .advertisement import AdvertisedState  # noqa: F401
+
+_LAZY = {
+    "SystemState": ".structures",
+    "ManualControl": ".structures",
+    "BlowerPID": ".structures",
+    "RGB": ".structures",
+    "SystemStateRecord": ".structures",
+    "ManualControlRecord": ".structures",
+    "BlowerPIDRecord": ".structures",
+    "SystemStateView": ".views",
+    "ManualControlView": ".views",
+    "BlowerPIDView": ".views",
+    "ZellenradschleuseClient": ".client",
+    "AsyncZellenradschleuseClient": ".client",
+    "ParameterStreamFrame": ".parameter_stream_client",
+    "ParameterStreamDecoder": ".parameter_stream_client",
+    "ZellenradschleuseFleet": ".fleet",
+    "FleetResult": ".fleet",
+    "ZellenradschleuseSnapshot": ".snapshot",
+    "AdvertisedState": ".advertisement",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
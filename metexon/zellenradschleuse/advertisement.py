@@ -0,0 +1,147 @@
+"""Coarse device state decoded from advertisements, without connecting.
+
+Firmware that supports it appends a compact telemetry payload to its
+advertisements, either as manufacturer specific data under
+:data:`ADVERTISEMENT_COMPANY_ID` or as service data of the Metexon service
+UUID (bleak reports service data keys as lower-case UUID strings).
+Monitoring a fleet through these payloads needs no connection (and no
+connection slot on the adapter); the state is as fresh as the advertising
+interval.
+
+Payload layout (little endian, 18 bytes, struct ``<BBffff``):
+
+====== ======= =========================================
+Offset Type    Field
+====== ======= =========================================
+0      uint8   payload version (:data:`ADVERTISEMENT_VERSION`)
+1      uint8   ``state``
+2      float32 ``pressure1`` [Pa]
+6      float32 ``pressure2`` [Pa]
+10     float32 ``motorCurrent`` [A]
+14     float32 ``blowerPulseRateRPM``
+====== ======= =========================================
+
+Fields follow :class:`~metexon.zellenradschleuse.structures.SystemState`.
+Payloads with a different version or length are ignored (newer versions may
+only append fields, so longer payloads decode their known prefix).
+Metexon has no Bluetooth SIG company identifier; 0xFFFF is the value the SIG
+reserves for this kind of unregistered use.
+
+Use :func:`aiter_advertised_states` (the callback scanner pipeline of
+:mod:`metexon.discovery`)::
+
+    async with aiter_advertised_states(timeout=None) as scan:
+        async for st in scan:
+            print(st.address, st.state, st.pressure1)
+"""
+from __future__ import annotations
+
+import logging
+import struct
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from ..constants import METEXON_SERVICE_UUID
+from ..discovery import MetexonScan
+from .structures import SystemState
+
+_log = logging.getLogger(__name__)
+
+__all__ = [
+    "ADVERTISEMENT_COMPANY_ID",
+    "ADVERTISEMENT_VERSION",
+    "AdvertisedState",
+    "AdvertisedStateScan",
+    "aiter_advertised_states",
+    "decode_advertised_state",
+    "encode_advertisement_payload",
+]
+
+ADVERTISEMENT_COMPANY_ID = 0xFFFF
+ADVERTISEMENT_VERSION = 1
+
+_ADV_STRUCT = struct.Struct('<BBffff')
+_SERVICE_STR = str(METEXON_SERVICE_UUID).lower()
+
+
+class AdvertisedState(NamedTuple):
+    address: str
+    rssi: Optional[int]
+    # time.monotonic_ns() when the advertisement was received
+    received_ns: int
+    state: int
+    pressure1: float
+    pressure2: float
+    motorCurrent: float
+    blowerPulseRateRPM: float
+
+
+def encode_advertisement_payload(state: SystemState) -> bytes:
+    """Payload the firmware advertises for *state* (used by the simulator)."""
+    return _ADV_STRUCT.pack(ADVERTISEMENT_VERSION, state.state, state.pressure1, state.pressure2,
+                            state.motorCurrent, state.blowerPulseRateRPM)
+
+
+def _payload(adv: Any) -> Optional[bytes]:
+    data = (getattr(adv, "manufacturer_data", None) or {}).get(ADVERTISEMENT_COMPANY_ID)
+    if data is None:
+        service_data = getattr(adv, "service_data", None) or {}
+        data = service_data.get(_SERVICE_STR)
+    if data is None or len(data) < _ADV_STRUCT.size or data[0] != ADVERTISEMENT_VERSION:
+        return None
+    return data
+
+
+def decode_advertised_state(address: str, adv: Any,
+                            received_ns: Optional[int] = None) -> Optional[AdvertisedState]:
+    """Decode the telemetry payload of *adv* (``AdvertisementData``), or None if it has none."""
+    data = _payload(adv)
+    if data is None:
+        return None
+    _, state, p1, p2, current, rpm = _ADV_STRUCT.unpack_from(data)
+    return AdvertisedState(address, getattr(adv, "rssi", None),
+                           time.monotonic_ns() if received_ns is None else received_ns,
+                           state, p1, p2, current, rpm)
+
+
+class AdvertisedStateScan(MetexonScan):
+    """Scan yielding an :class:`AdvertisedState` per telemetry advertisement.
+
+    Devices are matched by their payload, not by name. :attr:`latest` holds
+    the most recent state per address; *callback* is called with every
+    decoded state on the event loop (e.g. to update a dashboard without
+    consuming the iterator, in which case pass ``yield_states=False``).
+    """
+
+    def __init__(self, timeout: Optional[float] = None, *,
+                 scanner_factory: Optional[Callable[..., Any]] = None,
+                 callback: Optional[Callable[[AdvertisedState], None]] = None,
+                 yield_states: bool = True, maxsize: int = 1024) -> None:
+        super().__init__(timeout, "name", dedupe=False, scanner_factory=scanner_factory, maxsize=maxsize)
+        self.latest: Dict[str, AdvertisedState] = {}
+        self._callback = callback
+        self._yield_states = yield_states
+
+    def _accept(self, device: Any, adv: Any) -> Optional[AdvertisedState]:
+        st = decode_advertised_state(device.address, adv)
+        if st is None:
+            return None
+        self.latest[st.address] = st
+        if self._callback is not None:
+            try:
+                self._callback(st)
+            except Exception:
+                _log.exception("Advertised state callback failed")
+        return st if self._yield_states else None
+
+
+def aiter_advertised_states(timeout: Optional[float] = None, *,
+                            scanner_factory: Optional[Callable[..., Any]] = None,
+                            callback: Optional[Callable[[AdvertisedState], None]] = None,
+                            yield_states: bool = True) -> AdvertisedStateScan:
+    """Stream decoded telemetry advertisements of all devices in range.
+
+    Use as ``async with`` block; *timeout* None scans until closed.
+    """
+    return AdvertisedStateScan(timeout, scanner_factory=scanner_factory, callback=callback,
+                               yield_states=yield_states)
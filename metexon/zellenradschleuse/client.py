@@ -1,11 +1,29 @@
-"""Typed client for Zellenradschleuse devices."""
+"""Typed client for Zellenradschleuse devices.
+
+Every operation exists twice: a blocking method (``read_system_state()``)
+that runs on the background loop thread, and a coroutine with an ``a``
+prefix (``aread_system_state()``) for native asyncio code. The blocking
+methods are one loop hop around their coroutine. For asyncio-only
+applications use :class:`AsyncZellenradschleuseClient`, which does not start
+a loop thread::
+
+    async with AsyncZellenradschleuseClient(address) as zr:
+        print(await zr.adevice_type())
+        print(await zr.aread_system_state())
+"""
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
+import asyncio
 import json
+import time
 
 from ..base import BaseMetexonDevice
+from ..tracing import traced
 from .constants import (
+    METEXON_SERVICE_UUID,
+    NVS_SERVICE_UUID,
+    PARAM_STREAM_SERVICE_UUID,
     DEVICE_TYPE_UUID,
     SYSTEM_STATE_UUID,
     BLOWER_PID_UUID,
@@ -14,9 +32,11 @@ from .constants import (
     MANUAL_CONTROL_UUID,
 )
 from .structures import SystemState, ManualControl, BlowerPID
+from .views import SystemStateView
 from .update_helpers import partial_system_state
 from .nvs_client import NVSClient
 from .parameter_stream_client import ParameterStreamClient
+from .snapshot import ZellenradschleuseSnapshot
 
 class ZellenradschleuseClient(ParameterStreamClient, NVSClient, BaseMetexonDevice):
     """Client with typed return values.
@@ -24,38 +44,114 @@ class ZellenradschleuseClient(ParameterStreamClient, NVSClient, BaseMetexonDevic
     Can be used either with context manager or explicit connect()/disconnect().
     """
 
+    _GATT_SERVICES = (METEXON_SERVICE_UUID, NVS_SERVICE_UUID, PARAM_STREAM_SERVICE_UUID)
+
     # ---- Typed sync API ----
     def device_type(self) -> str:
-        data = self._run(self.client.read_gatt_char(DEVICE_TYPE_UUID))
-        return data.decode(errors='replace')
+        return self._run(self.adevice_type())
 
     def read_system_state(self) -> SystemState:
-        data = self._run(self.client.read_gatt_char(SYSTEM_STATE_UUID))
-        return SystemState.from_bytes(data)
+        return self._run(self.aread_system_state())
+
+    def read_system_state_view(self, view: Optional[SystemStateView] = None) -> SystemStateView:
+        return self._run(self.aread_system_state_view(view))
 
     def write_system_state(self, value: SystemState) -> None:
-        self._run(self.client.write_gatt_char(SYSTEM_STATE_UUID, value.to_bytes()))
+        self._run(self.awrite_system_state(value))
 
     def read_blower_pid(self) -> BlowerPID:
-        data = self._run(self.client.read_gatt_char(BLOWER_PID_UUID))
-        return BlowerPID.from_bytes(data)
+        return self._run(self.aread_blower_pid())
 
     def write_blower_pid(self, value: BlowerPID) -> None:
-        self._run(self.client.write_gatt_char(BLOWER_PID_UUID, value.to_bytes()))
+        self._run(self.awrite_blower_pid(value))
 
     def read_manual_control(self) -> ManualControl:
-        data = self._run(self.client.read_gatt_char(MANUAL_CONTROL_UUID))
-        return ManualControl.from_bytes(data)
+        return self._run(self.aread_manual_control())
 
     def write_manual_control(self, value: ManualControl) -> None:
-        self._run(self.client.write_gatt_char(MANUAL_CONTROL_UUID, value.to_bytes()))
+        self._run(self.awrite_manual_control(value))
 
     def read_rgb_led(self) -> List[tuple[int,int,int]]:
+        return self._run(self.aread_rgb_led())
+
+    def write_rgb_led(self, colors: Iterable[Iterable[int]]) -> None:
+        self._run(self.awrite_rgb_led(colors))
+
+    def wifi_status(self) -> Dict[str, Any]:
+        return self._run(self.awifi_status())
+
+    def set_wifi(self, ssid: Optional[str] = None, password: Optional[str] = None) -> None:
+        self._run(self.aset_wifi(ssid=ssid, password=password))
+
+    def start_ota(self, url: str) -> None:
+        self._run(self.astart_ota(url))
+
+    def snapshot(self, *, system_state: bool = True, blower_pid: bool = True,
+                 manual_control: bool = True, wifi: bool = False) -> ZellenradschleuseSnapshot:
+        """Read the selected characteristics concurrently in one loop hop.
+
+        All reads are submitted together so the BLE stack can pipeline
+        them; each result is timestamped when it arrives.
+        """
+        return self._run(self.asnapshot(system_state=system_state, blower_pid=blower_pid,
+                                        manual_control=manual_control, wifi=wifi))
+
+    # ---- Typed async API ----
+    @traced
+    async def adevice_type(self) -> str:
+        data = await self.client.read_gatt_char(DEVICE_TYPE_UUID)
+        device_type = data.decode(errors='replace')
+        await self._anote_device_type(device_type)
+        return device_type
+
+    @traced
+    async def aread_system_state(self) -> SystemState:
+        data = await self.client.read_gatt_char(SYSTEM_STATE_UUID)
+        return SystemState.from_bytes(data)
+
+    @traced
+    async def aread_system_state_view(self, view: Optional[SystemStateView] = None) -> SystemStateView:
+        """Read the system state as a lazy :class:`~.views.SystemStateView`.
+
+        Fields are decoded on access from the received buffer. Pass the
+        *view* of the previous read to rebind it instead of allocating one.
+        """
+        data = await self.client.read_gatt_char(SYSTEM_STATE_UUID)
+        if view is None:
+            return SystemStateView(data)
+        view.rebind(data)
+        return view
+
+    @traced
+    async def awrite_system_state(self, value: SystemState) -> None:
+        await self.client.write_gatt_char(SYSTEM_STATE_UUID, value.to_bytes(), idempotent=True)
+
+    @traced
+    async def aread_blower_pid(self) -> BlowerPID:
+        data = await self.client.read_gatt_char(BLOWER_PID_UUID)
+        return BlowerPID.from_bytes(data)
+
+    @traced
+    async def awrite_blower_pid(self, value: BlowerPID) -> None:
+        await self.client.write_gatt_char(BLOWER_PID_UUID, value.to_bytes(), idempotent=True)
+
+    @traced
+    async def aread_manual_control(self) -> ManualControl:
+        data = await self.client.read_gatt_char(MANUAL_CONTROL_UUID)
+        return ManualControl.from_bytes(data)
+
+    @traced
+    async def awrite_manual_control(self, value: ManualControl) -> None:
+        await self.client.write_gatt_char(MANUAL_CONTROL_UUID, value.to_bytes())
+
+    @traced
+    async def aread_rgb_led(self) -> List[tuple[int,int,int]]:
         # RGB is part of the SystemState structure; read and extract it there.
-        ss = self.read_system_state()
+        ss = await self.aread_system_state()
         return [c.to_tuple() for c in ss.rgb]
 
-    def write_rgb_led(self, colors: Iterable[Iterable[int]]) -> None:
+    @traced
+    async def awrite_rgb_led(self, colors: Iterable[Iterable[int]]) -> None:
         # Build a SystemState initialized with sentinel "no change" values and
         # only set the rgb field to request the LED update. Do not read the
         # current state first — firmware uses sentinel values to apply partial
@@ -65,24 +161,63 @@ class ZellenradschleuseClient(ParameterStreamClient, NVSClient, BaseMetexonDevic
             r, g, b = list(c)
             rgb_list.append((r & 0xFF, g & 0xFF, b & 0xFF))
         ss = partial_system_state(rgb=rgb_list)
-        self.write_system_state(ss)
+        await self.awrite_system_state(ss)
 
-    def wifi_status(self) -> Dict[str, Any]:
-        data = self._run(self.client.read_gatt_char(WIFI_UUID))
+    @traced
+    async def awifi_status(self) -> Dict[str, Any]:
+        data = await self.client.read_gatt_char(WIFI_UUID)
         try:
             return json.loads(data.decode())
         except json.JSONDecodeError:
             return {"raw": data.decode(errors='replace')}
 
-    def set_wifi(self, ssid: Optional[str] = None, password: Optional[str] = None) -> None:
+    @traced
+    async def aset_wifi(self, ssid: Optional[str] = None, password: Optional[str] = None) -> None:
         obj: Dict[str, Any] = {}
         if ssid is not None:
             obj['ssid'] = ssid
         if password is not None:
             obj['password'] = password
-        self._run(self.client.write_gatt_char(WIFI_UUID, json.dumps(obj).encode()))
+        await self.client.write_gatt_char(WIFI_UUID, json.dumps(obj).encode())
+
+    @traced
+    async def astart_ota(self, url: str) -> None:
+        await self.client.write_gatt_char(OTA_UUID, url.encode())
+
+    @traced
+    async def asnapshot(self, *, system_state: bool = True, blower_pid: bool = True,
+                        manual_control: bool = True, wifi: bool = False) -> ZellenradschleuseSnapshot:
+        snap = ZellenradschleuseSnapshot(started_ns=time.monotonic_ns())
+
+        async def read(name: str, aw: Awaitable[Any]) -> None:
+            value = await aw
+            snap.timestamps_ns[name] = time.monotonic_ns()
+            setattr(snap, name, value)
+
+        reads = []
+        if system_state:
+            reads.append(read("system_state", self.aread_system_state()))
+        if blower_pid:
+            reads.append(read("blower_pid", self.aread_blower_pid()))
+        if manual_control:
+            reads.append(read("manual_control", self.aread_manual_control()))
+        if wifi:
+            reads.append(read("wifi", self.awifi_status()))
+        await asyncio.gather(*reads)
+        return snap
+
+
+class AsyncZellenradschleuseClient(ZellenradschleuseClient):
+    """:class:`ZellenradschleuseClient` for asyncio applications.
+
+    Runs entirely on the caller's event loop (no loop thread is started);
+    use ``async with`` or ``await aconnect()`` and the ``a``-prefixed
+    coroutines. Many devices can share one loop this way.
+    """
+
+    def __init__(self, address: str, timeout: float = 10.0, **kwargs: Any) -> None:
+        kwargs.setdefault("auto_loop", False)
+        super().__init__(address, timeout=timeout, **kwargs)
 
-    def start_ota(self, url: str) -> None:
-        self._run(self.client.write_gatt_char(OTA_UUID, url.encode()))
 
-__all__ = ["ZellenradschleuseClient"]
+__all__ = ["ZellenradschleuseClient", "AsyncZellenradschleuseClient"]
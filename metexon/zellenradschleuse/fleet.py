@@ -0,0 +1,311 @@
+"""Concurrent access to many Zellenradschleuse devices.
+
+:class:`ZellenradschleuseFleet` connects to a set of addresses concurrently
+on one event loop and fans typed operations out to all connected devices in
+parallel, so a scan cycle takes about as long as the slowest device instead
+of the sum of all devices. Every operation returns a ``{address:
+FleetResult}`` dict; a failing or offline device only affects its own
+result::
+
+    with ZellenradschleuseFleet(addresses, max_concurrent_connects=4) as fleet:
+        for address, result in fleet.read_system_state().items():
+            if result.ok:
+                print(address, result.value.pressure1)
+            else:
+                print(address, "failed:", result.error)
+
+The number of simultaneous connection attempts is capped because most BLE
+adapters/stacks only handle a few pending connections at a time. The cap
+applies per adapter: fleets on the same event loop (e.g. all sync fleets,
+which share a loop thread) and the same ``adapter`` count each other's
+attempts, and each fleet waits while its own ``max_concurrent_connects``
+attempts are in flight on the adapter.
+
+:meth:`ZellenradschleuseFleet.discover_and_connect` pipelines discovery and
+connection setup: each device is connected as soon as its advertisement is
+seen, while the scan continues::
+
+    with ZellenradschleuseFleet(min_rssi=-80) as fleet:  # any device in range
+        fleet.discover_and_connect(scan_timeout=15.0, expected=30)
+        print(fleet.read_system_state())
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+from ..discovery import MetexonScan
+from ..loop_thread import AsyncLoopThread, acquire_shared_loop_thread, release_shared_loop_thread
+from .client import ZellenradschleuseClient
+from .structures import BlowerPID, SystemState
+
+__all__ = ["FleetResult", "ZellenradschleuseFleet"]
+
+T = TypeVar("T")
+
+class _AdapterSlots:
+    """Connection attempts in flight on one adapter, shared by all fleets.
+
+    Each fleet passes its own limit: an attempt starts only while fewer
+    than that many attempts (of any fleet) are in flight on the adapter.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def claim(self, limit: int) -> AsyncIterator[None]:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self.in_flight -= 1
+                self._changed.notify_all()
+
+
+# event loop -> adapter -> connection slots
+_ADAPTER_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], _AdapterSlots]]" = (
+    weakref.WeakKeyDictionary())
+
+
+def _adapter_slots(adapter: Optional[str]) -> _AdapterSlots:
+    """Connection slots of *adapter* on the running loop."""
+    per_loop = _ADAPTER_SLOTS.setdefault(asyncio.get_running_loop(), {})
+    slots = per_loop.get(adapter)
+    if slots is None:
+        slots = per_loop[adapter] = _AdapterSlots()
+    return slots
+
+
+@dataclass
+class FleetResult(Generic[T]):
+    """Outcome of one operation on one device."""
+    address: str
+    value: Optional[T] = None
+    error: Optional[BaseException] = None
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ZellenradschleuseFleet:
+    """Connect to and operate on many devices concurrently.
+
+    Parameters
+    ----------
+    addresses:
+        Device addresses. May be empty when devices are added by
+        :meth:`discover_and_connect`.
+    max_concurrent_connects:
+        Maximum number of connection attempts in flight at the same time
+        on the adapter, counting those of other fleets on the same adapter.
+    timeout:
+        Connection timeout per device (passed to the clients).
+    op_timeout:
+        Default per-device timeout for fanned-out operations (None: no limit).
+    client_factory:
+        Passed to each :class:`ZellenradschleuseClient` (e.g. a simulator).
+    adapter:
+        Bluetooth adapter used for scanning and connecting (None: default).
+    min_rssi:
+        RSSI floor for :meth:`discover_and_connect`: devices are only
+        connected once they advertise at least this strongly (dBm).
+
+    The fleet runs on a shared loop thread. The individual clients (``fleet[address]``)
+    use the same loop, so their sync methods can be called as well.
+    """
+
+    def __init__(self, addresses: Iterable[str] = (), *, max_concurrent_connects: int = 4,
+                 timeout: float = 10.0, op_timeout: Optional[float] = None,
+                 client_factory: Optional[Callable[..., Any]] = None,
+                 adapter: Optional[str] = None, min_rssi: Optional[int] = None) -> None:
+        if max_concurrent_connects < 1:
+            raise ValueError("max_concurrent_connects must be at least 1")
+        self.max_concurrent_connects = max_concurrent_connects
+        self.op_timeout = op_timeout
+        self.adapter = adapter
+        self.min_rssi = min_rssi
+        self._timeout = timeout
+        self._client_factory = client_factory
+        self._loop_thread: Optional[AsyncLoopThread] = None
+        self.clients: Dict[str, ZellenradschleuseClient] = {}
+        for address in addresses:
+            self._add(address)
+
+    # ---- mapping-like access ----
+    def __getitem__(self, address: str) -> ZellenradschleuseClient:
+        return self.clients[address]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.clients)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def _add(self, address: str) -> ZellenradschleuseClient:
+        client = self.clients.get(address)
+        if client is None:
+            client = self.clients[address] = ZellenradschleuseClient(
+                address, timeout=self._timeout, auto_loop=False, client_factory=self._client_factory,
+                adapter=self.adapter)
+            client._loop_thread = self._loop_thread
+        return client
+
+    @property
+    def connected(self) -> Dict[str, ZellenradschleuseClient]:
+        return {a: c for a, c in self.clients.items() if c._client is not None}
+
+    # ---- sync API ----
+    def _acquire_loop_thread(self) -> AsyncLoopThread:
+        if self._loop_thread is None:
+            self._loop_thread = acquire_shared_loop_thread()
+            for c in self.clients.values():
+                c._loop_thread = self._loop_thread
+        return self._loop_thread
+
+    def connect(self) -> Dict[str, FleetResult[None]]:
+        """Connect to all devices not connected yet; return per-device results."""
+        return self._acquire_loop_thread().run(self.aconnect())
+
+    def discover_and_connect(self, *, scan_timeout: float = 10.0, expected: Optional[int] = None,
+                             filter_by: str = "name",
+                             scanner_factory: Optional[Callable[..., Any]] = None) -> Dict[str, FleetResult[None]]:
+        """Scan and connect to each device as soon as it is seen.
+
+        With addresses given to the fleet, only those devices are connected
+        and the scan ends once all of them were seen; otherwise every
+        matching device is added. The scan also ends after *expected*
+        devices or *scan_timeout* seconds. Returns the connection result of
+        every device seen; devices never seen are not included.
+        """
+        return self._acquire_loop_thread().run(self.adiscover_and_connect(
+            scan_timeout=scan_timeout, expected=expected, filter_by=filter_by, scanner_factory=scanner_factory))
+
+    def disconnect(self) -> None:
+        if self._loop_thread is None:
+            return
+        try:
+            self._loop_thread.run(self.adisconnect())
+        finally:
+            for c in self.clients.values():
+                c._loop_thread = None
+            release_shared_loop_thread(self._loop_thread)
+            self._loop_thread = None
+
+    def run(self, operation: Callable[[ZellenradschleuseClient], Awaitable[T]], *,
+            op_timeout: Optional[float] = None) -> Dict[str, FleetResult[T]]:
+        """Run ``operation(client)`` on all connected devices in parallel."""
+        if self._loop_thread is None:
+            raise RuntimeError("Fleet not connected")
+        return self._loop_thread.run(self.arun(operation, op_timeout=op_timeout))
+
+    def read_system_state(self, *, op_timeout: Optional[float] = None) -> Dict[str, FleetResult[SystemState]]:
+        return self.run(lambda c: c.aread_system_state(), op_timeout=op_timeout)
+
+    def read_blower_pid(self, *, op_timeout: Optional[float] = None) -> Dict[str, FleetResult[BlowerPID]]:
+        return self.run(lambda c: c.aread_blower_pid(), op_timeout=op_timeout)
+
+    def nvs_read_all(self, *, op_timeout: Optional[float] = None) -> Dict[str, FleetResult[Dict[str, Any]]]:
+        return self.run(lambda c: c.anvs_read_all(), op_timeout=op_timeout)
+
+    # ---- async API ----
+    async def aconnect(self) -> Dict[str, FleetResult[None]]:
+        results = await asyncio.gather(*(self._timed(a, self._aconnect_one(c), None)
+                                         for a, c in self.clients.items()))
+        return {r.address: r for r in results}
+
+    async def adiscover_and_connect(self, *, scan_timeout: float = 10.0, expected: Optional[int] = None,
+                                    filter_by: str = "name",
+                                    scanner_factory: Optional[Callable[..., Any]] = None,
+                                    ) -> Dict[str, FleetResult[None]]:
+        """Coroutine version of :meth:`discover_and_connect`."""
+        wanted = set(self.clients) or None
+        pending: List["asyncio.Task[FleetResult[None]]"] = []
+        started = set()
+        scanner_kwargs = {"adapter": self.adapter} if self.adapter is not None else None
+        scan = MetexonScan(scan_timeout, filter_by, scanner_factory=scanner_factory, min_rssi=self.min_rssi,
+                           scanner_kwargs=scanner_kwargs)
+        try:
+            async with scan:
+                async for found in scan:
+                    address = found["address"]
+                    if wanted is not None and address not in wanted:
+                        continue
+                    started.add(address)
+                    client = self._add(address)
+                    pending.append(asyncio.ensure_future(self._timed(address, self._aconnect_one(client), None)))
+                    if (wanted is not None and started >= wanted) or (expected is not None and len(started) >= expected):
+                        break
+            results = await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        return {r.address: r for r in results}
+
+    async def _aconnect_one(self, client: ZellenradschleuseClient) -> None:
+        async with _adapter_slots(self.adapter).claim(self.max_concurrent_connects):
+            await client.aconnect()
+
+    async def adisconnect(self) -> None:
+        await asyncio.gather(*(c.adisconnect() for c in self.clients.values()), return_exceptions=True)
+
+    async def arun(self, operation: Callable[[ZellenradschleuseClient], Awaitable[T]], *,
+                   op_timeout: Optional[float] = None) -> Dict[str, FleetResult[T]]:
+        """Coroutine version of :meth:`run`; devices that are not connected get an error result."""
+        timeout = self.op_timeout if op_timeout is None else op_timeout
+        results = await asyncio.gather(*(
+            self._timed(a, operation(c), timeout) if c._client is not None else self._not_connected(a)
+            for a, c in self.clients.items()
+        ))
+        return {r.address: r for r in results}
+
+    async def aread_system_state(self) -> Dict[str, FleetResult[SystemState]]:
+        return await self.arun(lambda c: c.aread_system_state())
+
+    async def aread_blower_pid(self) -> Dict[str, FleetResult[BlowerPID]]:
+        return await self.arun(lambda c: c.aread_blower_pid())
+
+    async def anvs_read_all(self) -> Dict[str, FleetResult[Dict[str, Any]]]:
+        return await self.arun(lambda c: c.anvs_read_all())
+
+    # ---- internal ----
+    @staticmethod
+    async def _timed(address: str, aw: Awaitable[T], timeout: Optional[float]) -> FleetResult[T]:
+        t0 = time.perf_counter()
+        try:
+            value = await (asyncio.wait_for(aw, timeout) if timeout is not None else aw)
+        except Exception as exc:
+            return FleetResult(address, error=exc, elapsed_s=time.perf_counter() - t0)
+        return FleetResult(address, value=value, elapsed_s=time.perf_counter() - t0)
+
+    @staticmethod
+    async def _not_connected(address: str) -> FleetResult[Any]:
+        return FleetResult(address, error=RuntimeError("Not connected"))
+
+    # ---- context manager ----
+    def __enter__(self) -> "ZellenradschleuseFleet":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.disconnect()
+        return False
+
+    async def __aenter__(self) -> "ZellenradschleuseFleet":
+        await self.aconnect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        await self.adisconnect()
+        return False
@@ -31,6 +31,7 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List, Optional
 
+from ..tracing import span, traced
 from .constants import NVS_LIST_UUID, NVS_GET_UUID, NVS_SET_UUID
 
 
@@ -39,6 +40,7 @@ class NVSClient:
 
     Expects ``self._run`` and ``self.client`` (a Bleak ``BleakClient``) to
     be available, as provided by :class:`~metexon.base.BaseMetexonDevice`.
+    Each method has an ``a``-prefixed coroutine version for asyncio code.
     """
 
     # ------------------------------------------------------------------
@@ -65,23 +67,7 @@ class NVSClient:
             Each dict has keys: ``key``, ``type``, ``desc``, and (when
             *include_values* is True) ``value``.
         """
-        all_entries: List[Dict[str, Any]] = []
-        offset = 0
-        while True:
-            # Write the requested offset
-            cmd = json.dumps({"o": offset}).encode()
-            self._run(self.client.write_gatt_char(NVS_LIST_UUID, cmd, response=True))
-            # Read paginated response
-            raw = self._run(self.client.read_gatt_char(NVS_LIST_UUID))
-            page = json.loads(raw.decode())
-            for entry in page.get("entries", []):
-                if not include_values:
-                    entry.pop("value", None)
-                all_entries.append(entry)
-            if not page.get("more", False):
-                break
-            offset += len(page.get("entries", [1]))  # advance by page size
-        return all_entries
+        return self._run(self.anvs_list(include_values=include_values))
 
     def nvs_get(self, key: str) -> Dict[str, Any]:
         """Read a single NVS entry by key.
@@ -101,13 +87,7 @@ class NVSClient:
         KeyError
             If the device reports the key was not found.
         """
-        cmd = json.dumps({"key": key}).encode()
-        self._run(self.client.write_gatt_char(NVS_GET_UUID, cmd, response=True))
-        raw = self._run(self.client.read_gatt_char(NVS_GET_UUID))
-        result = json.loads(raw.decode())
-        if "error" in result:
-            raise KeyError(f"NVS key not found: {key!r} ({result['error']})")
-        return result
+        return self._run(self.anvs_get(key))
 
     def nvs_set(self, key: str, value: Any) -> None:
         """Write a single NVS value by key.
@@ -128,14 +108,7 @@ class NVSClient:
         RuntimeError
             If the device reports an error during the write.
         """
-        value_str = str(value)
-        cmd = json.dumps({"key": key, "value": value_str}).encode()
-        self._run(self.client.write_gatt_char(NVS_SET_UUID, cmd, response=True))
-        raw = self._run(self.client.read_gatt_char(NVS_SET_UUID))
-        result = json.loads(raw.decode())
-        if result.get("status") != "ok":
-            msg = result.get("msg", "unknown error")
-            raise RuntimeError(f"NVS set failed for key {key!r}: {msg}")
+        self._run(self.anvs_set(key, value))
 
     def nvs_read_all(self) -> Dict[str, Any]:
         """Return all NVS values as a plain ``{key: value}`` dict.
@@ -161,10 +134,72 @@ class NVSClient:
             Error messages for any keys that failed to write (empty on full
             success).
         """
+        return self._run(self.anvs_write_all(params))
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    @traced
+    async def anvs_list(self, *, include_values: bool = True) -> List[Dict[str, Any]]:
+        """Coroutine version of :meth:`nvs_list`."""
+        all_entries: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            with span("nvs_list.page", offset=offset) as page_span:
+                # Write the requested offset, then read the page it selected.
+                # The device keeps the offset per connection, so both run as
+                # one transaction (repeated as a whole after a reconnect).
+                cmd = json.dumps({"o": offset}).encode()
+                raw = await self.client.write_then_read(NVS_LIST_UUID, cmd, idempotent=True)
+                page = json.loads(raw.decode())
+                if page_span is not None:
+                    page_span.set("entries", len(page.get("entries", [])))
+            for entry in page.get("entries", []):
+                if not include_values:
+                    entry.pop("value", None)
+                all_entries.append(entry)
+            if not page.get("more", False):
+                break
+            offset += len(page.get("entries", [1]))  # advance by page size
+        return all_entries
+
+    @traced
+    async def anvs_read_all(self) -> Dict[str, Any]:
+        """Coroutine version of :meth:`nvs_read_all`."""
+        entries = await self.anvs_list(include_values=True)
+        return {e["key"]: _coerce(e) for e in entries}
+
+    @traced
+    async def anvs_get(self, key: str) -> Dict[str, Any]:
+        """Coroutine version of :meth:`nvs_get`."""
+        cmd = json.dumps({"key": key}).encode()
+        raw = await self.client.write_then_read(NVS_GET_UUID, cmd, idempotent=True)
+        result = json.loads(raw.decode())
+        if "error" in result:
+            raise KeyError(f"NVS key not found: {key!r} ({result['error']})")
+        return result
+
+    @traced
+    async def anvs_set(self, key: str, value: Any) -> None:
+        """Coroutine version of :meth:`nvs_set`."""
+        value_str = str(value)
+        cmd = json.dumps({"key": key, "value": value_str}).encode()
+        # Not idempotent: a link loss before the result is read raises
+        # ConnectionLostError (the value may or may not have been stored).
+        raw = await self.client.write_then_read(NVS_SET_UUID, cmd)
+        result = json.loads(raw.decode())
+        if result.get("status") != "ok":
+            msg = result.get("msg", "unknown error")
+            raise RuntimeError(f"NVS set failed for key {key!r}: {msg}")
+
+    @traced
+    async def anvs_write_all(self, params: Dict[str, Any]) -> List[str]:
+        """Coroutine version of :meth:`nvs_write_all`."""
         errors: List[str] = []
         for key, val in params.items():
             try:
-                self.nvs_set(key, val)
+                await self.anvs_set(key, val)
             except (RuntimeError, KeyError) as exc:
                 errors.append(str(exc))
         return errors
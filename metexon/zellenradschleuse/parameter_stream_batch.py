@@ -0,0 +1,135 @@
+"""Vectorized decoding of parameter stream frame batches using NumPy.
+
+:meth:`ParameterStreamFrame.from_bytes` decodes one frame at a time and
+allocates a dataclass per frame. For large batches (recordings, buffered
+notifications) use :func:`decode_parameter_stream_frames`, which decodes a
+concatenated buffer of N 28-byte frames into columnar arrays without
+creating any per-frame Python objects.
+
+Requires the optional ``numpy`` dependency (``pip install metexon[numpy]``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+from .parameter_stream_client import _FRAME_STRUCT
+
+__all__ = [
+    "FRAME_DTYPE",
+    "HOST_TIME_FRAME_DTYPE",
+    "ParameterStreamBatch",
+    "frames_as_records",
+    "decode_parameter_stream_frames",
+]
+
+# Firmware frame layout (<QHBB16s). The value payload is additionally exposed
+# through overlapping per-type fields at offset 12, so each value type can be
+# read as a typed view of the same buffer.
+FRAME_DTYPE = np.dtype({
+    "names": ["timestamp_us", "parameter_id", "value_type", "value_size", "payload",
+              "u8", "u16", "u32", "u64", "i32", "f32"],
+    "formats": ["<u8", "<u2", "u1", "u1", ("u1", 16),
+                "u1", "<u2", "<u4", "<u8", "<i4", "<f4"],
+    "offsets": [0, 8, 10, 11, 12, 12, 12, 12, 12, 12, 12],
+    "itemsize": _FRAME_STRUCT.size,
+})
+
+# Recording layout: frame followed by the estimated host monotonic_ns time
+# (-1 if unknown), see parameter_stream_recording.
+HOST_TIME_FRAME_DTYPE = np.dtype({
+    "names": list(FRAME_DTYPE.names) + ["host_time_ns"],
+    "formats": [FRAME_DTYPE.fields[n][0] for n in FRAME_DTYPE.names] + ["<i8"],
+    "offsets": [FRAME_DTYPE.fields[n][1] for n in FRAME_DTYPE.names] + [FRAME_DTYPE.itemsize],
+    "itemsize": FRAME_DTYPE.itemsize + 8,
+})
+
+# value_type -> (typed field, minimum value_size), mirroring _decode_value
+_INT_FIELDS = (
+    (1, "u8", 1),
+    (2, "u16", 2),
+    (3, "u32", 4),
+    (4, "u64", 8),
+    (5, "i32", 4),
+    (7, "u8", 1),
+)
+_FLOAT_FIELDS = (
+    (6, "f32", 4),
+)
+_BOOL_TYPE = 7
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+
+@dataclass
+class ParameterStreamBatch:
+    """Columnar view of N decoded frames.
+
+    ``timestamp_us``, ``parameter_id`` and ``value_type`` are views into the
+    source buffer. ``value`` holds every decodable value as float64 and
+    ``value_int`` holds integer and bool values as int64 (uint64 values above
+    ``2**63 - 1`` wrap). ``valid`` is False for frames whose type is unknown
+    or whose payload is too short; their ``value`` is NaN. ``host_time_ns``
+    is only set when decoding records that carry a host-time estimate.
+    """
+    records: np.ndarray
+    timestamp_us: np.ndarray
+    parameter_id: np.ndarray
+    value_type: np.ndarray
+    value: np.ndarray
+    value_int: np.ndarray
+    valid: np.ndarray
+    host_time_ns: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def frames_as_records(data: BufferLike) -> np.ndarray:
+    """Return a zero-copy structured array (``FRAME_DTYPE``) over *data*."""
+    size = FRAME_DTYPE.itemsize
+    if len(data) % size:
+        raise ValueError(f"Frame buffer length {len(data)} is not a multiple of {size}")
+    return np.frombuffer(data, dtype=FRAME_DTYPE)
+
+
+def decode_parameter_stream_frames(data: Union[BufferLike, np.ndarray]) -> ParameterStreamBatch:
+    """Decode a concatenated buffer (or ``FRAME_DTYPE`` / ``HOST_TIME_FRAME_DTYPE`` array) of frames."""
+    records = data if isinstance(data, np.ndarray) else frames_as_records(data)
+    value_type = records["value_type"]
+    value_size = records["value_size"]
+
+    value = np.full(len(records), np.nan, dtype=np.float64)
+    value_int = np.zeros(len(records), dtype=np.int64)
+    valid = np.zeros(len(records), dtype=bool)
+
+    for code, field, min_size in _INT_FIELDS:
+        mask = (value_type == code) & (value_size >= min_size)
+        if not mask.any():
+            continue
+        column = records[field][mask]
+        if code == _BOOL_TYPE:
+            column = column != 0
+        value_int[mask] = column.astype(np.int64)
+        value[mask] = column
+        valid |= mask
+
+    for code, field, min_size in _FLOAT_FIELDS:
+        mask = (value_type == code) & (value_size >= min_size)
+        if not mask.any():
+            continue
+        value[mask] = records[field][mask]
+        valid |= mask
+
+    return ParameterStreamBatch(
+        records=records,
+        timestamp_us=records["timestamp_us"],
+        parameter_id=records["parameter_id"],
+        value_type=value_type,
+        value=value,
+        value_int=value_int,
+        valid=valid,
+        host_time_ns=records["host_time_ns"] if "host_time_ns" in records.dtype.names else None,
+    )
@@ -1,17 +1,38 @@
-"""Parameter stream BLE access for Zellenradschleuse devices."""
+"""Parameter stream BLE access for Zellenradschleuse devices.
+
+Frames can be received in two ways:
+
+* **Notifications** (preferred): the firmware pushes every frame on the
+  ``PARAM_STREAM_DATA_UUID`` characteristic. See
+  :meth:`ParameterStreamClient.parameter_stream_subscribe`.
+* **Polling**: repeatedly read the data characteristic. This costs one GATT
+  round trip per frame and misses frames pushed between two reads, so it is
+  only used when the characteristic does not support notify.
+
+Native asyncio code can consume frames with ``async for`` via
+:meth:`ParameterStreamClient.aiter_parameter_stream_frames`, which buffers
+frames in a bounded :class:`~.parameter_stream_queue.ParameterStreamQueue`.
+"""
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
 import json
+import logging
+import queue
 import struct
 import time
 
+from ..clock_sync import ClockSync
+from ..tracing import span, traced
 from .constants import (
     PARAM_STREAM_LIST_UUID,
     PARAM_STREAM_CONTROL_UUID,
     PARAM_STREAM_DATA_UUID,
 )
+from .parameter_stream_queue import ParameterStreamQueue, ParameterStreamQueueStats, OVERFLOW_DROP_OLDEST
+from .parameter_stream_stats import ParameterStreamMonitor
 
 
 _FRAME_STRUCT = struct.Struct('<QHBB16s')
@@ -25,6 +46,10 @@ class ParameterStreamFrame:
     value_size: int
     value_bytes: bytes
     value: Any
+    name: Optional[str] = None
+    unit: Optional[str] = None
+    # Estimated host time.monotonic_ns() at timestamp_us (see metexon.clock_sync)
+    host_time_ns: Optional[int] = None
 
     @classmethod
     def from_bytes(cls, data: bytes) -> "ParameterStreamFrame":
@@ -42,47 +67,208 @@ class ParameterStreamFrame:
             value=value,
         )
 
+    def to_bytes(self) -> bytes:
+        return _FRAME_STRUCT.pack(self.timestamp_us, self.parameter_id, self.value_type,
+                                  self.value_size, self.value_bytes)
+
+
+def _frames_from_payload(data: bytes,
+                         decode: Callable[[bytes], ParameterStreamFrame] = ParameterStreamFrame.from_bytes,
+                         ) -> List[ParameterStreamFrame]:
+    """Decode one or more concatenated frames from a notification payload.
+
+    Trailing bytes that do not make up a whole frame are logged and dropped.
+    """
+    size = _FRAME_STRUCT.size
+    if len(data) <= size:
+        return [decode(data)]
+    whole = len(data) - len(data) % size
+    if whole < len(data):
+        logging.getLogger(__name__).warning(
+            "Dropping %d trailing bytes of a %d-byte parameter stream notification",
+            len(data) - whole, len(data))
+    return [decode(data[i:i + size]) for i in range(0, whole, size)]
+
+
+FrameCallback = Callable[[ParameterStreamFrame], None]
+AsyncFrameCallback = Callable[[ParameterStreamFrame], Awaitable[None]]
+
+
+# value_type -> precompiled unpacker for the value payload
+_VALUE_STRUCTS: Dict[int, struct.Struct] = {
+    1: struct.Struct('<B'),
+    2: struct.Struct('<H'),
+    3: struct.Struct('<I'),
+    4: struct.Struct('<Q'),
+    5: struct.Struct('<i'),
+    6: struct.Struct('<f'),
+    7: struct.Struct('<?'),
+}
+
+# parameter_stream_list() type names -> value_type
+_TYPE_NAMES: Dict[str, int] = {
+    "u8": 1, "uint8": 1,
+    "u16": 2, "uint16": 2,
+    "u32": 3, "uint32": 3,
+    "u64": 4, "uint64": 4,
+    "i32": 5, "int32": 5,
+    "f32": 6, "float": 6,
+    "bool": 7,
+}
+
 
 def _decode_value(value_type: int, payload: bytes) -> Any:
-    if value_type == 1 and len(payload) >= 1:
-        return struct.unpack('<B', payload[:1])[0]
-    if value_type == 2 and len(payload) >= 2:
-        return struct.unpack('<H', payload[:2])[0]
-    if value_type == 3 and len(payload) >= 4:
-        return struct.unpack('<I', payload[:4])[0]
-    if value_type == 4 and len(payload) >= 8:
-        return struct.unpack('<Q', payload[:8])[0]
-    if value_type == 5 and len(payload) >= 4:
-        return struct.unpack('<i', payload[:4])[0]
-    if value_type == 6 and len(payload) >= 4:
-        return struct.unpack('<f', payload[:4])[0]
-    if value_type == 7 and len(payload) >= 1:
-        return struct.unpack('<B', payload[:1])[0] != 0
-    return payload
+    unpacker = _VALUE_STRUCTS.get(value_type)
+    if unpacker is None or len(payload) < unpacker.size:
+        return payload
+    return unpacker.unpack_from(payload)[0]
+
+
+@dataclass
+class _ParameterInfo:
+    value_type: Optional[int]
+    unpacker: Optional[struct.Struct]
+    name: Optional[str]
+    unit: Optional[str]
+
+
+class ParameterStreamDecoder:
+    """Frame decoder specialised for the parameters announced by a device.
+
+    Built once per session from the ``parameter_stream_list()`` entries. Each
+    ``parameter_id`` maps to a precompiled ``struct.Struct`` unpacker for its
+    declared type plus its name and unit, which are attached to decoded
+    frames. Frames of unknown parameters, or whose ``value_type`` disagrees
+    with the declared type, are decoded generically.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()) -> None:
+        self._table: Dict[int, _ParameterInfo] = {}
+        for e in entries:
+            if e.get("id") is None:
+                continue
+            value_type = _TYPE_NAMES.get(str(e.get("type", "")).lower())
+            self._table[int(e["id"])] = _ParameterInfo(
+                value_type=value_type,
+                unpacker=_VALUE_STRUCTS.get(value_type) if value_type is not None else None,
+                name=e.get("name"),
+                unit=e.get("unit"),
+            )
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, parameter_id: object) -> bool:
+        return parameter_id in self._table
+
+    def name(self, parameter_id: int) -> Optional[str]:
+        info = self._table.get(parameter_id)
+        return None if info is None else info.name
+
+    def names(self) -> Dict[int, Optional[str]]:
+        return {pid: info.name for pid, info in self._table.items()}
+
+    def decode(self, data: bytes) -> ParameterStreamFrame:
+        if len(data) < _FRAME_STRUCT.size:
+            raise ValueError(f"ParameterStreamFrame expected {_FRAME_STRUCT.size} bytes, got {len(data)}")
+        timestamp_us, parameter_id, value_type, value_size, raw = _FRAME_STRUCT.unpack_from(data)
+        payload = raw[:value_size]
+        info = self._table.get(parameter_id)
+        if info is None:
+            return ParameterStreamFrame(timestamp_us, parameter_id, value_type, value_size, payload,
+                                        _decode_value(value_type, payload))
+        unpacker = info.unpacker
+        if unpacker is not None and value_type == info.value_type and value_size >= unpacker.size:
+            value = unpacker.unpack_from(raw)[0]
+        else:
+            value = _decode_value(value_type, payload)
+        return ParameterStreamFrame(timestamp_us, parameter_id, value_type, value_size, payload,
+                                    value, info.name, info.unit)
 
 
 class ParameterStreamClient:
-    """Mixin adding parameter stream list/control/frame operations over BLE."""
+    """Mixin adding parameter stream list/control/frame operations over BLE.
 
-    def parameter_stream_list(self: Any) -> List[Dict[str, Any]]:
+    Every operation is implemented as a coroutine (``a``-prefixed) that can be
+    awaited directly from asyncio code; the plain methods are synchronous
+    wrappers running it on the client's loop thread.
+
+    Fetching the parameter list builds a :class:`ParameterStreamDecoder`
+    that is used for all subsequently received frames, so they carry the
+    parameter ``name`` and ``unit``. Received frames also feed a
+    :class:`~metexon.clock_sync.ClockSync` and carry a ``host_time_ns``
+    estimate.
+
+    All received frames pass through a
+    :class:`~.parameter_stream_stats.ParameterStreamMonitor`, which drops
+    repeated frames read by polling and counts gaps against the configured
+    ``interval_ms`` (see :meth:`parameter_stream_stats`).
+    """
+
+    _stream_decoder: Optional[ParameterStreamDecoder] = None
+    _stream_clock: Optional[ClockSync] = None
+    _stream_monitor: Optional[ParameterStreamMonitor] = None
+    # Last stream configuration reported by the device, replayed after a reconnect
+    _stream_session: Optional[Dict[str, Any]] = None
+    # (mode, poll task or None, on_stop callback or None) while frames are delivered
+    _stream_subscription: Optional[Tuple[str, Optional["asyncio.Task[None]"], Optional[Callable[[], None]]]] = None
+
+    @property
+    def parameter_stream_decoder(self) -> Optional[ParameterStreamDecoder]:
+        """Decoder built by the last ``parameter_stream_list()`` call (or None)."""
+        return self._stream_decoder
+
+    @property
+    def parameter_stream_clock(self) -> ClockSync:
+        """Device-to-host clock estimate fed by received stream frames."""
+        if self._stream_clock is None:
+            self._stream_clock = ClockSync()
+        return self._stream_clock
+
+    @property
+    def parameter_stream_monitor(self) -> ParameterStreamMonitor:
+        """Duplicate/gap accounting for received frames (reset on stream start)."""
+        if self._stream_monitor is None:
+            self._stream_monitor = ParameterStreamMonitor()
+        return self._stream_monitor
+
+    def parameter_stream_stats(self) -> Dict[str, Any]:
+        """Return counters of received frames, duplicates, gaps and sample rates."""
+        return self.parameter_stream_monitor.summary()
+
+    def _decode_stream_frame(self, data: bytes) -> ParameterStreamFrame:
+        host_ns = time.monotonic_ns()
+        decoder = self._stream_decoder
+        frame = ParameterStreamFrame.from_bytes(data) if decoder is None else decoder.decode(data)
+        frame.host_time_ns = self.parameter_stream_clock.update(frame.timestamp_us, host_ns)
+        return frame
+
+    # ---- async API ----
+    @traced
+    async def aparameter_stream_list(self: Any) -> List[Dict[str, Any]]:
         all_entries: List[Dict[str, Any]] = []
         offset = 0
         while True:
-            cmd = json.dumps({"o": offset}).encode()
-            self._run(self.client.write_gatt_char(PARAM_STREAM_LIST_UUID, cmd, response=True))
-            raw = self._run(self.client.read_gatt_char(PARAM_STREAM_LIST_UUID))
-            page = json.loads(raw.decode())
-            entries = page.get("entries", [])
+            with span("parameter_stream_list.page", offset=offset) as page_span:
+                cmd = json.dumps({"o": offset}).encode()
+                # The selected offset is per connection: write and read as one transaction
+                raw = await self.client.write_then_read(PARAM_STREAM_LIST_UUID, cmd, idempotent=True)
+                page = json.loads(raw.decode())
+                entries = page.get("entries", [])
+                if page_span is not None:
+                    page_span.set("entries", len(entries))
             all_entries.extend(entries)
             if not page.get("more", False):
                 break
             offset += len(entries)
+        self._stream_decoder = ParameterStreamDecoder(all_entries)
         return all_entries
 
-    def parameter_stream_control(self: Any, *, running: Optional[bool] = None,
-                                 interval_ms: Optional[int] = None,
-                                 ids: Optional[List[int]] = None,
-                                 cmd: Optional[str] = None) -> Dict[str, Any]:
+    @traced
+    async def aparameter_stream_control(self: Any, *, running: Optional[bool] = None,
+                                        interval_ms: Optional[int] = None,
+                                        ids: Optional[List[int]] = None,
+                                        cmd: Optional[str] = None) -> Dict[str, Any]:
         payload: Dict[str, Any] = {}
         if running is not None:
             payload["running"] = bool(running)
@@ -94,9 +280,102 @@ class ParameterStreamClient:
             payload["cmd"] = cmd
 
         if payload:
-            self._run(self.client.write_gatt_char(PARAM_STREAM_CONTROL_UUID, json.dumps(payload).encode(), response=True))
-        raw = self._run(self.client.read_gatt_char(PARAM_STREAM_CONTROL_UUID))
-        return json.loads(raw.decode())
+            await self.client.write_gatt_char(PARAM_STREAM_CONTROL_UUID, json.dumps(payload).encode(), response=True)
+        raw = await self.client.read_gatt_char(PARAM_STREAM_CONTROL_UUID)
+        status = json.loads(raw.decode())
+        monitor = self.parameter_stream_monitor
+        if cmd == "start":
+            monitor.reset()
+        if status.get("interval_ms") is not None:
+            monitor.interval_ms = int(status["interval_ms"])
+        elif interval_ms is not None:
+            monitor.interval_ms = int(interval_ms)
+        self._stream_session = {
+            "running": bool(status.get("running", running)),
+            "interval_ms": status.get("interval_ms", interval_ms),
+            "ids": status.get("ids", ids),
+        }
+        return status
+
+    @traced
+    async def aparameter_stream_start(self: Any, *, interval_ms: int = 120,
+                                      ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        return await self.aparameter_stream_control(running=True, interval_ms=interval_ms, ids=ids, cmd="start")
+
+    @traced
+    async def aparameter_stream_stop(self: Any) -> Dict[str, Any]:
+        return await self.aparameter_stream_control(running=False, cmd="stop")
+
+    async def _arestore_session(self: Any, client: Any) -> None:
+        await super()._arestore_session(client)  # type: ignore[misc]
+        session = self._stream_session
+        if not session or not session["running"]:
+            return
+        payload: Dict[str, Any] = {"running": True}
+        if session["interval_ms"] is not None:
+            payload["interval_ms"] = int(session["interval_ms"])
+        if session["ids"]:
+            payload["ids"] = [int(v) for v in session["ids"]]
+        await client.write_gatt_char(PARAM_STREAM_CONTROL_UUID, json.dumps(payload).encode(), response=True)
+
+    async def _adisconnect(self: Any) -> None:
+        # A subscription does not survive the connection: stop the poll task
+        # (or notifications) so a later connect() can subscribe again.
+        try:
+            await self._astop_stream_delivery()
+        except Exception as exc:
+            logging.getLogger(__name__).debug("Stopping parameter stream delivery failed: %s", exc)
+        await super()._adisconnect()  # type: ignore[misc]
+
+    @traced
+    async def aparameter_stream_subscribe(self: Any, callback: FrameCallback, *,
+                                          poll_interval_s: float = 0.05) -> str:
+        """Coroutine version of :meth:`parameter_stream_subscribe`."""
+        return await self._astart_stream_delivery(callback, poll_interval_s)
+
+    @traced
+    async def aparameter_stream_unsubscribe(self: Any) -> None:
+        await self._astop_stream_delivery()
+
+    @traced
+    async def aread_parameter_stream_frame(self: Any) -> Optional[ParameterStreamFrame]:
+        raw = await self.client.read_gatt_char(PARAM_STREAM_DATA_UUID)
+        if not raw:
+            return None
+        return self._decode_stream_frame(bytes(raw))
+
+    def aiter_parameter_stream_frames(self: Any, *, maxsize: int = 256,
+                                      overflow: str = OVERFLOW_DROP_OLDEST,
+                                      duration_s: Optional[float] = None,
+                                      poll_interval_s: float = 0.05) -> "ParameterStreamSubscription":
+        """Return an async iterator over stream frames.
+
+        Frames are buffered in a bounded queue of *maxsize* frames; *overflow*
+        selects what happens when a slow consumer lets it fill up
+        (``"drop_oldest"``, ``"drop_newest"`` or ``"block"``, see
+        :mod:`~metexon.zellenradschleuse.parameter_stream_queue`). Iteration
+        ends after *duration_s* seconds (never if None).
+
+        Use as ``async with`` block to guarantee the subscription is stopped
+        when leaving the loop early::
+
+            async with client.aiter_parameter_stream_frames(maxsize=64) as frames:
+                async for frame in frames:
+                    ...
+            print(frames.stats.dropped)
+        """
+        return ParameterStreamSubscription(self, maxsize=maxsize, overflow=overflow,
+                                           duration_s=duration_s, poll_interval_s=poll_interval_s)
+
+    # ---- sync API ----
+    def parameter_stream_list(self: Any) -> List[Dict[str, Any]]:
+        return self._run(self.aparameter_stream_list())
+
+    def parameter_stream_control(self: Any, *, running: Optional[bool] = None,
+                                 interval_ms: Optional[int] = None,
+                                 ids: Optional[List[int]] = None,
+                                 cmd: Optional[str] = None) -> Dict[str, Any]:
+        return self._run(self.aparameter_stream_control(running=running, interval_ms=interval_ms, ids=ids, cmd=cmd))
 
     def parameter_stream_start(self: Any, *, interval_ms: int = 120, ids: Optional[List[int]] = None) -> Dict[str, Any]:
         return self.parameter_stream_control(running=True, interval_ms=interval_ms, ids=ids, cmd="start")
@@ -105,22 +384,241 @@ class ParameterStreamClient:
         return self.parameter_stream_control(running=False, cmd="stop")
 
     def read_parameter_stream_frame(self: Any) -> Optional[ParameterStreamFrame]:
-        raw = self._run(self.client.read_gatt_char(PARAM_STREAM_DATA_UUID))
-        if not raw:
-            return None
-        return ParameterStreamFrame.from_bytes(bytes(raw))
+        return self._run(self.aread_parameter_stream_frame())
+
+    def parameter_stream_supports_notify(self: Any) -> bool:
+        """Return True if the data characteristic supports notify/indicate."""
+        char = self.client.services.get_characteristic(PARAM_STREAM_DATA_UUID)
+        if char is None:
+            return False
+        props = set(char.properties)
+        return "notify" in props or "indicate" in props
+
+    def parameter_stream_subscribe(self: Any, callback: FrameCallback, *,
+                                   poll_interval_s: float = 0.05) -> str:
+        """Deliver every received frame to *callback*.
+
+        Subscribes to notifications on the data characteristic. If the
+        characteristic does not support notify, a background task on the loop
+        thread polls it every *poll_interval_s* seconds instead.
+
+        The callback runs on the loop thread and must not block. The
+        subscription ends when the client disconnects; if polling fails, the
+        error is logged and the subscription ends as well.
+
+        Returns
+        -------
+        str
+            ``"notify"`` or ``"poll"``, the mode that is actually used.
+        """
+        return self._run(self._astart_stream_delivery(callback, poll_interval_s))
+
+    def parameter_stream_unsubscribe(self: Any) -> None:
+        """Stop delivering frames to the callback set by :meth:`parameter_stream_subscribe`."""
+        if self._stream_subscription is None:
+            return
+        self._run(self._astop_stream_delivery())
 
     def iter_parameter_stream_frames(self: Any, *, duration_s: Optional[float] = None,
-                                     poll_interval_s: float = 0.05) -> Iterator[ParameterStreamFrame]:
+                                     poll_interval_s: float = 0.05,
+                                     mode: str = "auto") -> Iterator[ParameterStreamFrame]:
+        """Yield stream frames until *duration_s* elapses (forever if None).
+
+        *mode* selects how frames are received:
+
+        - ``"auto"`` (default): notifications if supported, polling otherwise.
+        - ``"notify"``: notifications only; raises if not supported.
+        - ``"poll"``: read the data characteristic every *poll_interval_s*.
+        """
+        if mode not in ("auto", "notify", "poll"):
+            raise ValueError(f"Unknown mode: {mode!r}; expected 'auto', 'notify' or 'poll'")
+        if mode != "poll" and self.parameter_stream_supports_notify():
+            yield from self._iter_notified_frames(duration_s)
+            return
+        if mode == "notify":
+            raise RuntimeError("Parameter stream data characteristic does not support notify")
+
         deadline = None if duration_s is None else (time.monotonic() + duration_s)
         while True:
             if deadline is not None and time.monotonic() >= deadline:
                 break
             frame = self.read_parameter_stream_frame()
-            if frame is not None:
+            if frame is not None and self.parameter_stream_monitor.accept(frame):
                 yield frame
             if poll_interval_s > 0:
                 time.sleep(poll_interval_s)
 
+    # ---- internal ----
+    def _iter_notified_frames(self: Any, duration_s: Optional[float]) -> Iterator[ParameterStreamFrame]:
+        frames: "queue.SimpleQueue[ParameterStreamFrame]" = queue.SimpleQueue()
+        deadline = None if duration_s is None else (time.monotonic() + duration_s)
+        self.parameter_stream_subscribe(frames.put)
+        try:
+            while True:
+                # Wake up periodically so KeyboardInterrupt is handled promptly.
+                wait_s = 0.5
+                if deadline is not None:
+                    wait_s = min(wait_s, deadline - time.monotonic())
+                    if wait_s <= 0:
+                        break
+                try:
+                    yield frames.get(timeout=wait_s)
+                except queue.Empty:
+                    continue
+        finally:
+            self.parameter_stream_unsubscribe()
+
+    async def _astart_stream_delivery(self: Any, callback: FrameCallback, poll_interval_s: float,
+                                      poll_callback: Optional[AsyncFrameCallback] = None,
+                                      on_stop: Optional[Callable[[], None]] = None) -> str:
+        """Start delivering frames to *callback* (on the running loop).
+
+        When polling, *poll_callback* is awaited instead of *callback* if
+        given, so the poll loop can be slowed down by backpressure.
+        *on_stop* is called when delivery ends for any reason (unsubscribe,
+        disconnect or a failed poll).
+        """
+        if self._stream_subscription is not None:
+            raise RuntimeError("Parameter stream already subscribed")
+        if self.parameter_stream_supports_notify():
+            def _on_notify(_char: Any, data: bytearray) -> None:
+                try:
+                    frames = _frames_from_payload(bytes(data), self._decode_stream_frame)
+                except ValueError:
+                    logging.getLogger(__name__).warning(
+                        "Ignoring malformed parameter stream notification (%d bytes)", len(data))
+                    return
+                monitor = self.parameter_stream_monitor
+                for frame in frames:
+                    if monitor.accept(frame):
+                        _invoke(callback, frame)
+
+            await self.client.start_notify(PARAM_STREAM_DATA_UUID, _on_notify)
+            self._stream_subscription = ("notify", None, on_stop)
+            return "notify"
+
+        task = asyncio.ensure_future(self._apoll_parameter_stream(callback, poll_callback, poll_interval_s))
+        self._stream_subscription = ("poll", task, on_stop)
+        return "poll"
+
+    async def _astop_stream_delivery(self: Any) -> None:
+        sub = self._stream_subscription
+        if sub is None:
+            return
+        self._stream_subscription = None
+        mode, task, on_stop = sub
+        try:
+            if task is not None:
+                task.cancel()
+            elif self._client is not None:
+                await self.client.stop_notify(PARAM_STREAM_DATA_UUID)
+        finally:
+            if on_stop is not None:
+                on_stop()
+
+    async def _apoll_parameter_stream(self: Any, callback: FrameCallback,
+                                      poll_callback: Optional[AsyncFrameCallback],
+                                      poll_interval_s: float) -> None:
+        try:
+            while True:
+                frame = await self.aread_parameter_stream_frame()
+                if frame is not None and self.parameter_stream_monitor.accept(frame):
+                    if poll_callback is not None:
+                        await poll_callback(frame)
+                    else:
+                        _invoke(callback, frame)
+                await asyncio.sleep(poll_interval_s)
+        except Exception:
+            logging.getLogger(__name__).exception("Parameter stream polling failed; subscription ended")
+            sub = self._stream_subscription
+            if sub is not None and sub[1] is asyncio.current_task():
+                self._stream_subscription = None
+                if sub[2] is not None:
+                    sub[2]()
+
+
+class ParameterStreamSubscription:
+    """Async iterator returned by :meth:`ParameterStreamClient.aiter_parameter_stream_frames`.
+
+    Delivery starts on the first ``__anext__`` (or ``__aenter__``) and stops
+    when the duration elapses, the iterator is closed, the ``async with``
+    block is left, or the client disconnects.
+    """
+
+    def __init__(self, device: Any, *, maxsize: int, overflow: str,
+                 duration_s: Optional[float], poll_interval_s: float) -> None:
+        self._device = device
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._duration_s = duration_s
+        self._poll_interval_s = poll_interval_s
+        self._queue: Optional[ParameterStreamQueue] = None
+        self._deadline_handle: Optional[asyncio.TimerHandle] = None
+        self._stopped = False
+        self.mode: Optional[str] = None
+
+    @property
+    def stats(self) -> ParameterStreamQueueStats:
+        if self._queue is None:
+            return ParameterStreamQueueStats()
+        return self._queue.stats
+
+    async def start(self) -> None:
+        if self._queue is not None:
+            return
+        q = ParameterStreamQueue(self._maxsize, self._overflow)
+        self._queue = q
+        self.mode = await self._device._astart_stream_delivery(q.put_nowait, self._poll_interval_s, q.put,
+                                                               on_stop=q.close)
+        if self._duration_s is not None:
+            self._deadline_handle = asyncio.get_running_loop().call_later(self._duration_s, q.close)
+
+    async def aclose(self) -> None:
+        if self._stopped:
+            return
+        self._stopped = True
+        if self._deadline_handle is not None:
+            self._deadline_handle.cancel()
+        if self._queue is not None:
+            self._queue.close()
+            sub = self._device._stream_subscription
+            # Delivery may already have ended (disconnect) and been reused since.
+            if sub is not None and sub[2] == self._queue.close:
+                await self._device._astop_stream_delivery()
+
+    def __aiter__(self) -> "ParameterStreamSubscription":
+        return self
+
+    async def __anext__(self) -> ParameterStreamFrame:
+        if self._stopped:
+            raise StopAsyncIteration
+        await self.start()
+        assert self._queue is not None
+        frame = await self._queue.get()
+        if frame is None:
+            await self.aclose()
+            raise StopAsyncIteration
+        return frame
+
+    async def __aenter__(self) -> "ParameterStreamSubscription":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        await self.aclose()
+        return False
+
+
+def _invoke(callback: FrameCallback, frame: ParameterStreamFrame) -> None:
+    try:
+        callback(frame)
+    except Exception:
+        logging.getLogger(__name__).exception("Parameter stream callback failed")
+
 
-__all__ = ["ParameterStreamClient", "ParameterStreamFrame"]
+__all__ = [
+    "ParameterStreamClient",
+    "ParameterStreamDecoder",
+    "ParameterStreamFrame",
+    "ParameterStreamSubscription",
+]
@@ -0,0 +1,135 @@
+"""Bounded asyncio queue for parameter stream frames with overflow policies.
+
+Used by :meth:`ParameterStreamClient.aiter_parameter_stream_frames` so a slow
+``async for`` consumer cannot stall the BLE event loop or grow memory without
+bound. What happens when the queue is full is selected by the overflow
+policy:
+
+- ``"drop_oldest"`` (default): discard the oldest queued frame.
+- ``"drop_newest"``: discard the incoming frame.
+- ``"block"``: the producer waits for free space. When polling, this simply
+  slows down the poll loop. Notifications cannot be paused, so notified frames
+  that arrive while the queue is full are parked in arrival order (counted in
+  :attr:`ParameterStreamQueueStats.max_parked`) until the consumer catches up.
+  At most *maxsize* frames are parked; further frames are dropped like with
+  ``"drop_newest"``, so memory stays bounded at twice the queue size.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, Optional
+
+if TYPE_CHECKING:
+    from .parameter_stream_client import ParameterStreamFrame
+
+__all__ = [
+    "OVERFLOW_BLOCK",
+    "OVERFLOW_DROP_OLDEST",
+    "OVERFLOW_DROP_NEWEST",
+    "ParameterStreamQueueStats",
+    "ParameterStreamQueue",
+]
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+
+@dataclass
+class ParameterStreamQueueStats:
+    received: int = 0
+    delivered: int = 0
+    dropped_oldest: int = 0
+    dropped_newest: int = 0
+    max_depth: int = 0
+    max_parked: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_oldest + self.dropped_newest
+
+
+class ParameterStreamQueue:
+    """Bounded FIFO of frames. Must be created and used on one event loop."""
+
+    def __init__(self, maxsize: int = 256, overflow: str = OVERFLOW_DROP_OLDEST) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if overflow not in _POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}; expected one of {_POLICIES}")
+        self.maxsize = int(maxsize)
+        self.overflow = overflow
+        self.stats = ParameterStreamQueueStats()
+        self._items: Deque[ParameterStreamFrame] = deque()
+        self._parked: Deque[ParameterStreamFrame] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put_nowait(self, frame: ParameterStreamFrame) -> None:
+        """Add a frame without waiting, applying the overflow policy."""
+        if self._closed:
+            return
+        stats = self.stats
+        stats.received += 1
+        items = self._items
+        if len(items) >= self.maxsize:
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                stats.dropped_newest += 1
+                return
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                items.popleft()
+                stats.dropped_oldest += 1
+            else:
+                if len(self._parked) >= self.maxsize:
+                    stats.dropped_newest += 1
+                    return
+                self._parked.append(frame)
+                if len(self._parked) > stats.max_parked:
+                    stats.max_parked = len(self._parked)
+                return
+        items.append(frame)
+        if len(items) > stats.max_depth:
+            stats.max_depth = len(items)
+        if len(items) >= self.maxsize:
+            self._not_full.clear()
+        self._not_empty.set()
+
+    async def put(self, frame: ParameterStreamFrame) -> None:
+        """Add a frame; with the ``"block"`` policy wait until there is space."""
+        if self.overflow == OVERFLOW_BLOCK:
+            while len(self._items) >= self.maxsize and not self._closed:
+                await self._not_full.wait()
+        self.put_nowait(frame)
+
+    async def get(self) -> Optional[ParameterStreamFrame]:
+        """Return the next frame, or None once the queue is closed and drained."""
+        while not self._items:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        frame = self._items.popleft()
+        if self._parked:
+            self._items.append(self._parked.popleft())
+        if len(self._items) < self.maxsize:
+            self._not_full.set()
+        self.stats.delivered += 1
+        return frame
+
+    def close(self) -> None:
+        """Stop accepting frames and wake up all waiters."""
+        self._closed = True
+        self._not_empty.set()
+        self._not_full.set()
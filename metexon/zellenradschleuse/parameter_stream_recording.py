@@ -0,0 +1,222 @@
+"""Append-only recording and memory-mapped replay of parameter stream sessions.
+
+File layout (all integers little-endian)::
+
+    magic        8s   b"MXPSREC\\0"
+    version      u16  format version (1)
+    record_size  u16  bytes per frame record (28, or 36 with host time)
+    header_len   u32  length of the JSON header in bytes
+    header       JSON {"parameters": [{"id", "name", "type", "desc"}, ...], ...}
+    padding      zero bytes up to the next multiple of 8
+    records      raw firmware frames (<QHBB16s), appended one after another,
+                 each optionally followed by an int64 host time estimate
+
+The host time is the frame's ``host_time_ns`` (estimated host
+``time.monotonic_ns()``, see :mod:`metexon.clock_sync`) or -1 if unknown.
+The header field ``monotonic_to_unix_ns`` converts it to wall-clock time.
+
+Frames are written exactly as received, so a recording can be extended at any
+time and a truncated last record (e.g. after a crash) is simply ignored when
+reading. :class:`ParameterStreamRecording` memory-maps the records as a NumPy
+record array, so hours of data can be analysed without loading the file into
+RAM (requires ``pip install metexon[numpy]``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .parameter_stream_client import ParameterStreamDecoder, ParameterStreamFrame, _FRAME_STRUCT
+
+__all__ = ["ParameterStreamRecorder", "ParameterStreamRecording", "RECORDING_MAGIC"]
+
+RECORDING_MAGIC = b"MXPSREC\x00"
+RECORDING_VERSION = 1
+_PREAMBLE = struct.Struct("<8sHHI")
+_HOST_TIME = struct.Struct("<q")
+_RECORD_SIZES = (_FRAME_STRUCT.size, _FRAME_STRUCT.size + _HOST_TIME.size)
+_ALIGN = 8
+_PARAMETER_KEYS = ("id", "name", "type", "desc")
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def _read_header(f) -> Tuple[Dict[str, Any], int, int]:
+    """Return ``(header, record_size, data_offset)`` from an open recording."""
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) != _PREAMBLE.size:
+        raise ValueError("Not a parameter stream recording (file too short)")
+    magic, version, record_size, header_len = _PREAMBLE.unpack(preamble)
+    if magic != RECORDING_MAGIC:
+        raise ValueError("Not a parameter stream recording (bad magic)")
+    if version != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version {version}")
+    header = json.loads(f.read(header_len).decode())
+    return header, record_size, _data_offset(header_len)
+
+
+def _data_offset(header_len: int) -> int:
+    end = _PREAMBLE.size + header_len
+    return (end + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class ParameterStreamRecorder:
+    """Write parameter stream frames to an append-only recording file.
+
+    Parameters
+    ----------
+    path:
+        Target file.
+    parameters:
+        The ``parameter_stream_list()`` entries of the device. Only ``id``,
+        ``name``, ``type`` and ``desc`` are stored.
+    metadata:
+        Additional JSON-serializable information stored in the header (e.g.
+        device address).
+    append:
+        Append to an existing recording instead of overwriting it. The
+        existing header (and record layout) is kept.
+    host_time:
+        Store each frame's ``host_time_ns`` estimate after the raw frame.
+
+    ``write`` accepts a :class:`ParameterStreamFrame` and can be passed
+    directly as callback to ``parameter_stream_subscribe``.
+    """
+
+    def __init__(self, path: PathLike, parameters: Optional[List[Dict[str, Any]]] = None, *,
+                 metadata: Optional[Dict[str, Any]] = None, append: bool = False,
+                 host_time: bool = True) -> None:
+        self.path = os.fspath(path)
+        self.frames_written = 0
+        if append and os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as f:
+                self.header, record_size, offset = _read_header(f)
+            if record_size not in _RECORD_SIZES:
+                raise ValueError(f"Cannot append to recording with record size {record_size}")
+            self.host_time = record_size != _FRAME_STRUCT.size
+            self._file = open(self.path, "r+b")
+            # Drop a partially written trailing record so appended frames stay aligned.
+            size = os.path.getsize(self.path)
+            self._file.truncate(offset + (size - offset) // record_size * record_size)
+            self._file.seek(0, os.SEEK_END)
+            return
+
+        self.host_time = host_time
+        record_size = _RECORD_SIZES[1] if host_time else _RECORD_SIZES[0]
+        self.header = {
+            "parameters": [{k: e.get(k) for k in _PARAMETER_KEYS} for e in (parameters or [])],
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "monotonic_to_unix_ns": time.time_ns() - time.monotonic_ns(),
+            "metadata": dict(metadata or {}),
+        }
+        header_bytes = json.dumps(self.header).encode()
+        self._file = open(self.path, "wb")
+        self._file.write(_PREAMBLE.pack(RECORDING_MAGIC, RECORDING_VERSION, record_size, len(header_bytes)))
+        self._file.write(header_bytes)
+        self._file.write(b"\x00" * (_data_offset(len(header_bytes)) - _PREAMBLE.size - len(header_bytes)))
+
+    def write(self, frame: ParameterStreamFrame) -> None:
+        if self.host_time:
+            host_time_ns = -1 if frame.host_time_ns is None else frame.host_time_ns
+            self._file.write(frame.to_bytes() + _HOST_TIME.pack(host_time_ns))
+        else:
+            self._file.write(frame.to_bytes())
+        self.frames_written += 1
+
+    def write_raw(self, data: bytes, host_time_ns: Optional[int] = None) -> None:
+        """Append one or more raw 28-byte frames as received from the device.
+
+        With host time enabled, all frames get *host_time_ns* (-1 if None).
+        """
+        size = _FRAME_STRUCT.size
+        if len(data) % size:
+            raise ValueError(f"Raw frame data length {len(data)} is not a multiple of {size}")
+        count = len(data) // size
+        if self.host_time:
+            suffix = _HOST_TIME.pack(-1 if host_time_ns is None else host_time_ns)
+            data = b"".join(data[i:i + size] + suffix for i in range(0, len(data), size))
+        self._file.write(data)
+        self.frames_written += count
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "ParameterStreamRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+class ParameterStreamRecording:
+    """Read-only, memory-mapped view of a recording file.
+
+    ``records`` is a NumPy record array (dtype
+    :data:`~metexon.zellenradschleuse.parameter_stream_batch.FRAME_DTYPE`, or
+    ``HOST_TIME_FRAME_DTYPE`` if host times were recorded) backed by the
+    file; pages are only loaded when accessed.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        import numpy as np
+        from .parameter_stream_batch import FRAME_DTYPE, HOST_TIME_FRAME_DTYPE
+
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self.header, record_size, self._offset = _read_header(f)
+        dtypes = {FRAME_DTYPE.itemsize: FRAME_DTYPE, HOST_TIME_FRAME_DTYPE.itemsize: HOST_TIME_FRAME_DTYPE}
+        dtype = dtypes.get(record_size)
+        if dtype is None:
+            raise ValueError(f"Unsupported record size {record_size}")
+        self.has_host_time = dtype is HOST_TIME_FRAME_DTYPE
+        count = max(0, os.path.getsize(self.path) - self._offset) // record_size
+        if count:
+            mm = np.memmap(self.path, dtype=dtype, mode="r", offset=self._offset, shape=(count,))
+        else:
+            mm = np.zeros(0, dtype=dtype)
+        self.records = mm.view(np.recarray)
+
+    @property
+    def parameters(self) -> List[Dict[str, Any]]:
+        return self.header.get("parameters", [])
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.header.get("metadata", {})
+
+    def parameter_names(self) -> Dict[int, str]:
+        return {int(p["id"]): p["name"] for p in self.parameters if p.get("id") is not None}
+
+    def decoder(self) -> ParameterStreamDecoder:
+        """Return a decoder for the parameters stored in the header."""
+        return ParameterStreamDecoder(self.parameters)
+
+    def decode(self, start: Optional[int] = None, stop: Optional[int] = None):
+        """Decode records ``[start:stop]`` into a ``ParameterStreamBatch``."""
+        from .parameter_stream_batch import decode_parameter_stream_frames
+        return decode_parameter_stream_frames(self.records[start:stop])
+
+    @property
+    def monotonic_to_unix_ns(self) -> Optional[int]:
+        """Offset to add to recorded host times to get Unix time in ns."""
+        return self.header.get("monotonic_to_unix_ns")
+
+    def frame(self, index: int, decoder: Optional[ParameterStreamDecoder] = None) -> ParameterStreamFrame:
+        """Decode a single record into a :class:`ParameterStreamFrame`."""
+        raw = self.records[index:index + 1].tobytes()
+        frame = ParameterStreamFrame.from_bytes(raw) if decoder is None else decoder.decode(raw)
+        if self.has_host_time:
+            host_time_ns = _HOST_TIME.unpack_from(raw, _FRAME_STRUCT.size)[0]
+            frame.host_time_ns = None if host_time_ns < 0 else host_time_ns
+        return frame
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,132 @@
+"""Duplicate suppression and loss accounting for parameter stream frames.
+
+When the data characteristic is polled faster than the firmware updates it,
+the same frame is read repeatedly; when it is polled slower, frames are lost.
+:class:`ParameterStreamMonitor` drops repeated frames (same or older
+``timestamp_us`` for a ``parameter_id``) and detects gaps larger than the
+configured stream ``interval_ms``. It keeps O(1) state per parameter, so
+memory is bounded by the number of streamed parameters.
+
+Each selected parameter is expected once per ``interval_ms``; a gap of
+``k * interval_ms`` therefore counts as ``k - 1`` missed samples.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from .parameter_stream_client import ParameterStreamFrame
+
+__all__ = ["ParameterStats", "ParameterStreamMonitor"]
+
+
+@dataclass
+class ParameterStats:
+    frames: int = 0
+    duplicates: int = 0
+    gaps: int = 0
+    missed: int = 0
+    first_timestamp_us: Optional[int] = None
+    last_timestamp_us: Optional[int] = None
+    # Frames since first_timestamp_us (restarts with the device clock)
+    rate_frames: int = 0
+
+    @property
+    def rate_hz(self) -> Optional[float]:
+        """Effective sample rate according to device timestamps (since the last reboot)."""
+        if self.rate_frames < 2 or self.first_timestamp_us is None or self.last_timestamp_us is None:
+            return None
+        span_us = self.last_timestamp_us - self.first_timestamp_us
+        if span_us <= 0:
+            return None
+        return (self.rate_frames - 1) * 1e6 / span_us
+
+    @property
+    def loss_ratio(self) -> float:
+        expected = self.frames + self.missed
+        return self.missed / expected if expected else 0.0
+
+
+class ParameterStreamMonitor:
+    """Track duplicates, gaps and sample rate per ``parameter_id``.
+
+    Parameters
+    ----------
+    interval_ms:
+        Configured stream interval. Gap detection is disabled while None.
+    gap_tolerance:
+        A delta larger than ``gap_tolerance * interval_ms`` counts as a gap.
+    reset_threshold_us:
+        A timestamp going backwards by more than this (device reboot) starts
+        the parameter's sequence over instead of counting duplicates.
+    """
+
+    def __init__(self, interval_ms: Optional[int] = None, gap_tolerance: float = 1.5,
+                 reset_threshold_us: int = 1_000_000) -> None:
+        self.interval_ms = interval_ms
+        self.gap_tolerance = gap_tolerance
+        self.reset_threshold_us = reset_threshold_us
+        self.reset()
+
+    def reset(self) -> None:
+        self._params: Dict[int, ParameterStats] = {}
+        self.frames = 0
+        self.duplicates = 0
+        self._started_ns = time.monotonic_ns()
+
+    def accept(self, frame: ParameterStreamFrame) -> bool:
+        """Account for *frame*; return False if it is a duplicate."""
+        st = self._params.get(frame.parameter_id)
+        if st is None:
+            st = self._params[frame.parameter_id] = ParameterStats(first_timestamp_us=frame.timestamp_us)
+        ts = frame.timestamp_us
+        last = st.last_timestamp_us
+        if last is not None and last - ts > self.reset_threshold_us:
+            last = None
+            st.first_timestamp_us = ts
+            st.rate_frames = 0
+        if last is not None:
+            if ts <= last:
+                st.duplicates += 1
+                self.duplicates += 1
+                return False
+            if self.interval_ms:
+                expected_us = self.interval_ms * 1000
+                delta = ts - last
+                if delta > expected_us * self.gap_tolerance:
+                    st.gaps += 1
+                    st.missed += max(1, round(delta / expected_us) - 1)
+        st.last_timestamp_us = ts
+        st.frames += 1
+        st.rate_frames += 1
+        self.frames += 1
+        return True
+
+    def parameter(self, parameter_id: int) -> Optional[ParameterStats]:
+        return self._params.get(parameter_id)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return totals plus per-parameter counters as plain dicts."""
+        elapsed_s = (time.monotonic_ns() - self._started_ns) / 1e9
+        per_param = {
+            pid: {
+                "frames": st.frames,
+                "duplicates": st.duplicates,
+                "gaps": st.gaps,
+                "missed": st.missed,
+                "rate_hz": st.rate_hz,
+                "loss_ratio": st.loss_ratio,
+            }
+            for pid, st in self._params.items()
+        }
+        return {
+            "frames": self.frames,
+            "duplicates": self.duplicates,
+            "gaps": sum(st.gaps for st in self._params.values()),
+            "missed": sum(st.missed for st in self._params.values()),
+            "rate_hz": self.frames / elapsed_s if elapsed_s > 0 else None,
+            "interval_ms": self.interval_ms,
+            "parameters": per_param,
+        }
@@ -0,0 +1,757 @@
+"""In-process simulated Zellenradschleuse GATT device.
+
+:class:`SimulatedZellenradschleuse` implements the characteristics of a real
+device (system state, blower PID, manual control, WiFi JSON, the NVS
+list/get/set JSON protocol and the parameter stream list/control/data) and
+hands out :class:`SimulatedBleakClient` objects that can be used in place of
+``bleak.BleakClient``. This allows regression tests and benchmarks of the
+clients without hardware::
+
+    from metexon.zellenradschleuse import ZellenradschleuseClient
+    from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+    sim = SimulatedZellenradschleuse(latency_s=0.01, jitter_s=0.005)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        print(zr.read_system_state())
+
+Timing and faults are configurable: every GATT operation sleeps
+``latency_s`` plus a uniform random ``jitter_s`` per ATT packet (values
+longer than ``mtu - 3`` bytes need several packets), notifications are
+limited to ``mtu - 3`` bytes, and operations fail with ``BleakError`` with
+probability ``failure_rate`` or when queued with :meth:`fail_next`.
+
+:class:`SimulatedScanner` stands in for ``bleak.BleakScanner``: it delivers
+the advertisements of :class:`SimulatedAdvertiser` devices to a detection
+callback, for tests of :mod:`metexon.discovery`.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import math
+import random
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from uuid import UUID
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+from bleak.exc import BleakError
+
+from .constants import (
+    METEXON_SERVICE_UUID,
+    DEVICE_TYPE_UUID,
+    SYSTEM_STATE_UUID,
+    BLOWER_PID_UUID,
+    WIFI_UUID,
+    OTA_UUID,
+    MANUAL_CONTROL_UUID,
+    NVS_SERVICE_UUID,
+    NVS_LIST_UUID,
+    NVS_GET_UUID,
+    NVS_SET_UUID,
+    PARAM_STREAM_SERVICE_UUID,
+    PARAM_STREAM_LIST_UUID,
+    PARAM_STREAM_CONTROL_UUID,
+    PARAM_STREAM_DATA_UUID,
+)
+from .advertisement import ADVERTISEMENT_COMPANY_ID, encode_advertisement_payload
+from .parameter_stream_client import _FRAME_STRUCT, _TYPE_NAMES, _VALUE_STRUCTS
+from .structures import SystemState, ManualControl, BlowerPID, RGB
+from . import sentinels as S
+
+# bleak < 1.0 requires the RSSI as fourth BLEDevice argument; newer versions
+# only report it in AdvertisementData.
+_BLE_DEVICE_TAKES_RSSI = "rssi" in inspect.signature(BLEDevice.__init__).parameters
+
+__all__ = [
+    "SimulatedZellenradschleuse",
+    "SimulatedBleakClient",
+    "SimulatedAdvertiser",
+    "SimulatedScanner",
+    "DEFAULT_NVS_ENTRIES",
+    "DEFAULT_STREAM_PARAMETERS",
+]
+
+DEFAULT_NVS_ENTRIES: List[Dict[str, Any]] = [
+    {"key": "blower_kp", "type": "float", "desc": "Blower PID Kp", "value": "1.5"},
+    {"key": "blower_ki", "type": "float", "desc": "Blower PID Ki", "value": "0.2"},
+    {"key": "blower_kd", "type": "float", "desc": "Blower PID Kd", "value": "0.01"},
+    {"key": "feeder_rpm", "type": "uint16", "desc": "Feeder target RPM", "value": "1200"},
+    {"key": "pulse_count", "type": "uint32", "desc": "Blower pulse count", "value": "0"},
+    {"key": "device_name", "type": "string", "desc": "Device name", "value": "METEXON-SIM"},
+]
+
+DEFAULT_STREAM_PARAMETERS: List[Dict[str, Any]] = [
+    {"id": 101, "name": "state", "type": "u8", "desc": "System state"},
+    {"id": 102, "name": "pressure1", "type": "f32", "desc": "Pressure 1 [Pa]"},
+    {"id": 103, "name": "pressure2", "type": "f32", "desc": "Pressure 2 [Pa]"},
+    {"id": 104, "name": "motor_current", "type": "f32", "desc": "Motor current [A]"},
+    {"id": 106, "name": "blower_pwm", "type": "u16", "desc": "Blower PWM"},
+    {"id": 107, "name": "blower_rpm", "type": "f32", "desc": "Blower pulse rate [RPM]"},
+    {"id": 108, "name": "encoder", "type": "i32", "desc": "Encoder count"},
+    {"id": 109, "name": "pulses", "type": "u32", "desc": "Blower pulse count"},
+    {"id": 110, "name": "feeder_on", "type": "bool", "desc": "Feeder running"},
+]
+
+_READ = ["read"]
+_READ_WRITE = ["read", "write"]
+_NOTIFY_PROPS = ["read", "notify"]
+_GENERIC_ACCESS_UUID = UUID("00001800-0000-1000-8000-00805f9b34fb")
+_DEVICE_NAME_UUID = UUID("00002a00-0000-1000-8000-00805f9b34fb")
+_GENERIC_ATTRIBUTE_UUID = UUID("00001801-0000-1000-8000-00805f9b34fb")
+_SERVICE_CHANGED_UUID = UUID("00002a05-0000-1000-8000-00805f9b34fb")
+_DEVICE_INFORMATION_UUID = UUID("0000180a-0000-1000-8000-00805f9b34fb")
+_FIRMWARE_REVISION_UUID = UUID("00002a26-0000-1000-8000-00805f9b34fb")
+
+_CHARACTERISTICS = {
+    _GENERIC_ACCESS_UUID: {_DEVICE_NAME_UUID: _READ},
+    _GENERIC_ATTRIBUTE_UUID: {_SERVICE_CHANGED_UUID: ["indicate"]},
+    _DEVICE_INFORMATION_UUID: {_FIRMWARE_REVISION_UUID: _READ},
+    METEXON_SERVICE_UUID: {
+        DEVICE_TYPE_UUID: _READ,
+        SYSTEM_STATE_UUID: _READ_WRITE,
+        BLOWER_PID_UUID: _READ_WRITE,
+        WIFI_UUID: _READ_WRITE,
+        OTA_UUID: ["write"],
+        MANUAL_CONTROL_UUID: _READ_WRITE,
+    },
+    NVS_SERVICE_UUID: {
+        NVS_LIST_UUID: _READ_WRITE,
+        NVS_GET_UUID: _READ_WRITE,
+        NVS_SET_UUID: _READ_WRITE,
+    },
+    PARAM_STREAM_SERVICE_UUID: {
+        PARAM_STREAM_LIST_UUID: _READ_WRITE,
+        PARAM_STREAM_CONTROL_UUID: _READ_WRITE,
+        PARAM_STREAM_DATA_UUID: _NOTIFY_PROPS,
+    },
+}
+
+CharSpecifier = Union["SimulatedCharacteristic", UUID, str, int]
+NotifyCallback = Callable[[Any, bytearray], Any]
+
+
+def _key(spec: CharSpecifier) -> str:
+    if isinstance(spec, SimulatedCharacteristic):
+        return spec.uuid
+    return str(spec).lower()
+
+
+def _nan(v: float) -> bool:
+    return isinstance(v, float) and math.isnan(v)
+
+
+class SimulatedCharacteristic:
+    def __init__(self, uuid: UUID, handle: int, properties: List[str], service_uuid: UUID) -> None:
+        self.uuid = str(uuid).lower()
+        self.handle = handle
+        self.properties = list(properties)
+        self.service_uuid = str(service_uuid).lower()
+
+    def __repr__(self) -> str:
+        return f"SimulatedCharacteristic({self.uuid}, handle={self.handle})"
+
+
+class SimulatedService:
+    def __init__(self, uuid: UUID, characteristics: List[SimulatedCharacteristic]) -> None:
+        self.uuid = str(uuid).lower()
+        self.characteristics = characteristics
+
+    def get_characteristic(self, specifier: CharSpecifier) -> Optional[SimulatedCharacteristic]:
+        key = _key(specifier)
+        for c in self.characteristics:
+            if c.uuid == key:
+                return c
+        return None
+
+
+class SimulatedServiceCollection:
+    """Subset of ``BleakGATTServiceCollection`` used by the clients."""
+
+    def __init__(self, services: List[SimulatedService]) -> None:
+        self.services = {s.uuid: s for s in services}
+        self.characteristics = {c.handle: c for s in services for c in s.characteristics}
+
+    def __iter__(self) -> Iterator[SimulatedService]:
+        return iter(self.services.values())
+
+    def get_service(self, specifier: Union[UUID, str]) -> Optional[SimulatedService]:
+        return self.services.get(_key(specifier))
+
+    def get_characteristic(self, specifier: CharSpecifier) -> Optional[SimulatedCharacteristic]:
+        if isinstance(specifier, int):
+            return self.characteristics.get(specifier)
+        key = _key(specifier)
+        for c in self.characteristics.values():
+            if c.uuid == key:
+                return c
+        return None
+
+
+class SimulatedZellenradschleuse:
+    """Stateful fake device; call it like ``BleakClient`` to get a client.
+
+    Parameters
+    ----------
+    latency_s, jitter_s:
+        Simulated time per ATT packet: ``latency_s + uniform(0, jitter_s)``.
+    mtu:
+        ATT MTU. Values longer than ``mtu - 3`` bytes take several packets
+        and notifications are truncated to ``mtu - 3`` bytes.
+    failure_rate:
+        Probability that a GATT operation raises ``BleakError``.
+    connect_latency_s:
+        Simulated connection setup time.
+    discovery_latency_s:
+        Simulated service discovery time per discovered service. Clients
+        created with ``services=[...]`` only discover those services.
+    notify:
+        Whether the stream data characteristic supports notifications.
+    nvs_entries, stream_parameters:
+        Initial NVS entries and announced stream parameters.
+    page_size:
+        Entries per NVS / stream list page.
+    seed:
+        Seed for jitter and failure injection.
+    handle_base:
+        First attribute handle; a different value simulates a firmware with
+        a different GATT table.
+    """
+
+    def __init__(self, *, latency_s: float = 0.0, jitter_s: float = 0.0, mtu: int = 247,
+                 failure_rate: float = 0.0, connect_latency_s: float = 0.0,
+                 discovery_latency_s: float = 0.0, notify: bool = True,
+                 device_type: str = "Zellenradschleuse",
+                 nvs_entries: Optional[List[Dict[str, Any]]] = None,
+                 stream_parameters: Optional[List[Dict[str, Any]]] = None,
+                 page_size: int = 4, seed: Optional[int] = None, handle_base: int = 1) -> None:
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.mtu = mtu
+        self.failure_rate = failure_rate
+        self.connect_latency_s = connect_latency_s
+        self.discovery_latency_s = discovery_latency_s
+        self.discovered_services = 0
+        self.notify_supported = notify
+        self.device_type = device_type
+        self.page_size = page_size
+        self._rng = random.Random(seed)
+        self._fail_queue: List[Exception] = []
+        self._clients: List[SimulatedBleakClient] = []
+        self._t0 = time.monotonic()
+
+        self.system_state = SystemState(
+            state=1, pressure1=101.5, pressure2=99.25, absPressure=101325.0, motorCurrent=0.8,
+            getriebemotorPWM=0, vibrationsmotorPWM=0, blowerPWM=512, blowerPulseRateRPM=3000.0,
+            rgb=[RGB(0, 0, 0), RGB(0, 0, 0)], encoderCount=0, blowerPulseCount=0,
+        )
+        self.blower_pid = BlowerPID(
+            kp=1.5, ki=0.2, kd=0.01, target_frequency=50.0, current_frequency=49.5,
+            last_error=0.5, integral_sum=0.0, current_pwm=512, manual_pwm_value=0,
+            min_pwm_output=0, max_pwm_output=1023, update_interval_ms=50, flags=0,
+            last_update_tick=0, feed_forward=0.0, derivative_filter_hz=10.0,
+            reserved_floats=(0.0, 0.0, 0.0, 0.0),
+        )
+        self.manual_control = ManualControl(0.0, 0.0, 0.0, 0, 0.0)
+        self.wifi: Dict[str, Any] = {"ssid": "", "connected": False, "ip": ""}
+        self.ota_url: Optional[str] = None
+        self.nvs: Dict[str, Dict[str, Any]] = {
+            e["key"]: dict(e) for e in (nvs_entries if nvs_entries is not None else DEFAULT_NVS_ENTRIES)
+        }
+        self.stream_parameters = [dict(e) for e in (
+            stream_parameters if stream_parameters is not None else DEFAULT_STREAM_PARAMETERS)]
+        self.stream: Dict[str, Any] = {"running": False, "interval_ms": 120, "ids": []}
+        self.stream_values: Dict[int, Callable[[float], Any]] = {}
+
+        handle = handle_base
+        services = []
+        for svc_uuid, chars in _CHARACTERISTICS.items():
+            sim_chars = []
+            for char_uuid, props in chars.items():
+                if char_uuid == PARAM_STREAM_DATA_UUID and not notify:
+                    props = _READ
+                handle += 1
+                sim_chars.append(SimulatedCharacteristic(char_uuid, handle, props, svc_uuid))
+            services.append(SimulatedService(svc_uuid, sim_chars))
+            handle += 1
+        self.services = SimulatedServiceCollection(services)
+
+    # ---- BleakClient factory ----
+    def __call__(self, address: str = "SIM", *args: Any, **kwargs: Any) -> "SimulatedBleakClient":
+        client = SimulatedBleakClient(self, address, kwargs.get("disconnected_callback"),
+                                      kwargs.get("services"))
+        self._clients.append(client)
+        return client
+
+    # ---- fault injection ----
+    def fail_next(self, count: int = 1, exc: Optional[Exception] = None) -> None:
+        """Make the next *count* GATT operations raise *exc* (``BleakError`` by default)."""
+        for _ in range(count):
+            self._fail_queue.append(exc if exc is not None else BleakError("Simulated failure"))
+
+    def drop_connections(self, *, reboot: bool = False) -> None:
+        """Simulate a link loss of all connected clients.
+
+        With *reboot*, the device also stops its parameter stream and restarts
+        its clock, as after a power cycle. Can be called from any thread.
+        """
+        if reboot:
+            self.stream["running"] = False
+            self._t0 = time.monotonic()
+        for client in list(self._clients):
+            if not client.is_connected:
+                continue
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if client._loop is None or client._loop is running:
+                client._drop()
+            else:
+                client._loop.call_soon_threadsafe(client._drop)
+
+    # ---- device clock / stream values ----
+    def device_time_us(self) -> int:
+        return int((time.monotonic() - self._t0) * 1e6)
+
+    def stream_value(self, parameter_id: int, t_s: float) -> Any:
+        fn = self.stream_values.get(parameter_id)
+        if fn is not None:
+            return fn(t_s)
+        ss = self.system_state
+        defaults = {
+            101: ss.state, 102: ss.pressure1 + math.sin(t_s), 103: ss.pressure2 + math.cos(t_s),
+            104: ss.motorCurrent, 106: ss.blowerPWM, 107: ss.blowerPulseRateRPM,
+            108: ss.encoderCount, 109: ss.blowerPulseCount, 110: True,
+        }
+        return defaults.get(parameter_id, parameter_id + math.sin(t_s))
+
+    def encode_stream_frame(self, parameter_id: int, timestamp_us: int) -> bytes:
+        entry = next((e for e in self.stream_parameters if int(e["id"]) == parameter_id), None)
+        value_type = _TYPE_NAMES.get(str(entry.get("type", "")).lower(), 6) if entry else 6
+        packer = _VALUE_STRUCTS[value_type]
+        value = self.stream_value(parameter_id, timestamp_us / 1e6)
+        if value_type == 6:
+            value = float(value)
+        elif value_type == 7:
+            value = bool(value)
+        else:
+            value = int(value)
+        return _FRAME_STRUCT.pack(timestamp_us, parameter_id, value_type, packer.size, packer.pack(value))
+
+    # ---- internal GATT semantics ----
+    async def _delay(self, nbytes: int = 0) -> None:
+        packets = max(1, math.ceil(nbytes / max(1, self.mtu - 3)))
+        delay = 0.0
+        for _ in range(packets):
+            delay += self.latency_s + (self._rng.uniform(0.0, self.jitter_s) if self.jitter_s else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _maybe_fail(self) -> None:
+        if self._fail_queue:
+            raise self._fail_queue.pop(0)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise BleakError("Simulated failure")
+
+    def _read(self, client: "SimulatedBleakClient", key: str) -> bytes:
+        if key == str(_DEVICE_NAME_UUID):
+            return b"METEXON-SIM"
+        if key == str(_FIRMWARE_REVISION_UUID):
+            return b"sim-1"
+        if key == str(DEVICE_TYPE_UUID).lower():
+            return self.device_type.encode()
+        if key == str(SYSTEM_STATE_UUID).lower():
+            return self.system_state.to_bytes()
+        if key == str(BLOWER_PID_UUID).lower():
+            return self.blower_pid.to_bytes()
+        if key == str(MANUAL_CONTROL_UUID).lower():
+            return self.manual_control.to_bytes()
+        if key == str(WIFI_UUID).lower():
+            return json.dumps(self.wifi).encode()
+        if key == str(NVS_LIST_UUID).lower():
+            return json.dumps(self._page(list(self.nvs.values()), client.nvs_offset)).encode()
+        if key == str(NVS_GET_UUID).lower():
+            entry = self.nvs.get(client.nvs_key or "")
+            return json.dumps(entry if entry is not None else {"error": "not_found"}).encode()
+        if key == str(NVS_SET_UUID).lower():
+            return json.dumps(client.nvs_set_result or {"status": "error", "msg": "no request"}).encode()
+        if key == str(PARAM_STREAM_LIST_UUID).lower():
+            return json.dumps(self._page(self.stream_parameters, client.stream_list_offset)).encode()
+        if key == str(PARAM_STREAM_CONTROL_UUID).lower():
+            return json.dumps(self.stream).encode()
+        if key == str(PARAM_STREAM_DATA_UUID).lower():
+            return client.last_frame
+        raise BleakError(f"Characteristic {key} is not readable")
+
+    def _write(self, client: "SimulatedBleakClient", key: str, data: bytes) -> None:
+        if key == str(SYSTEM_STATE_UUID).lower():
+            self._apply_system_state(SystemState.from_bytes(data))
+        elif key == str(BLOWER_PID_UUID).lower():
+            self._apply_blower_pid(BlowerPID.from_bytes(data))
+        elif key == str(MANUAL_CONTROL_UUID).lower():
+            self._apply_manual_control(ManualControl.from_bytes(data))
+        elif key == str(WIFI_UUID).lower():
+            obj = json.loads(data.decode())
+            if "ssid" in obj:
+                self.wifi["ssid"] = obj["ssid"]
+            if "password" in obj:
+                self.wifi["password_set"] = bool(obj["password"])
+        elif key == str(OTA_UUID).lower():
+            self.ota_url = data.decode()
+        elif key == str(NVS_LIST_UUID).lower():
+            client.nvs_offset = int(json.loads(data.decode()).get("o", 0))
+        elif key == str(NVS_GET_UUID).lower():
+            client.nvs_key = json.loads(data.decode()).get("key")
+        elif key == str(NVS_SET_UUID).lower():
+            obj = json.loads(data.decode())
+            client.nvs_set_result = self._nvs_set(obj.get("key"), obj.get("value"))
+        elif key == str(PARAM_STREAM_LIST_UUID).lower():
+            client.stream_list_offset = int(json.loads(data.decode()).get("o", 0))
+        elif key == str(PARAM_STREAM_CONTROL_UUID).lower():
+            self._stream_control(json.loads(data.decode()))
+        else:
+            raise BleakError(f"Characteristic {key} is not writable")
+
+    def _page(self, entries: List[Dict[str, Any]], offset: int) -> Dict[str, Any]:
+        page = entries[offset:offset + self.page_size]
+        return {"entries": page, "total": len(entries), "offset": offset,
+                "more": offset + len(page) < len(entries)}
+
+    def _nvs_set(self, key: Optional[str], value: Optional[str]) -> Dict[str, Any]:
+        entry = self.nvs.get(key or "")
+        if entry is None:
+            return {"status": "error", "msg": "unknown key"}
+        try:
+            if entry["type"] == "float":
+                float(value)  # type: ignore[arg-type]
+            elif entry["type"].startswith("uint"):
+                if int(str(value), 0) < 0:
+                    raise ValueError(value)
+        except (TypeError, ValueError):
+            return {"status": "error", "msg": f"invalid value for {entry['type']}"}
+        entry["value"] = str(value)
+        return {"status": "ok"}
+
+    def _stream_control(self, obj: Dict[str, Any]) -> None:
+        if "interval_ms" in obj:
+            self.stream["interval_ms"] = int(obj["interval_ms"])
+        if "ids" in obj:
+            self.stream["ids"] = [int(i) for i in obj["ids"]]
+        running = obj.get("running")
+        if obj.get("cmd") == "start":
+            running = True
+        elif obj.get("cmd") == "stop":
+            running = False
+        if running is not None:
+            self.stream["running"] = bool(running)
+        if not self.stream["ids"]:
+            self.stream["ids"] = [int(e["id"]) for e in self.stream_parameters]
+        for client in self._clients:
+            client._update_stream_task()
+
+    def _apply_system_state(self, new: SystemState) -> None:
+        ss = self.system_state
+        for name in ("pressure1", "pressure2", "absPressure", "motorCurrent", "blowerPulseRateRPM"):
+            if not _nan(getattr(new, name)):
+                setattr(ss, name, getattr(new, name))
+        for name in ("getriebemotorPWM", "vibrationsmotorPWM", "blowerPWM"):
+            if getattr(new, name) != S.PWM_NO_CHANGE:
+                setattr(ss, name, getattr(new, name))
+        if new.encoderCount != S.ENCODER_NO_CHANGE:
+            ss.encoderCount = new.encoderCount
+        if new.blowerPulseCount != S.U32_NO_CHANGE:
+            ss.blowerPulseCount = new.blowerPulseCount
+        for cur, upd in zip(ss.rgb, new.rgb):
+            for comp in ("red", "green", "blue"):
+                if getattr(upd, comp) != S.RGB_NO_CHANGE_COMPONENT:
+                    setattr(cur, comp, getattr(upd, comp))
+
+    def _apply_blower_pid(self, new: BlowerPID) -> None:
+        pid = self.blower_pid
+        for name in ("kp", "ki", "kd", "target_frequency", "feed_forward", "derivative_filter_hz"):
+            if not _nan(getattr(new, name)):
+                setattr(pid, name, getattr(new, name))
+        for name in ("manual_pwm_value", "min_pwm_output", "max_pwm_output"):
+            if getattr(new, name) != S.PWM_NO_CHANGE:
+                setattr(pid, name, getattr(new, name))
+        if new.update_interval_ms:
+            pid.update_interval_ms = new.update_interval_ms
+        if new.flags:
+            pid.flags = new.flags
+
+    def _apply_manual_control(self, new: ManualControl) -> None:
+        mc = self.manual_control
+        for name in ("blower_rpm", "getriebemotor_pwm", "vibrationsmotor_pwm", "feeder_seconds"):
+            if not _nan(getattr(new, name)):
+                setattr(mc, name, getattr(new, name))
+        mc.enable_getriebemotor_nvs = new.enable_getriebemotor_nvs
+
+
+class SimulatedBleakClient:
+    """Connection to a :class:`SimulatedZellenradschleuse` (``BleakClient`` API subset)."""
+
+    def __init__(self, device: SimulatedZellenradschleuse, address: str,
+                 disconnected_callback: Optional[Callable[[Any], None]] = None,
+                 services: Optional[List[str]] = None) -> None:
+        self.device = device
+        self.address = address
+        self._service_filter = None if services is None else {str(u).lower() for u in services}
+        self._services = device.services
+        self._disconnected_callback = disconnected_callback
+        self._connected = False
+        self._notify: Dict[str, NotifyCallback] = {}
+        self._stream_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.last_frame = b""
+        self.nvs_offset = 0
+        self.nvs_key: Optional[str] = None
+        self.nvs_set_result: Optional[Dict[str, Any]] = None
+        self.stream_list_offset = 0
+        self.op_count = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def mtu_size(self) -> int:
+        return self.device.mtu
+
+    @property
+    def services(self) -> SimulatedServiceCollection:
+        return self._services
+
+    async def connect(self, **kwargs: Any) -> bool:
+        if self.device.connect_latency_s:
+            await asyncio.sleep(self.device.connect_latency_s)
+        self.device._maybe_fail()
+        services = list(self.device.services)
+        if self._service_filter is not None:
+            services = [svc for svc in services if svc.uuid in self._service_filter]
+        if self.device.discovery_latency_s:
+            await asyncio.sleep(self.device.discovery_latency_s * len(services))
+        self.device.discovered_services += len(services)
+        self._services = SimulatedServiceCollection(services)
+        self._loop = asyncio.get_running_loop()
+        self._connected = True
+        self._update_stream_task()
+        return True
+
+    async def disconnect(self) -> bool:
+        self._stop_stream_task()
+        self._notify.clear()
+        self._connected = False
+        return True
+
+    async def __aenter__(self) -> "SimulatedBleakClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.disconnect()
+
+    async def read_gatt_char(self, char_specifier: CharSpecifier, **kwargs: Any) -> bytearray:
+        self._check_connected()
+        key = self._resolve(char_specifier)
+        self.op_count += 1
+        data = self.device._read(self, key)
+        await self.device._delay(len(data))
+        self._check_connected()  # the link dropped while the request was in flight
+        self.device._maybe_fail()
+        return bytearray(data)
+
+    async def write_gatt_char(self, char_specifier: CharSpecifier, data: Union[bytes, bytearray, memoryview],
+                              response: Optional[bool] = None) -> None:
+        self._check_connected()
+        key = self._resolve(char_specifier)
+        self.op_count += 1
+        await self.device._delay(len(data))
+        self._check_connected()
+        self.device._maybe_fail()
+        self.device._write(self, key, bytes(data))
+
+    async def start_notify(self, char_specifier: CharSpecifier, callback: NotifyCallback, **kwargs: Any) -> None:
+        self._check_connected()
+        key = self._resolve(char_specifier)
+        char = self.services.get_characteristic(key)
+        if char is None or "notify" not in char.properties:
+            raise BleakError(f"Characteristic {key} does not support notify")
+        await self.device._delay()
+        self.device._maybe_fail()
+        self._notify[key] = callback
+        self._update_stream_task()
+
+    async def stop_notify(self, char_specifier: CharSpecifier) -> None:
+        self._check_connected()
+        self._notify.pop(self._resolve(char_specifier), None)
+        await self.device._delay()
+
+    # ---- internal ----
+    def _resolve(self, spec: CharSpecifier) -> str:
+        char = self.services.get_characteristic(spec if isinstance(spec, int) else _key(spec))
+        if char is None:
+            raise BleakError(f"Characteristic {spec} was not found!")
+        return char.uuid
+
+    def _check_connected(self) -> None:
+        if not self._connected:
+            raise BleakError("Not connected")
+
+    def _drop(self) -> None:
+        if not self._connected:
+            return
+        self._stop_stream_task()
+        self._notify.clear()
+        self._connected = False
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+
+    def _update_stream_task(self) -> None:
+        running = self._connected and self.device.stream["running"]
+        if running and self._stream_task is None:
+            try:
+                self._stream_task = asyncio.get_running_loop().create_task(self._run_stream())
+            except RuntimeError:
+                # Not on the client's loop (e.g. control written by another
+                # connection on a different loop); the stream starts on the
+                # next operation of this client.
+                pass
+        elif not running:
+            self._stop_stream_task()
+
+    def _stop_stream_task(self) -> None:
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            self._stream_task = None
+
+    async def _run_stream(self) -> None:
+        data_key = str(PARAM_STREAM_DATA_UUID).lower()
+        while True:
+            interval_s = self.device.stream["interval_ms"] / 1000.0
+            ts = self.device.device_time_us()
+            for pid in list(self.device.stream["ids"]):
+                frame = self.device.encode_stream_frame(pid, ts)
+                self.last_frame = frame
+                callback = self._notify.get(data_key)
+                if callback is not None:
+                    payload = bytearray(frame[:max(0, self.device.mtu - 3)])
+                    char = self.services.get_characteristic(data_key)
+                    result = callback(char, payload)
+                    if asyncio.iscoroutine(result):
+                        await result
+            await asyncio.sleep(interval_s)
+
+
+class SimulatedAdvertiser:
+    """One advertising device of a :class:`SimulatedScanner`.
+
+    Advertises every *interval_s* seconds, starting *delay_s* seconds after
+    a scan starts. ``name``, ``rssi`` and ``service_uuids`` may be changed
+    while scanning. With a *device*, the advertisements carry its current
+    system state as telemetry payload
+    (:mod:`~metexon.zellenradschleuse.advertisement`), as manufacturer data
+    or, with ``telemetry="service_data"``, as service data.
+    """
+
+    def __init__(self, address: str, *, name: Optional[str] = "METEXON-SIM", rssi: int = -60,
+                 interval_s: float = 0.1, delay_s: float = 0.0,
+                 service_uuids: Optional[List[str]] = None,
+                 device: Optional[SimulatedZellenradschleuse] = None,
+                 telemetry: str = "manufacturer_data") -> None:
+        self.address = address
+        self.name = name
+        self.rssi = rssi
+        self.interval_s = interval_s
+        self.delay_s = delay_s
+        self.service_uuids = (list(service_uuids) if service_uuids is not None
+                              else [str(METEXON_SERVICE_UUID)])
+        self.device = device
+        self.telemetry = telemetry
+        self.advertisements = 0
+
+    def advertisement(self) -> Any:
+        self.advertisements += 1
+        manufacturer_data: Dict[int, bytes] = {}
+        service_data: Dict[str, bytes] = {}
+        if self.device is not None:
+            payload = encode_advertisement_payload(self.device.system_state)
+            if self.telemetry == "service_data":
+                service_data[str(METEXON_SERVICE_UUID).lower()] = payload
+            else:
+                manufacturer_data[ADVERTISEMENT_COMPANY_ID] = payload
+        adv = AdvertisementData(
+            local_name=self.name, manufacturer_data=manufacturer_data, service_data=service_data,
+            service_uuids=list(self.service_uuids), tx_power=None, rssi=self.rssi, platform_data=(),
+        )
+        if _BLE_DEVICE_TAKES_RSSI:
+            return BLEDevice(self.address, self.name, None, self.rssi), adv
+        return BLEDevice(self.address, self.name, None), adv
+
+
+class SimulatedScanner:
+    """``BleakScanner`` factory delivering advertisements of simulated devices.
+
+    Pass as ``scanner_factory`` to the functions of :mod:`metexon.discovery`::
+
+        scanner = SimulatedScanner()
+        scanner.add("AA:00", delay_s=0.2)
+        await adiscover_metexon_one(scanner_factory=scanner)
+    """
+
+    def __init__(self, advertisers: Optional[List[SimulatedAdvertiser]] = None, *,
+                 start_error: Optional[Exception] = None) -> None:
+        self.advertisers = list(advertisers or [])
+        self.start_error = start_error
+        self.scans: List["SimulatedScan"] = []
+
+    def add(self, address: str, **kwargs: Any) -> SimulatedAdvertiser:
+        advertiser = SimulatedAdvertiser(address, **kwargs)
+        self.advertisers.append(advertiser)
+        return advertiser
+
+    @property
+    def active_scans(self) -> int:
+        return sum(1 for scan in self.scans if scan.running)
+
+    def __call__(self, detection_callback: Optional[Callable[[Any, Any], None]] = None,
+                 service_uuids: Optional[List[str]] = None, **kwargs: Any) -> "SimulatedScan":
+        scan = SimulatedScan(self, detection_callback, service_uuids)
+        self.scans.append(scan)
+        return scan
+
+
+class SimulatedScan:
+    """One scanner instance (``BleakScanner`` API subset: ``start`` / ``stop``)."""
+
+    def __init__(self, scanner: SimulatedScanner, detection_callback: Optional[Callable[[Any, Any], None]],
+                 service_uuids: Optional[List[str]]) -> None:
+        self.scanner = scanner
+        self._callback = detection_callback
+        self._filter = None if service_uuids is None else {str(u).lower() for u in service_uuids}
+        self._tasks: List[asyncio.Task] = []
+        self.running = False
+
+    async def start(self) -> None:
+        if self.scanner.start_error is not None:
+            raise self.scanner.start_error
+        self.running = True
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._advertise(a)) for a in self.scanner.advertisers]
+
+    async def stop(self) -> None:
+        self.running = False
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _advertise(self, advertiser: SimulatedAdvertiser) -> None:
+        await asyncio.sleep(advertiser.delay_s)
+        while self.running:
+            uuids = {u.lower() for u in advertiser.service_uuids}
+            if self._callback is not None and (self._filter is None or self._filter & uuids):
+                self._callback(*advertiser.advertisement())
+            await asyncio.sleep(advertiser.interval_s)
@@ -0,0 +1,47 @@
+"""Typed snapshot of several Zellenradschleuse characteristics.
+
+Returned by :meth:`ZellenradschleuseClient.snapshot`, which issues all reads
+concurrently in a single loop hop. Each value carries the host
+``time.monotonic_ns()`` at which its read completed, so the spread between
+the reads is known.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .structures import BlowerPID, ManualControl, SystemState
+
+__all__ = ["ZellenradschleuseSnapshot", "SNAPSHOT_FIELDS"]
+
+SNAPSHOT_FIELDS = ("system_state", "blower_pid", "manual_control", "wifi")
+
+
+@dataclass
+class ZellenradschleuseSnapshot:
+    system_state: Optional[SystemState] = None
+    blower_pid: Optional[BlowerPID] = None
+    manual_control: Optional[ManualControl] = None
+    wifi: Optional[Dict[str, Any]] = None
+    # Field name -> host time.monotonic_ns() when its read completed
+    timestamps_ns: Dict[str, int] = field(default_factory=dict)
+    # Host time.monotonic_ns() when the reads were issued
+    started_ns: int = 0
+
+    @property
+    def spread_ns(self) -> int:
+        """Time between the first and the last completed read."""
+        if not self.timestamps_ns:
+            return 0
+        return max(self.timestamps_ns.values()) - min(self.timestamps_ns.values())
+
+    def to_json(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {}
+        for name in SNAPSHOT_FIELDS:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            d[name] = value if name == "wifi" else value.to_json()
+        d["timestamps_ns"] = dict(self.timestamps_ns)
+        d["started_ns"] = self.started_ns
+        return d
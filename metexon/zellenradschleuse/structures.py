@@ -5,13 +5,14 @@ future device families with distinct layouts.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple
 import math
 import struct
 
 __all__ = [
-    'SystemState', 'ManualControl', 'BlowerPID', 'RGB'
+    'SystemState', 'ManualControl', 'BlowerPID', 'RGB',
+    'SystemStateRecord', 'ManualControlRecord', 'BlowerPIDRecord',
 ]
 
 # Reuse same layouts as existing firmware; duplicating ensures namespace clarity.
@@ -105,9 +106,20 @@ class SystemState:
         )
 
     def to_json(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d['rgb'] = [c.to_tuple() for c in self.rgb]
-        return d
+        return {
+            'state': self.state,
+            'pressure1': self.pressure1,
+            'pressure2': self.pressure2,
+            'absPressure': self.absPressure,
+            'motorCurrent': self.motorCurrent,
+            'getriebemotorPWM': self.getriebemotorPWM,
+            'vibrationsmotorPWM': self.vibrationsmotorPWM,
+            'blowerPWM': self.blowerPWM,
+            'blowerPulseRateRPM': self.blowerPulseRateRPM,
+            'rgb': [c.to_tuple() for c in self.rgb],
+            'encoderCount': self.encoderCount,
+            'blowerPulseCount': self.blowerPulseCount,
+        }
 
     @classmethod
     def from_json(cls, d: Dict[str, Any]) -> 'SystemState':
@@ -155,9 +167,14 @@ class ManualControl:
         )
 
     def to_json(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d['reserved'] = list(self.reserved)
-        return d
+        return {
+            'blower_rpm': self.blower_rpm,
+            'getriebemotor_pwm': self.getriebemotor_pwm,
+            'vibrationsmotor_pwm': self.vibrationsmotor_pwm,
+            'enable_getriebemotor_nvs': self.enable_getriebemotor_nvs,
+            'feeder_seconds': self.feeder_seconds,
+            'reserved': list(self.reserved),
+        }
 
     @classmethod
     def from_json(cls, d: Dict[str, Any]) -> 'ManualControl':
@@ -237,9 +254,25 @@ class BlowerPID:
         )
 
     def to_json(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d['reserved_floats'] = list(self.reserved_floats)
-        return d
+        return {
+            'kp': self.kp,
+            'ki': self.ki,
+            'kd': self.kd,
+            'target_frequency': self.target_frequency,
+            'current_frequency': self.current_frequency,
+            'last_error': self.last_error,
+            'integral_sum': self.integral_sum,
+            'current_pwm': self.current_pwm,
+            'manual_pwm_value': self.manual_pwm_value,
+            'min_pwm_output': self.min_pwm_output,
+            'max_pwm_output': self.max_pwm_output,
+            'update_interval_ms': self.update_interval_ms,
+            'flags': self.flags,
+            'last_update_tick': self.last_update_tick,
+            'feed_forward': self.feed_forward,
+            'derivative_filter_hz': self.derivative_filter_hz,
+            'reserved_floats': list(self.reserved_floats),
+        }
 
     @classmethod
     def from_json(cls, d: Dict[str, Any]) -> 'BlowerPID':
@@ -262,3 +295,310 @@ class BlowerPID:
             derivative_filter_hz=d.get('derivative_filter_hz', math.nan),
             reserved_floats=tuple(d.get('reserved_floats', [math.nan]*4))[:4],
         )
+
+
+# ---------------------------------------------------------------------------
+# Slotted records
+#
+# Drop-in variants of the dataclasses above for hot paths (polling loops,
+# logging many devices): ``__slots__`` instead of an instance ``__dict__``,
+# constructor arguments in wire order so ``from_bytes`` is a single
+# ``cls(*unpack(data))``, and the two LED colours stored flat instead of as
+# two RGB objects. Attribute names, ``from_bytes``/``to_bytes`` and the
+# ``to_json``/``from_json`` dicts match the dataclasses; ``to_dataclass`` /
+# ``from_dataclass`` convert between both.
+# ---------------------------------------------------------------------------
+
+def _record_repr(obj: Any) -> str:
+    fields = ", ".join(f"{name}={getattr(obj, name)!r}" for name in obj.__slots__)
+    return f"{type(obj).__name__}({fields})"
+
+
+def _record_eq(obj: Any, other: object) -> bool:
+    if type(other) is not type(obj):
+        return NotImplemented
+    return all(getattr(obj, n) == getattr(other, n) for n in obj.__slots__)
+
+
+class SystemStateRecord:
+    """Slotted :class:`SystemState` with the LED colours stored flat.
+
+    ``rgb`` is available as a property building the ``[RGB, RGB]`` list on
+    access.
+    """
+
+    __slots__ = (
+        'state', 'pressure1', 'pressure2', 'absPressure', 'motorCurrent',
+        'getriebemotorPWM', 'vibrationsmotorPWM', 'blowerPWM', 'blowerPulseRateRPM',
+        'rgb0_red', 'rgb0_green', 'rgb0_blue', 'rgb1_red', 'rgb1_green', 'rgb1_blue',
+        'encoderCount', 'blowerPulseCount',
+    )
+
+    def __init__(self, state: int, pressure1: float, pressure2: float, absPressure: float,
+                 motorCurrent: float, getriebemotorPWM: int, vibrationsmotorPWM: int, blowerPWM: int,
+                 blowerPulseRateRPM: float, rgb0_red: int, rgb0_green: int, rgb0_blue: int,
+                 rgb1_red: int, rgb1_green: int, rgb1_blue: int, encoderCount: int,
+                 blowerPulseCount: int) -> None:
+        self.state = state
+        self.pressure1 = pressure1
+        self.pressure2 = pressure2
+        self.absPressure = absPressure
+        self.motorCurrent = motorCurrent
+        self.getriebemotorPWM = getriebemotorPWM
+        self.vibrationsmotorPWM = vibrationsmotorPWM
+        self.blowerPWM = blowerPWM
+        self.blowerPulseRateRPM = blowerPulseRateRPM
+        self.rgb0_red = rgb0_red
+        self.rgb0_green = rgb0_green
+        self.rgb0_blue = rgb0_blue
+        self.rgb1_red = rgb1_red
+        self.rgb1_green = rgb1_green
+        self.rgb1_blue = rgb1_blue
+        self.encoderCount = encoderCount
+        self.blowerPulseCount = blowerPulseCount
+
+    @property
+    def rgb(self) -> List[RGB]:
+        return [RGB(self.rgb0_red, self.rgb0_green, self.rgb0_blue),
+                RGB(self.rgb1_red, self.rgb1_green, self.rgb1_blue)]
+
+    @rgb.setter
+    def rgb(self, colors: List[RGB]) -> None:
+        (self.rgb0_red, self.rgb0_green, self.rgb0_blue) = colors[0].to_tuple() if colors else (0, 0, 0)
+        (self.rgb1_red, self.rgb1_green, self.rgb1_blue) = colors[1].to_tuple() if len(colors) > 1 else (0, 0, 0)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'SystemStateRecord':
+        if len(data) != _SYSTEM_STATE_STRUCT.size:
+            raise ValueError(f"SystemStateBinary expected {_SYSTEM_STATE_STRUCT.size} bytes, got {len(data)}")
+        return cls(*_SYSTEM_STATE_STRUCT.unpack(data))
+
+    def to_bytes(self) -> bytes:
+        return _SYSTEM_STATE_STRUCT.pack(
+            self.state, self.pressure1, self.pressure2, self.absPressure, self.motorCurrent,
+            self.getriebemotorPWM, self.vibrationsmotorPWM, self.blowerPWM, self.blowerPulseRateRPM,
+            self.rgb0_red, self.rgb0_green, self.rgb0_blue, self.rgb1_red, self.rgb1_green, self.rgb1_blue,
+            self.encoderCount, self.blowerPulseCount,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'pressure1': self.pressure1,
+            'pressure2': self.pressure2,
+            'absPressure': self.absPressure,
+            'motorCurrent': self.motorCurrent,
+            'getriebemotorPWM': self.getriebemotorPWM,
+            'vibrationsmotorPWM': self.vibrationsmotorPWM,
+            'blowerPWM': self.blowerPWM,
+            'blowerPulseRateRPM': self.blowerPulseRateRPM,
+            'rgb': [(self.rgb0_red, self.rgb0_green, self.rgb0_blue),
+                    (self.rgb1_red, self.rgb1_green, self.rgb1_blue)],
+            'encoderCount': self.encoderCount,
+            'blowerPulseCount': self.blowerPulseCount,
+        }
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> 'SystemStateRecord':
+        rgb_list = d.get('rgb', [(0, 0, 0), (0, 0, 0)])
+        r0, g0, b0 = rgb_list[0] if rgb_list else (0, 0, 0)
+        r1, g1, b1 = rgb_list[1] if len(rgb_list) > 1 else (0, 0, 0)
+        return cls(
+            d.get('state', 0),
+            d.get('pressure1', math.nan),
+            d.get('pressure2', math.nan),
+            d.get('absPressure', math.nan),
+            d.get('motorCurrent', math.nan),
+            d.get('getriebemotorPWM', 0xFFFF),
+            d.get('vibrationsmotorPWM', 0xFFFF),
+            d.get('blowerPWM', 0xFFFF),
+            d.get('blowerPulseRateRPM', math.nan),
+            r0, g0, b0, r1, g1, b1,
+            d.get('encoderCount', -2**31),
+            d.get('blowerPulseCount', 0xFFFFFFFF),
+        )
+
+    @classmethod
+    def from_dataclass(cls, s: SystemState) -> 'SystemStateRecord':
+        (r0, g0, b0) = s.rgb[0].to_tuple() if s.rgb else (0, 0, 0)
+        (r1, g1, b1) = s.rgb[1].to_tuple() if len(s.rgb) > 1 else (0, 0, 0)
+        return cls(s.state, s.pressure1, s.pressure2, s.absPressure, s.motorCurrent, s.getriebemotorPWM,
+                   s.vibrationsmotorPWM, s.blowerPWM, s.blowerPulseRateRPM, r0, g0, b0, r1, g1, b1,
+                   s.encoderCount, s.blowerPulseCount)
+
+    def to_dataclass(self) -> SystemState:
+        return SystemState(self.state, self.pressure1, self.pressure2, self.absPressure, self.motorCurrent,
+                           self.getriebemotorPWM, self.vibrationsmotorPWM, self.blowerPWM,
+                           self.blowerPulseRateRPM, self.rgb, self.encoderCount, self.blowerPulseCount)
+
+    __eq__ = _record_eq
+    __hash__ = None  # type: ignore[assignment]  # mutable, like the dataclass
+    __repr__ = _record_repr
+
+
+class ManualControlRecord:
+    """Slotted :class:`ManualControl`."""
+
+    __slots__ = ('blower_rpm', 'getriebemotor_pwm', 'vibrationsmotor_pwm', 'enable_getriebemotor_nvs',
+                 'feeder_seconds', 'reserved')
+
+    def __init__(self, blower_rpm: float, getriebemotor_pwm: float, vibrationsmotor_pwm: float,
+                 enable_getriebemotor_nvs: int, feeder_seconds: float, reserved: bytes = b'\x00' * 8) -> None:
+        self.blower_rpm = blower_rpm
+        self.getriebemotor_pwm = getriebemotor_pwm
+        self.vibrationsmotor_pwm = vibrationsmotor_pwm
+        self.enable_getriebemotor_nvs = enable_getriebemotor_nvs
+        self.feeder_seconds = feeder_seconds
+        self.reserved = reserved
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ManualControlRecord':
+        if len(data) != _MANUAL_CONTROL_STRUCT.size:
+            raise ValueError(f"ManualControlBinary expected {_MANUAL_CONTROL_STRUCT.size} bytes, got {len(data)}")
+        return cls(*_MANUAL_CONTROL_STRUCT.unpack(data))
+
+    def to_bytes(self) -> bytes:
+        return _MANUAL_CONTROL_STRUCT.pack(self.blower_rpm, self.getriebemotor_pwm, self.vibrationsmotor_pwm,
+                                           self.enable_getriebemotor_nvs, self.feeder_seconds, self.reserved)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'blower_rpm': self.blower_rpm,
+            'getriebemotor_pwm': self.getriebemotor_pwm,
+            'vibrationsmotor_pwm': self.vibrationsmotor_pwm,
+            'enable_getriebemotor_nvs': self.enable_getriebemotor_nvs,
+            'feeder_seconds': self.feeder_seconds,
+            'reserved': list(self.reserved),
+        }
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> 'ManualControlRecord':
+        return cls(
+            d.get('blower_rpm', math.nan),
+            d.get('getriebemotor_pwm', math.nan),
+            d.get('vibrationsmotor_pwm', math.nan),
+            d.get('enable_getriebemotor_nvs', 0),
+            d.get('feeder_seconds', math.nan),
+            bytes(d.get('reserved', [0]*8))[:8].ljust(8, b'\x00'),
+        )
+
+    @classmethod
+    def from_dataclass(cls, m: ManualControl) -> 'ManualControlRecord':
+        return cls(m.blower_rpm, m.getriebemotor_pwm, m.vibrationsmotor_pwm, m.enable_getriebemotor_nvs,
+                   m.feeder_seconds, m.reserved)
+
+    def to_dataclass(self) -> ManualControl:
+        return ManualControl(self.blower_rpm, self.getriebemotor_pwm, self.vibrationsmotor_pwm,
+                             self.enable_getriebemotor_nvs, self.feeder_seconds, self.reserved)
+
+    __eq__ = _record_eq
+    __hash__ = None  # type: ignore[assignment]
+    __repr__ = _record_repr
+
+
+class BlowerPIDRecord:
+    """Slotted :class:`BlowerPID`."""
+
+    __slots__ = ('kp', 'ki', 'kd', 'target_frequency', 'current_frequency', 'last_error', 'integral_sum',
+                 'current_pwm', 'manual_pwm_value', 'min_pwm_output', 'max_pwm_output',
+                 'update_interval_ms', 'flags', 'last_update_tick', 'feed_forward',
+                 'derivative_filter_hz', 'reserved_floats')
+
+    def __init__(self, kp: float, ki: float, kd: float, target_frequency: float, current_frequency: float,
+                 last_error: float, integral_sum: float, current_pwm: int, manual_pwm_value: int,
+                 min_pwm_output: int, max_pwm_output: int, update_interval_ms: int, flags: int,
+                 last_update_tick: int, feed_forward: float, derivative_filter_hz: float,
+                 reserved_floats: Tuple[float, float, float, float]) -> None:
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.target_frequency = target_frequency
+        self.current_frequency = current_frequency
+        self.last_error = last_error
+        self.integral_sum = integral_sum
+        self.current_pwm = current_pwm
+        self.manual_pwm_value = manual_pwm_value
+        self.min_pwm_output = min_pwm_output
+        self.max_pwm_output = max_pwm_output
+        self.update_interval_ms = update_interval_ms
+        self.flags = flags
+        self.last_update_tick = last_update_tick
+        self.feed_forward = feed_forward
+        self.derivative_filter_hz = derivative_filter_hz
+        self.reserved_floats = reserved_floats
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BlowerPIDRecord':
+        if len(data) != _BLOWER_PID_STRUCT.size:
+            raise ValueError(f"BlowerPIDBinary expected {_BLOWER_PID_STRUCT.size} bytes, got {len(data)}")
+        unpacked = _BLOWER_PID_STRUCT.unpack(data)
+        return cls(*unpacked[:16], unpacked[16:20])
+
+    def to_bytes(self) -> bytes:
+        return _BLOWER_PID_STRUCT.pack(
+            self.kp, self.ki, self.kd, self.target_frequency, self.current_frequency, self.last_error,
+            self.integral_sum, self.current_pwm, self.manual_pwm_value, self.min_pwm_output,
+            self.max_pwm_output, self.update_interval_ms, self.flags, self.last_update_tick,
+            self.feed_forward, self.derivative_filter_hz, *self.reserved_floats,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'kp': self.kp,
+            'ki': self.ki,
+            'kd': self.kd,
+            'target_frequency': self.target_frequency,
+            'current_frequency': self.current_frequency,
+            'last_error': self.last_error,
+            'integral_sum': self.integral_sum,
+            'current_pwm': self.current_pwm,
+            'manual_pwm_value': self.manual_pwm_value,
+            'min_pwm_output': self.min_pwm_output,
+            'max_pwm_output': self.max_pwm_output,
+            'update_interval_ms': self.update_interval_ms,
+            'flags': self.flags,
+            'last_update_tick': self.last_update_tick,
+            'feed_forward': self.feed_forward,
+            'derivative_filter_hz': self.derivative_filter_hz,
+            'reserved_floats': list(self.reserved_floats),
+        }
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> 'BlowerPIDRecord':
+        return cls(
+            d.get('kp', math.nan),
+            d.get('ki', math.nan),
+            d.get('kd', math.nan),
+            d.get('target_frequency', math.nan),
+            d.get('current_frequency', math.nan),
+            d.get('last_error', math.nan),
+            d.get('integral_sum', math.nan),
+            d.get('current_pwm', 0xFFFF),
+            d.get('manual_pwm_value', 0xFFFF),
+            d.get('min_pwm_output', 0xFFFF),
+            d.get('max_pwm_output', 0xFFFF),
+            d.get('update_interval_ms', 0),
+            d.get('flags', 0),
+            d.get('last_update_tick', 0),
+            d.get('feed_forward', math.nan),
+            d.get('derivative_filter_hz', math.nan),
+            tuple(d.get('reserved_floats', [math.nan]*4))[:4],
+        )
+
+    @classmethod
+    def from_dataclass(cls, p: BlowerPID) -> 'BlowerPIDRecord':
+        return cls(p.kp, p.ki, p.kd, p.target_frequency, p.current_frequency, p.last_error, p.integral_sum,
+                   p.current_pwm, p.manual_pwm_value, p.min_pwm_output, p.max_pwm_output,
+                   p.update_interval_ms, p.flags, p.last_update_tick, p.feed_forward,
+                   p.derivative_filter_hz, tuple(p.reserved_floats))
+
+    def to_dataclass(self) -> BlowerPID:
+        return BlowerPID(self.kp, self.ki, self.kd, self.target_frequency, self.current_frequency,
+                         self.last_error, self.integral_sum, self.current_pwm, self.manual_pwm_value,
+                         self.min_pwm_output, self.max_pwm_output, self.update_interval_ms, self.flags,
+                         self.last_update_tick, self.feed_forward, self.derivative_filter_hz,
+                         tuple(self.reserved_floats))
+
+    __eq__ = _record_eq
+    __hash__ = None  # type: ignore[assignment]
+    __repr__ = _record_repr
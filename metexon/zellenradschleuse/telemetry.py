@@ -0,0 +1,160 @@
+"""Bounded per-parameter storage for parameter stream telemetry.
+
+:class:`ParameterTelemetryStore` keeps one fixed-capacity ring buffer of
+``(timestamp_us, value)`` samples per ``parameter_id``, so memory use stays
+constant no matter how long a monitor runs.
+
+Each :class:`ParameterRingBuffer` stores every sample twice (at ``i`` and
+``i + capacity``) so the most recent samples always form one contiguous
+slice. :meth:`~ParameterRingBuffer.last` and
+:meth:`~ParameterRingBuffer.since` therefore return zero-copy NumPy views.
+Those views alias the buffer: samples appended later may overwrite them, so
+call ``.copy()`` if you need to keep them.
+
+Requires the optional ``numpy`` dependency (``pip install metexon[numpy]``).
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .parameter_stream_client import ParameterStreamFrame
+
+__all__ = ["ParameterRingBuffer", "ParameterTelemetryStore"]
+
+Samples = Tuple[np.ndarray, np.ndarray]
+
+
+class ParameterRingBuffer:
+    """Fixed-capacity ring buffer of ``(timestamp_us, value)`` samples.
+
+    Timestamps are expected to be non-decreasing (as produced by the device
+    clock); :meth:`since` relies on that.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._timestamps = np.zeros(2 * self.capacity, dtype=np.uint64)
+        self._values = np.full(2 * self.capacity, np.nan, dtype=np.float64)
+        self._pos = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp_us: int, value: float) -> None:
+        """Add one sample, overwriting the oldest one when full. O(1)."""
+        i = self._pos
+        j = i + self.capacity
+        self._timestamps[i] = self._timestamps[j] = timestamp_us
+        self._values[i] = self._values[j] = value
+        self._pos = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, timestamps_us: np.ndarray, values: np.ndarray) -> None:
+        """Add many samples at once (vectorized)."""
+        n = len(timestamps_us)
+        if n == 0:
+            return
+        if n > self.capacity:
+            timestamps_us = timestamps_us[-self.capacity:]
+            values = values[-self.capacity:]
+            self._pos = (self._pos + n - self.capacity) % self.capacity
+            n = self.capacity
+        idx = (self._pos + np.arange(n)) % self.capacity
+        self._timestamps[idx] = self._timestamps[idx + self.capacity] = timestamps_us
+        self._values[idx] = self._values[idx + self.capacity] = values
+        self._pos = (self._pos + n) % self.capacity
+        self._count = min(self._count + n, self.capacity)
+
+    def last(self, n: Optional[int] = None) -> Samples:
+        """Return views of the *n* most recent samples (all if None), oldest first."""
+        n = self._count if n is None else max(0, min(int(n), self._count))
+        end = self._pos + self.capacity
+        return self._timestamps[end - n:end], self._values[end - n:end]
+
+    def since(self, timestamp_us: int) -> Samples:
+        """Return views of all samples with ``timestamp >= timestamp_us``."""
+        timestamps, values = self.last()
+        start = int(np.searchsorted(timestamps, np.uint64(timestamp_us), side="left"))
+        return timestamps[start:], values[start:]
+
+    def latest(self) -> Optional[Tuple[int, float]]:
+        """Return the most recent sample or None if empty."""
+        if not self._count:
+            return None
+        i = (self._pos - 1) % self.capacity
+        return int(self._timestamps[i]), float(self._values[i])
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._count = 0
+
+
+class ParameterTelemetryStore:
+    """Ring buffers of stream samples keyed by ``parameter_id``.
+
+    Parameters
+    ----------
+    capacity:
+        Default number of samples kept per parameter.
+    capacities:
+        Optional per-parameter capacity overrides.
+    """
+
+    def __init__(self, capacity: int = 4096, capacities: Optional[Dict[int, int]] = None) -> None:
+        self.capacity = int(capacity)
+        self._capacities = dict(capacities or {})
+        self._buffers: Dict[int, ParameterRingBuffer] = {}
+
+    def buffer(self, parameter_id: int) -> ParameterRingBuffer:
+        """Return the ring buffer for *parameter_id*, creating it if needed."""
+        buf = self._buffers.get(parameter_id)
+        if buf is None:
+            buf = ParameterRingBuffer(self._capacities.get(parameter_id, self.capacity))
+            self._buffers[parameter_id] = buf
+        return buf
+
+    def add_frame(self, frame: ParameterStreamFrame) -> None:
+        """Store a decoded frame. Non-numeric values are stored as NaN."""
+        value = frame.value
+        if isinstance(value, (bytes, bytearray)):
+            value = np.nan
+        self.buffer(frame.parameter_id).append(frame.timestamp_us, value)
+
+    def add_batch(self, batch) -> None:
+        """Store a :class:`~metexon.zellenradschleuse.parameter_stream_batch.ParameterStreamBatch`."""
+        ids = batch.parameter_id
+        for pid in np.unique(ids):
+            mask = ids == pid
+            self.buffer(int(pid)).extend(batch.timestamp_us[mask], batch.value[mask])
+
+    def last(self, parameter_id: int, n: Optional[int] = None) -> Samples:
+        return self.buffer(parameter_id).last(n)
+
+    def since(self, parameter_id: int, timestamp_us: int) -> Samples:
+        return self.buffer(parameter_id).since(timestamp_us)
+
+    def parameter_ids(self) -> list:
+        return sorted(self._buffers)
+
+    @property
+    def nbytes(self) -> int:
+        """Total memory allocated for sample storage."""
+        return sum(b._timestamps.nbytes + b._values.nbytes for b in self._buffers.values())
+
+    def __contains__(self, parameter_id: object) -> bool:
+        return parameter_id in self._buffers
+
+    def __getitem__(self, parameter_id: int) -> ParameterRingBuffer:
+        return self._buffers[parameter_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._buffers)
+
+    def __len__(self) -> int:
+        return len(self._buffers)
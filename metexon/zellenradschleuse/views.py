@@ -0,0 +1,173 @@
+"""Zero-copy views of Zellenradschleuse characteristic payloads.
+
+A view wraps the ``bytearray`` returned by ``read_gatt_char`` (or any other
+buffer: ``bytes``, ``memoryview``, a slice of a larger recording) and
+decodes a field only when it is accessed, with ``struct.unpack_from`` at an
+offset computed once per class. Loops that look at one or two fields per
+read (e.g. the pressures) skip unpacking and boxing all others::
+
+    view = zr.read_system_state_view()
+    print(view.pressure1, view.pressure2)
+
+Attribute names match :mod:`~metexon.zellenradschleuse.structures` (the LED
+colours are flat like in :class:`~.structures.SystemStateRecord`). Views do
+not copy: a view stays valid only as long as its buffer holds the payload,
+and :meth:`rebind` points an existing view at the next buffer. Over a
+writable buffer, assigning a field packs it in place, so a view can also
+edit a payload before writing it back (``view.buffer``).
+"""
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List, Tuple
+
+from .structures import (
+    RGB, _BLOWER_PID_STRUCT, _MANUAL_CONTROL_STRUCT, _SYSTEM_STATE_STRUCT,
+    BlowerPID, BlowerPIDRecord, ManualControl, ManualControlRecord, SystemState, SystemStateRecord,
+)
+
+__all__ = ['SystemStateView', 'ManualControlView', 'BlowerPIDView']
+
+
+class _Field:
+    """Descriptor decoding one field of the view's buffer at a fixed offset."""
+
+    __slots__ = ('name', 'offset', '_unpack_from', '_pack_into', '_single')
+
+    def __init__(self, code: str, offset: int) -> None:
+        s = struct.Struct('<' + code)
+        self.name = ''
+        self.offset = offset
+        self._unpack_from = s.unpack_from
+        self._pack_into = s.pack_into
+        # '4f' decodes to a tuple, 'f' and '8s' to a single value
+        self._single = len(s.unpack(bytes(s.size))) == 1
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        if self._single:
+            return self._unpack_from(obj._buf, self.offset)[0]
+        return self._unpack_from(obj._buf, self.offset)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if self._single:
+            self._pack_into(obj._buf, self.offset, value)
+        else:
+            self._pack_into(obj._buf, self.offset, *value)
+
+
+def _fields(layout: struct.Struct, *codes: str) -> List[_Field]:
+    fields = []
+    offset = 0
+    for code in codes:
+        fields.append(_Field(code, offset))
+        offset += struct.calcsize('<' + code)
+    if offset != layout.size:
+        raise AssertionError(f"view layout covers {offset} bytes, struct has {layout.size}")
+    return fields
+
+
+class _StructView:
+    __slots__ = ('_buf',)
+
+    _STRUCT: struct.Struct
+    _RECORD: Any
+    _LABEL = ''
+
+    def __init__(self, data: Any) -> None:
+        self.rebind(data)
+
+    def rebind(self, data: Any) -> None:
+        """Point the view at a new payload buffer (no copy)."""
+        if len(data) != self._STRUCT.size:
+            raise ValueError(f"{self._LABEL} expected {self._STRUCT.size} bytes, got {len(data)}")
+        self._buf = data
+
+    @property
+    def buffer(self) -> Any:
+        """The wrapped buffer (e.g. to write an edited payload back)."""
+        return self._buf
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buf)
+
+    def to_record(self) -> Any:
+        """Decode all fields into the slotted record."""
+        return self._RECORD.from_bytes(self._buf)
+
+    def to_json(self) -> Dict[str, Any]:
+        return self.to_record().to_json()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._RECORD.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+_PRESSURES = struct.Struct('<ff')
+
+
+class SystemStateView(_StructView):
+    """Lazy view of a :class:`~.structures.SystemState` payload."""
+
+    __slots__ = ()
+    _STRUCT = _SYSTEM_STATE_STRUCT
+    _RECORD = SystemStateRecord
+    _LABEL = 'SystemStateBinary'
+
+    (state, pressure1, pressure2, absPressure, motorCurrent,
+     getriebemotorPWM, vibrationsmotorPWM, blowerPWM, blowerPulseRateRPM,
+     rgb0_red, rgb0_green, rgb0_blue, rgb1_red, rgb1_green, rgb1_blue,
+     encoderCount, blowerPulseCount) = _fields(
+        _SYSTEM_STATE_STRUCT, 'B', 'f', 'f', 'f', 'f', 'H', 'H', 'H', 'f',
+        'B', 'B', 'B', 'B', 'B', 'B', 'i', 'I')
+    _PRESSURES_OFFSET = pressure1.offset
+
+    @property
+    def rgb(self) -> List[RGB]:
+        return [RGB(self.rgb0_red, self.rgb0_green, self.rgb0_blue),
+                RGB(self.rgb1_red, self.rgb1_green, self.rgb1_blue)]
+
+    def pressures(self) -> Tuple[float, float]:
+        """``(pressure1, pressure2)`` with a single unpack."""
+        return _PRESSURES.unpack_from(self._buf, self._PRESSURES_OFFSET)
+
+    def to_dataclass(self) -> SystemState:
+        return SystemState.from_bytes(self._buf)
+
+
+class ManualControlView(_StructView):
+    """Lazy view of a :class:`~.structures.ManualControl` payload."""
+
+    __slots__ = ()
+    _STRUCT = _MANUAL_CONTROL_STRUCT
+    _RECORD = ManualControlRecord
+    _LABEL = 'ManualControlBinary'
+
+    (blower_rpm, getriebemotor_pwm, vibrationsmotor_pwm, enable_getriebemotor_nvs,
+     feeder_seconds, reserved) = _fields(_MANUAL_CONTROL_STRUCT, 'f', 'f', 'f', 'B', 'f', '8s')
+
+    def to_dataclass(self) -> ManualControl:
+        return ManualControl.from_bytes(self._buf)
+
+
+class BlowerPIDView(_StructView):
+    """Lazy view of a :class:`~.structures.BlowerPID` payload."""
+
+    __slots__ = ()
+    _STRUCT = _BLOWER_PID_STRUCT
+    _RECORD = BlowerPIDRecord
+    _LABEL = 'BlowerPIDBinary'
+
+    (kp, ki, kd, target_frequency, current_frequency, last_error, integral_sum,
+     current_pwm, manual_pwm_value, min_pwm_output, max_pwm_output,
+     update_interval_ms, flags, last_update_tick, feed_forward, derivative_filter_hz,
+     reserved_floats) = _fields(
+        _BLOWER_PID_STRUCT, 'f', 'f', 'f', 'f', 'f', 'f', 'f', 'H', 'H', 'H', 'H',
+        'I', 'I', 'I', 'f', 'f', '4f')
+
+    def to_dataclass(self) -> BlowerPID:
+        return BlowerPID.from_bytes(self._buf)
@@ -0,0 +1,77 @@
+import asyncio
+
+from bleak.backends.scanner import AdvertisementData
+
+from metexon.zellenradschleuse.advertisement import (
+    ADVERTISEMENT_COMPANY_ID,
+    aiter_advertised_states,
+    decode_advertised_state,
+    encode_advertisement_payload,
+)
+from metexon.zellenradschleuse.simulator import SimulatedScanner, SimulatedZellenradschleuse
+
+
+def _adv(manufacturer_data=None, service_data=None):
+    return AdvertisementData(local_name="METEXON", manufacturer_data=manufacturer_data or {},
+                             service_data=service_data or {}, service_uuids=[], tx_power=None,
+                             rssi=-55, platform_data=())
+
+
+def test_payload_round_trip_and_rejects():
+    sim = SimulatedZellenradschleuse()
+    payload = encode_advertisement_payload(sim.system_state)
+    assert len(payload) == 18
+    st = decode_advertised_state("AA:00", _adv({ADVERTISEMENT_COMPANY_ID: payload + b"\x00\x01"}), received_ns=5)
+    assert (st.address, st.rssi, st.received_ns, st.state) == ("AA:00", -55, 5, 1)
+    assert abs(st.pressure1 - sim.system_state.pressure1) < 1e-3
+    assert abs(st.blowerPulseRateRPM - 3000.0) < 1e-3
+
+    assert decode_advertised_state("AA:00", _adv()) is None
+    assert decode_advertised_state("AA:00", _adv({ADVERTISEMENT_COMPANY_ID: payload[:10]})) is None
+    assert decode_advertised_state("AA:00", _adv({ADVERTISEMENT_COMPANY_ID: b"\x09" + payload[1:]})) is None
+    assert decode_advertised_state("AA:00", _adv({0x004C: payload})) is None
+
+
+def test_monitor_fleet_without_connections():
+    scanner = SimulatedScanner()
+    devices = []
+    for i in range(3):
+        sim = SimulatedZellenradschleuse()
+        sim.system_state.pressure1 = 100.0 + i
+        devices.append(sim)
+        scanner.add(f"AA:0{i}", device=sim, interval_s=0.01,
+                    telemetry="service_data" if i == 2 else "manufacturer_data")
+    scanner.add("AA:09", interval_s=0.01)  # no telemetry payload
+    seen = []
+
+    async def main():
+        scan = aiter_advertised_states(timeout=0.1, scanner_factory=scanner, callback=seen.append,
+                                       yield_states=False)
+        async with scan:
+            await asyncio.sleep(0.05)
+            devices[0].system_state.state = 3
+            async for _ in scan:
+                pass
+        return scan.latest
+
+    latest = asyncio.run(main())
+    assert sorted(latest) == ["AA:00", "AA:01", "AA:02"]
+    assert [round(latest[a].pressure1) for a in sorted(latest)] == [100, 101, 102]
+    assert latest["AA:00"].state == 3
+    assert len(seen) > 3
+    assert all(sim._clients == [] for sim in devices)
+
+
+def test_failing_callback_does_not_stop_the_scan(caplog):
+    scanner = SimulatedScanner()
+    scanner.add("AA:00", device=SimulatedZellenradschleuse(), interval_s=0.01)
+
+    def broken(st):
+        raise RuntimeError("dashboard down")
+
+    async def main():
+        async with aiter_advertised_states(timeout=0.05, scanner_factory=scanner, callback=broken) as scan:
+            return [st async for st in scan]
+
+    assert asyncio.run(main())
+    assert "Advertised state callback failed" in caplog.text
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from metexon import Zellenradschleuse
+from metexon.zellenradschleuse import AsyncZellenradschleuseClient, ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+from metexon.zellenradschleuse.update_helpers import partial_blower_pid
+
+
+def _public_methods(cls):
+    return {n for n in dir(cls) if not n.startswith("_") and callable(getattr(cls, n))}
+
+
+def test_every_io_method_has_a_coroutine_version():
+    methods = _public_methods(ZellenradschleuseClient)
+    # Local helpers and (a)sync pairs that differ in name
+    exempt = {"connect", "disconnect", "timeout_counts", "gatt_stats", "reset_gatt_stats", "parameter_stream_stats",
+              "parameter_stream_supports_notify", "iter_parameter_stream_frames"}
+    missing = [m for m in methods if not m.startswith("a") and m not in exempt and "a" + m not in methods]
+    assert missing == []
+    assert "aiter_parameter_stream_frames" in methods
+
+
+def test_async_client_runs_on_callers_loop():
+    sim = SimulatedZellenradschleuse()
+
+    async def main():
+        async with AsyncZellenradschleuseClient("SIM", client_factory=sim) as zr:
+            assert zr._loop_thread is None
+            assert await zr.adevice_type() == "Zellenradschleuse"
+            await zr.awrite_blower_pid(partial_blower_pid(kp=3.0))
+            assert (await zr.aread_blower_pid()).kp == pytest.approx(3.0)
+            await zr.awrite_rgb_led([(1, 2, 3), (4, 5, 6)])
+            assert await zr.aread_rgb_led() == [(1, 2, 3), (4, 5, 6)]
+            await zr.anvs_set("feeder_rpm", 1500)
+            assert (await zr.anvs_read_all())["feeder_rpm"] == 1500
+            assert await zr.anvs_write_all({"missing": 1}) != []
+            await zr.aparameter_stream_list()
+            await zr.aparameter_stream_start(interval_ms=10, ids=[101])
+            frames = []
+            assert await zr.aparameter_stream_subscribe(frames.append) == "notify"
+            await asyncio.sleep(0.1)
+            await zr.aparameter_stream_unsubscribe()
+            await zr.aparameter_stream_stop()
+            assert frames and frames[0].name == "state"
+
+    asyncio.run(main())
+
+
+def test_legacy_async_methods_use_the_typed_connection():
+    sim = SimulatedZellenradschleuse()
+    zr = Zellenradschleuse("SIM")
+    zr._typed._client_factory = sim
+
+    async def main():
+        async with zr:
+            assert await zr.adevice_type() == "Zellenradschleuse"
+            assert (await zr.asystem_state()).state == 1
+
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from metexon.clock_sync import ClockSync
+
+
+def test_clock_sync_recovers_offset_and_drift():
+    rng = random.Random(1)
+    sync = ClockSync(window=64)
+    host0 = 5_000_000_000_000
+    drift = 50e-6
+    for i in range(5000):
+        device_us = 1_000_000 + i * 150_000
+        true_host = host0 + int(device_us * 1000 * (1 + drift))
+        sync.update(device_us, true_host + rng.randint(0, 200_000))
+    assert sync.drift_ppm == pytest.approx(50.0, abs=5.0)
+    device_us = 1_000_000 + 5000 * 150_000
+    expected = host0 + int(device_us * 1000 * (1 + drift)) + 100_000
+    assert abs(sync.to_host_ns(device_us) - expected) < 100_000
+
+
+def test_clock_sync_ignores_repeats_and_resets_on_reboot():
+    sync = ClockSync(window=8)
+    assert sync.to_host_ns(0) is None
+    assert sync.update(5_000_000, 10_000_000_000) == 10_000_000_000
+    sync.update(6_000_000, 11_000_000_000)
+    assert sync.update(6_000_000, 99_000_000_000) == 11_000_000_000
+    assert sync.samples == 2
+    sync.update(10, 50_000_000_000)
+    assert sync.samples == 1
+    assert sync.to_host_ns(10) == 50_000_000_000
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from metexon.constants import BLOWER_PID_UUID, SYSTEM_STATE_UUID
+from metexon.deadlines import call_deadline
+from metexon.exceptions import OperationTimeoutError
+from metexon.loop_thread import AsyncLoopThread
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def test_loop_thread_run_cancels_on_deadline():
+    cancelled = []
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    t = AsyncLoopThread()
+    try:
+        with pytest.raises(OperationTimeoutError):
+            t.run(hang(), timeout=0.05)
+        assert t.run(asyncio.sleep(0, result=1), timeout=1.0) == 1
+        assert cancelled == [True]
+    finally:
+        t.close()
+
+
+def test_device_deadline_records_pending_characteristic():
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim, call_timeout=0.1) as zr:
+        sim.latency_s = 5.0
+        t0 = time.perf_counter()
+        with pytest.raises(OperationTimeoutError) as info:
+            zr.read_system_state()
+        assert time.perf_counter() - t0 < 1.0
+        assert info.value.operation == "read"
+        assert info.value.characteristic == str(SYSTEM_STATE_UUID).lower()
+        with pytest.raises(OperationTimeoutError):
+            zr.read_blower_pid()
+        assert zr.timeout_counts() == {str(SYSTEM_STATE_UUID).lower(): 1, str(BLOWER_PID_UUID).lower(): 1}
+
+        sim.latency_s = 0.2
+        with call_deadline(None):
+            assert zr.read_system_state().state == 1
+        with call_deadline(0.05), pytest.raises(OperationTimeoutError):
+            zr.device_type()
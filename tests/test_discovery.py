@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+from metexon.discovery import adiscover_metexon, adiscover_metexon_one, aiter_metexon, discover_metexon
+from metexon.zellenradschleuse.simulator import SimulatedScanner
+
+
+def test_one_returns_on_first_matching_advertisement():
+    scanner = SimulatedScanner()
+    scanner.add("AA:00", name="Other", delay_s=0.0)
+    scanner.add("AA:01", name="METEXON-ZR", delay_s=0.05, rssi=-40)
+
+    async def main():
+        t0 = time.perf_counter()
+        found = await adiscover_metexon_one(timeout=5.0, scanner_factory=scanner)
+        return found, time.perf_counter() - t0
+
+    found, elapsed = asyncio.run(main())
+    assert found["address"] == "AA:01" and found["rssi"] == -40
+    assert elapsed < 0.5
+    assert scanner.active_scans == 0 and len(scanner.scans) == 1
+
+
+def test_one_returns_none_after_timeout_and_propagates_errors():
+    scanner = SimulatedScanner()
+    scanner.add("AA:00", name="Other")
+    assert asyncio.run(adiscover_metexon_one(timeout=0.1, scanner_factory=scanner)) is None
+
+    failing = SimulatedScanner(start_error=OSError("adapter off"))
+    with pytest.raises(OSError):
+        asyncio.run(adiscover_metexon_one(timeout=0.1, scanner_factory=failing))
+
+
+def test_iterator_streams_devices_incrementally():
+    scanner = SimulatedScanner()
+    for i in range(3):
+        scanner.add(f"AA:0{i}", delay_s=0.05 * i, interval_s=0.01)
+
+    async def main():
+        seen = []
+        t0 = time.perf_counter()
+        async with aiter_metexon(timeout=None, scanner_factory=scanner) as scan:
+            async for found in scan:
+                seen.append((found["address"], time.perf_counter() - t0))
+                if len(seen) == 3:
+                    break
+        return seen
+
+    seen = asyncio.run(main())
+    assert [a for a, _ in seen] == ["AA:00", "AA:01", "AA:02"]
+    assert seen[0][1] < 0.04  # first device yielded before the others advertise
+    assert scanner.active_scans == 0
+
+
+def test_discover_collects_latest_rssi_and_filters_by_service():
+    scanner = SimulatedScanner()
+    scanner.add("AA:00", name=None, interval_s=0.01)
+    scanner.add("AA:01", name="METEXON-A", service_uuids=[], interval_s=0.01)
+
+    by_service = discover_metexon(timeout=0.1, filter_by="service", scanner_factory=scanner)
+    assert [d["address"] for d in by_service] == ["AA:00"]
+    by_name = discover_metexon(timeout=0.1, scanner_factory=scanner)
+    assert [d["address"] for d in by_name] == ["AA:01"]
+
+    async def main():
+        scan = asyncio.ensure_future(adiscover_metexon(timeout=0.2, filter_by="service", scanner_factory=scanner))
+        await asyncio.sleep(0.1)
+        scanner.advertisers[0].rssi = -80
+        return await scan
+
+    assert asyncio.run(main())[0]["rssi"] == -80
+    with pytest.raises(ValueError):
+        discover_metexon(timeout=0.1, filter_by="mac", scanner_factory=scanner)
@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+from metexon.discovery import adiscover_metexon_one, discover_metexon, discover_metexon_one
+from metexon.discovery_cache import DiscoveryCache, DiscoveryRefresher
+from metexon.zellenradschleuse.simulator import SimulatedScanner
+
+
+def _scanner():
+    scanner = SimulatedScanner()
+    scanner.add("AA:00", name="METEXON-A", rssi=-50, interval_s=0.01)
+    scanner.add("AA:01", name="METEXON-B", rssi=-70, interval_s=0.01, delay_s=0.02)
+    return scanner
+
+
+def test_cached_or_scan_returns_instantly_when_fresh(tmp_path):
+    path = tmp_path / "discovery.json"
+    scanner = _scanner()
+    found = discover_metexon(timeout=0.1, scanner_factory=scanner, cache=DiscoveryCache(path))
+    assert {d["address"] for d in found} == {"AA:00", "AA:01"}
+    assert len(scanner.scans) == 1
+
+    # A new process: the entries come from disk without scanning.
+    cache = DiscoveryCache(path)
+    t0 = time.perf_counter()
+    one = discover_metexon_one(timeout=5.0, scanner_factory=scanner, cache=cache)
+    assert time.perf_counter() - t0 < 0.05
+    assert one["address"] in {"AA:00", "AA:01"} and one["rssi"] in (-50, -70)
+    assert one["service_uuids"] and one["rssi_history"]
+    assert len(discover_metexon(timeout=5.0, scanner_factory=scanner, cache=cache, use_cached=True)) == 2
+    assert len(scanner.scans) == 1
+
+    # Stale entries (or use_cached=False) fall back to scanning.
+    stale = DiscoveryCache(path, max_age_s=0.0)
+    time.sleep(0.01)
+    assert discover_metexon_one(timeout=5.0, scanner_factory=scanner, cache=stale)["address"] == "AA:00"
+    assert len(scanner.scans) == 2
+    discover_metexon_one(timeout=5.0, scanner_factory=scanner, cache=cache, use_cached=False)
+    assert len(scanner.scans) == 3
+
+
+def test_cache_filters_merges_and_invalidates(tmp_path):
+    path = tmp_path / "discovery.json"
+    a, b = DiscoveryCache(path), DiscoveryCache(path)
+    a.record({"address": "aa:00", "name": "METEXON-A", "rssi": -40, "service_uuids": []}, seen=100.0)
+    a.save()
+    b.record({"address": "AA:01", "name": "Other", "rssi": -60, "service_uuids": []}, seen=200.0)
+    b.save()  # merges with a's entry on disk
+    merged = DiscoveryCache(path)
+    assert [e["address"] for e in merged.entries()] == ["AA:01", "aa:00"]
+
+    # Only entries matching filter_by resolve from the cache.
+    fresh = DiscoveryCache(path, max_age_s=1e12)
+    scanner = SimulatedScanner()
+    assert asyncio.run(adiscover_metexon_one(timeout=0.05, scanner_factory=scanner, cache=fresh))["address"] == "aa:00"
+    assert asyncio.run(adiscover_metexon_one(timeout=0.05, filter_by="service", scanner_factory=scanner,
+                                             cache=fresh)) is None
+
+    fresh.invalidate("AA:00")
+    assert DiscoveryCache(path).lookup("aa:00") is None
+    assert DiscoveryCache(path).lookup("AA:01") is not None
+
+
+def test_unwritable_cache_is_logged_not_raised(tmp_path, caplog):
+    (tmp_path / "file").write_text("")
+    cache = DiscoveryCache(tmp_path / "file" / "discovery.json")  # parent is not a directory
+    cache.record({"address": "AA:00", "name": "METEXON-A", "rssi": -40, "service_uuids": []})
+    cache.invalidate("AA:00")
+    assert cache.lookup("AA:00") is None
+    cache.clear()
+    assert caplog.text.count("discovery cache") == 2
+
+
+def test_rssi_history_is_bounded(tmp_path):
+    cache = DiscoveryCache(tmp_path / "d.json", history=3, history_interval_s=1.0)
+    for i in range(10):
+        cache.record({"address": "AA:00", "rssi": -i}, seen=float(i) / 2)
+    entry = cache.lookup("AA:00")
+    assert entry["rssi"] == -9
+    assert [t for t, _ in entry["rssi_history"]] == [2.0, 3.0, 4.0]
+
+
+def test_background_refresher(tmp_path):
+    cache = DiscoveryCache(tmp_path / "d.json")
+    refresher = DiscoveryRefresher(cache, interval_s=0.1, scan_s=0.05, scanner_factory=_scanner())
+    refresher.start_background()
+    try:
+        deadline = time.monotonic() + 2.0
+        while refresher.scans < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        refresher.stop()
+    assert refresher.scans >= 2
+    assert DiscoveryCache(tmp_path / "d.json").lookup("AA:00")["name"] == "METEXON-A"
+
+
+def test_listing_scans_unless_asked_for_cached_entries(tmp_path, caplog):
+    path = tmp_path / "discovery.json"
+    cache = DiscoveryCache(path)
+    cache.record({"address": "AA:00", "name": "METEXON-A", "rssi": -50, "service_uuids": []})
+    cache.save()
+    scanner = _scanner()
+    # One cached device must not hide the others in range.
+    found = discover_metexon(timeout=0.1, scanner_factory=scanner, cache=DiscoveryCache(path))
+    assert {d["address"] for d in found} == {"AA:00", "AA:01"}
+    assert len(scanner.scans) == 1
+
+    # An unwritable cache does not fail the discovery.
+    blocked = tmp_path / "file"
+    blocked.write_text("")
+    found = discover_metexon(timeout=0.1, scanner_factory=scanner, cache=DiscoveryCache(blocked / "d.json"))
+    assert len(found) == 2
+    assert "Could not save discovery cache" in caplog.text
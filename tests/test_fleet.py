@@ -0,0 +1,97 @@
+import time
+
+from metexon.loop_thread import shared_loop_threads
+from metexon.zellenradschleuse.fleet import ZellenradschleuseFleet
+from metexon.zellenradschleuse.simulator import SimulatedScanner, SimulatedZellenradschleuse
+
+
+def _fleet(sims, **kwargs):
+    return ZellenradschleuseFleet(sims, client_factory=lambda address, **kw: sims[address](address, **kw), **kwargs)
+
+
+def test_fan_out_runs_in_parallel_with_per_device_errors():
+    sims = {f"SIM-{i}": SimulatedZellenradschleuse(latency_s=0.05, connect_latency_s=0.05) for i in range(6)}
+    sims["SIM-5"].fail_next()  # connect fails
+    with _fleet(sims, max_concurrent_connects=3) as fleet:
+        assert set(fleet.connected) == set(sims) - {"SIM-5"}
+        sims["SIM-1"].fail_next()
+        t0 = time.perf_counter()
+        results = fleet.read_system_state()
+        elapsed = time.perf_counter() - t0
+        assert elapsed < 0.2  # parallel: ~1 latency instead of 5
+        assert [a for a, r in results.items() if not r.ok] == ["SIM-1", "SIM-5"]
+        assert results["SIM-0"].value.state == 1
+        nvs = fleet.nvs_read_all()
+        assert nvs["SIM-2"].value["feeder_rpm"] == 1200
+        assert fleet["SIM-3"].read_blower_pid().kp > 0
+    assert shared_loop_threads() == {}
+
+
+def test_connect_concurrency_cap_and_op_timeout():
+    sims = {f"SIM-{i}": SimulatedZellenradschleuse(connect_latency_s=0.05) for i in range(4)}
+    fleet = _fleet(sims, max_concurrent_connects=2)
+    t0 = time.perf_counter()
+    fleet.connect()
+    assert time.perf_counter() - t0 >= 0.1  # two batches of two
+    try:
+        sims["SIM-0"].latency_s = 1.0
+        results = fleet.read_blower_pid(op_timeout=0.1)
+        assert not results["SIM-0"].ok
+        assert all(r.ok for a, r in results.items() if a != "SIM-0")
+    finally:
+        fleet.disconnect()
+
+
+def test_fleets_on_one_adapter_keep_their_own_limit():
+    def sims(prefix):
+        return {f"{prefix}-{i}": SimulatedZellenradschleuse(connect_latency_s=0.05) for i in range(3)}
+
+    serial, parallel = _fleet(sims("A"), max_concurrent_connects=1), _fleet(sims("B"), max_concurrent_connects=3)
+    try:
+        for fleet, fastest, slowest in ((serial, 0.15, 1.0), (parallel, 0.0, 0.12)):
+            t0 = time.perf_counter()
+            fleet.connect()
+            assert fastest <= time.perf_counter() - t0 < slowest
+    finally:
+        serial.disconnect()
+        parallel.disconnect()
+
+
+def _line(n, **kwargs):
+    sims = {f"AA:{i:02d}": SimulatedZellenradschleuse(connect_latency_s=0.05) for i in range(n)}
+    scanner = SimulatedScanner()
+    for i, address in enumerate(sims):
+        scanner.add(address, delay_s=0.02 * i, interval_s=0.01, **kwargs)
+    return sims, scanner
+
+
+def test_discover_and_connect_pipelines_connects_with_scan():
+    sims, scanner = _line(8)
+    scanner.advertisers[3].rssi = -95  # too weak
+    fleet = ZellenradschleuseFleet(client_factory=lambda address, **kw: sims[address](address, **kw),
+                                   max_concurrent_connects=3, min_rssi=-80)
+    t0 = time.perf_counter()
+    try:
+        results = fleet.discover_and_connect(scan_timeout=2.0, expected=7, scanner_factory=scanner)
+        elapsed = time.perf_counter() - t0
+        assert sorted(results) == sorted(a for a in sims if a != "AA:03")
+        assert all(r.ok for r in results.values())
+        # Sequential discover-then-connect would need the scan window plus 7 connects.
+        assert elapsed < 0.5
+        assert scanner.active_scans == 0
+        assert all(r.ok for r in fleet.read_system_state().values())
+    finally:
+        fleet.disconnect()
+
+
+def test_discover_and_connect_only_known_addresses():
+    sims, scanner = _line(4)
+    fleet = _fleet({a: sims[a] for a in ("AA:01", "AA:02")})
+    try:
+        t0 = time.perf_counter()
+        results = fleet.discover_and_connect(scan_timeout=5.0, scanner_factory=scanner)
+        assert time.perf_counter() - t0 < 1.0  # scan ends once both were seen
+        assert sorted(results) == ["AA:01", "AA:02"]
+        assert sorted(fleet.connected) == ["AA:01", "AA:02"]
+    finally:
+        fleet.disconnect()
@@ -0,0 +1,49 @@
+import json
+
+from metexon.gatt_cache import GattCache
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def _connect(sim, cache):
+    zr = ZellenradschleuseClient("AA:BB", client_factory=sim, gatt_cache=cache)
+    zr.connect()
+    return zr
+
+
+def test_reconnect_discovers_only_cached_services(tmp_path):
+    path = tmp_path / "gatt.json"
+    sim = SimulatedZellenradschleuse()
+    _connect(sim, GattCache(path)).disconnect()
+    assert sim.discovered_services == 6  # GAP, GATT, DIS + 3 Metexon services
+    entry, = json.loads(path.read_text())["entries"].values()
+    assert entry["device_type"] == "Zellenradschleuse" and len(entry["services"]) == 3
+
+    zr = _connect(sim, GattCache(path))  # fresh instance reads the file
+    assert sim.discovered_services == 6 + 3
+    assert zr.read_system_state().state == 1
+    assert zr.parameter_stream_supports_notify()
+    zr.disconnect()
+
+
+def test_firmware_change_invalidates_entry(tmp_path):
+    cache = GattCache(tmp_path / "gatt.json")
+    _connect(SimulatedZellenradschleuse(), cache).disconnect()
+    old = cache.lookup("aa:bb")
+
+    updated = SimulatedZellenradschleuse(handle_base=40)
+    zr = _connect(updated, cache)
+    assert updated.discovered_services == 3 + 6  # cached attempt, then full rediscovery
+    assert cache.lookup("AA:BB")["fingerprint"] != old["fingerprint"]
+    zr.disconnect()
+
+
+def test_device_type_is_validated_lazily(tmp_path):
+    cache = GattCache(tmp_path / "gatt.json")
+    sim = SimulatedZellenradschleuse()
+    _connect(sim, cache).disconnect()
+    sim.device_type = "Zellenradschleuse-v2"
+    with _connect(sim, cache) as zr:
+        assert cache.lookup("AA:BB")["device_type"] == "Zellenradschleuse"
+        zr.device_type()
+        assert cache.lookup("AA:BB")["device_type"] == "Zellenradschleuse-v2"
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from metexon.constants import BLOWER_PID_UUID, SYSTEM_STATE_UUID
+from metexon.gatt_stats import GattStats, LatencyHistogram
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def test_histogram_quantiles_within_bucket_precision():
+    h = LatencyHistogram()
+    for ms in range(1, 1001):
+        h.record(ms * 1_000_000)
+    assert h.count == 1000
+    assert h.quantile(0.5) == pytest.approx(0.5, rel=0.07)
+    assert h.quantile(0.99) == pytest.approx(0.99, rel=0.07)
+    assert h.quantile(1.0) == pytest.approx(1.0)
+    assert h.quantile(0.0) == pytest.approx(0.001, rel=0.07)
+    assert h.mean == pytest.approx(0.5005)
+
+    # Constant memory: huge and tiny values share the fixed bucket array.
+    n = len(h.counts)
+    h.record(10 ** 18)
+    h.record(0)
+    assert len(h.counts) == n
+
+    other = LatencyHistogram()
+    other.record(5_000_000_000)
+    h.merge(other)
+    assert h.max_ns == 10 ** 18 and h.min_ns == 0 and h.count == 1003
+
+
+def test_stats_summary_and_format():
+    stats = GattStats()
+    stats.record("read", "abc", 2_000_000, 20)
+    stats.record("read", "abc", 4_000_000, 20, error=True)
+    s = stats.summary()["abc"]["read"]
+    assert (s["calls"], s["errors"], s["bytes"]) == (2, 1, 40)
+    assert s["max_s"] == pytest.approx(0.004)
+    assert "X read: 2 calls, 1 errors, 40 B" in stats.format_summary({"abc": "X"})
+    stats.reset()
+    assert stats.summary() == {}
+
+
+def test_device_records_reads_writes_and_errors():
+    sim = SimulatedZellenradschleuse(latency_s=0.01)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        for _ in range(3):
+            state = zr.read_system_state()
+        zr.write_blower_pid(zr.read_blower_pid())
+        sim.fail_next(1)
+        with pytest.raises(Exception):
+            zr.read_system_state()
+
+        stats = zr.gatt_stats()
+        ss = stats[str(SYSTEM_STATE_UUID).lower()]["read"]
+        assert ss["calls"] == 4 and ss["errors"] == 1
+        assert ss["bytes"] == 3 * len(state.to_bytes())
+        assert 0.005 < ss["p50_s"] < 0.5
+        pid = stats[str(BLOWER_PID_UUID).lower()]
+        assert pid["read"]["calls"] == 1 and pid["write"]["calls"] == 1
+        assert pid["write"]["bytes"] == pid["read"]["bytes"] > 0
+
+        zr.reset_gatt_stats()
+        assert zr.gatt_stats() == {}
+
+
+def test_periodic_summary_callback():
+    summaries = []
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim, stats_interval_s=0.05,
+                                 stats_callback=summaries.append) as zr:
+        zr.read_system_state()
+        deadline = time.monotonic() + 2.0
+        while not summaries and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert summaries and str(SYSTEM_STATE_UUID).lower() in summaries[-1]
+    count = len(summaries)
+    time.sleep(0.15)
+    assert len(summaries) == count  # reporter stopped on disconnect
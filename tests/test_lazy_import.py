@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+import metexon
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_import_does_not_load_bleak():
+    code = ("import sys, metexon, metexon.zellenradschleuse.structures; "
+            "print(sorted(m for m in ('bleak', 'metexon.client', 'metexon.discovery') if m in sys.modules))")
+    assert _run(code) == "[]"
+
+
+def test_lazy_names_resolve():
+    from metexon.zellenradschleuse.client import ZellenradschleuseClient
+
+    assert metexon.ZellenradschleuseClient is ZellenradschleuseClient
+    assert metexon.zsentinels.PWM_NO_CHANGE == 0xFFFF
+    assert set(metexon.__all__) <= set(dir(metexon))
+    assert _run("from metexon import discover_metexon; print(discover_metexon.__name__)") == "discover_metexon"
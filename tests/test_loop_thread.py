@@ -0,0 +1,32 @@
+import time
+
+from metexon.loop_thread import AsyncLoopThread, shared_loop_threads
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def test_close_does_not_wait_for_timeout():
+    t = AsyncLoopThread()
+    t0 = time.perf_counter()
+    t.close()
+    assert time.perf_counter() - t0 < 1.0
+
+
+def test_sync_clients_share_reference_counted_loop():
+    a = ZellenradschleuseClient("A", client_factory=SimulatedZellenradschleuse())
+    b = ZellenradschleuseClient("B", client_factory=SimulatedZellenradschleuse())
+    a.connect()
+    b.connect()
+    assert a._loop_thread is b._loop_thread
+    assert shared_loop_threads() == {a._loop_thread: 2}
+    a.disconnect()
+    assert b.read_system_state().state == 1
+    b.disconnect()
+    assert shared_loop_threads() == {}
+
+
+def test_dedicated_loop_when_not_shared():
+    a = ZellenradschleuseClient("A", client_factory=SimulatedZellenradschleuse(), shared_loop=False)
+    with a:
+        assert a._loop_thread not in shared_loop_threads()
+    assert a._loop_thread is None
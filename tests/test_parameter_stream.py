@@ -0,0 +1,102 @@
+import math
+import struct
+
+import pytest
+
+from metexon.zellenradschleuse.parameter_stream_client import (
+    ParameterStreamFrame, _FRAME_STRUCT, _frames_from_payload,
+)
+
+
+def _frame(ts, pid, vtype, payload):
+    return _FRAME_STRUCT.pack(ts, pid, vtype, len(payload), payload)
+
+
+FRAMES = [
+    _frame(1000, 101, 1, struct.pack('<B', 200)),
+    _frame(2000, 102, 2, struct.pack('<H', 65000)),
+    _frame(3000, 103, 3, struct.pack('<I', 4000000000)),
+    _frame(4000, 104, 4, struct.pack('<Q', 2**40 + 3)),
+    _frame(5000, 105, 5, struct.pack('<i', -12345)),
+    _frame(6000, 106, 6, struct.pack('<f', 1.25)),
+    _frame(7000, 107, 7, struct.pack('<B', 1)),
+    _frame(8000, 108, 9, b'\x01\x02'),
+]
+
+
+def test_batch_decode_matches_single_frame_decode():
+    np = pytest.importorskip("numpy")
+    from metexon.zellenradschleuse.parameter_stream_batch import decode_parameter_stream_frames
+
+    batch = decode_parameter_stream_frames(b''.join(FRAMES))
+    assert len(batch) == len(FRAMES)
+    for i, raw in enumerate(FRAMES):
+        frame = ParameterStreamFrame.from_bytes(raw)
+        assert batch.timestamp_us[i] == frame.timestamp_us
+        assert batch.parameter_id[i] == frame.parameter_id
+        assert batch.value_type[i] == frame.value_type
+        if isinstance(frame.value, bytes):
+            assert not batch.valid[i]
+            assert math.isnan(batch.value[i])
+        else:
+            assert batch.valid[i]
+            assert batch.value[i] == pytest.approx(float(frame.value))
+            if frame.value_type != 6:
+                assert batch.value_int[i] == int(frame.value)
+    assert batch.value_int.dtype == np.int64
+
+
+def test_batch_decode_rejects_partial_frames():
+    pytest.importorskip("numpy")
+    from metexon.zellenradschleuse.parameter_stream_batch import decode_parameter_stream_frames
+
+    with pytest.raises(ValueError):
+        decode_parameter_stream_frames(b''.join(FRAMES)[:-1])
+
+
+def test_misaligned_notification_keeps_whole_frames(caplog):
+    frames = _frames_from_payload(b''.join(FRAMES[:3]) + b'\x00' * 5)
+    assert [f.parameter_id for f in frames] == [101, 102, 103]
+    assert "Dropping 5 trailing bytes" in caplog.text
+
+
+def test_decoder_table_attaches_names_and_matches_generic_decode():
+    from metexon.zellenradschleuse.parameter_stream_client import ParameterStreamDecoder
+
+    decoder = ParameterStreamDecoder([
+        {"id": 101, "name": "state", "type": "u8", "desc": ""},
+        {"id": 106, "name": "pressure1", "type": "f32", "unit": "Pa", "desc": ""},
+        {"id": 107, "name": "enabled", "type": "bool", "desc": ""},
+        # declared type disagrees with the frame's value_type -> generic decode
+        {"id": 105, "name": "encoder", "type": "u32", "desc": ""},
+    ])
+    for raw in FRAMES:
+        generic = ParameterStreamFrame.from_bytes(raw)
+        frame = decoder.decode(raw)
+        assert frame.value == generic.value
+        assert frame.name == decoder.name(generic.parameter_id)
+    frame = decoder.decode(FRAMES[5])
+    assert (frame.name, frame.unit, frame.value) == ("pressure1", "Pa", 1.25)
+
+
+def test_monitor_drops_duplicates_and_counts_gaps():
+    from metexon.zellenradschleuse.parameter_stream_stats import ParameterStreamMonitor
+
+    monitor = ParameterStreamMonitor(interval_ms=100, reset_threshold_us=500_000)
+    accepted = []
+    # 0, 100 (read twice), 200, then 3 samples lost, 600
+    for ts_ms in [0, 100, 100, 200, 600]:
+        frame = ParameterStreamFrame(ts_ms * 1000, 5, 6, 4, b'', 0.0)
+        accepted.append(monitor.accept(frame))
+    assert accepted == [True, True, False, True, True]
+    st = monitor.parameter(5)
+    assert (st.frames, st.duplicates, st.gaps, st.missed) == (4, 1, 1, 3)
+    assert st.rate_hz == pytest.approx(5.0)
+    summary = monitor.summary()
+    assert summary["duplicates"] == 1 and summary["missed"] == 3
+    # device reboot: timestamps restart, and so does the rate estimate
+    assert monitor.accept(ParameterStreamFrame(0, 5, 6, 4, b'', 0.0))
+    assert st.rate_hz is None and st.frames == 5
+    for ts_ms in [100, 200]:
+        assert monitor.accept(ParameterStreamFrame(ts_ms * 1000, 5, 6, 4, b'', 0.0))
+    assert st.rate_hz == pytest.approx(10.0)
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from metexon.zellenradschleuse import AsyncZellenradschleuseClient
+from metexon.zellenradschleuse.parameter_stream_queue import ParameterStreamQueue
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def _drain(q):
+    async def run():
+        out = []
+        q.close()
+        while True:
+            item = await q.get()
+            if item is None:
+                return out
+            out.append(item)
+    return run()
+
+
+@pytest.mark.parametrize("overflow,expected,dropped", [
+    ("drop_oldest", [7, 8, 9], 7),
+    ("drop_newest", [0, 1, 2], 7),
+    ("block", list(range(6)), 4),  # 3 queued + 3 parked
+])
+def test_overflow_policies(overflow, expected, dropped):
+    async def main():
+        q = ParameterStreamQueue(maxsize=3, overflow=overflow)
+        for i in range(10):
+            q.put_nowait(i)
+        assert len(q) == 3
+        out = await _drain(q)
+        assert out == expected
+        assert q.stats.dropped == dropped
+        assert q.stats.delivered == len(expected)
+    asyncio.run(main())
+
+
+def test_block_policy_put_waits_for_space():
+    async def main():
+        q = ParameterStreamQueue(maxsize=1, overflow="block")
+        await q.put(1)
+        pending = asyncio.ensure_future(q.put(2))
+        await asyncio.sleep(0)
+        assert not pending.done()
+        assert await q.get() == 1
+        await pending
+        assert await q.get() == 2
+    asyncio.run(main())
+
+
+def test_block_policy_bounds_notified_frames():
+    sim = SimulatedZellenradschleuse(notify=True)
+
+    async def main():
+        async with AsyncZellenradschleuseClient("SIM", client_factory=sim) as zr:
+            await zr.aparameter_stream_start(interval_ms=1, ids=[101])
+            async with zr.aiter_parameter_stream_frames(maxsize=2, overflow="block") as frames:
+                assert frames.mode == "notify"
+                await asyncio.sleep(0.1)  # consumer stalls while frames are notified
+                stats = frames.stats
+                assert len(frames._queue) == 2
+                assert stats.max_parked == 2
+                assert stats.dropped_newest > 0
+                assert stats.received == 2 + 2 + stats.dropped_newest
+            await zr.aparameter_stream_stop()
+    asyncio.run(main())
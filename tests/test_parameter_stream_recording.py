@@ -0,0 +1,82 @@
+import struct
+
+import pytest
+
+from metexon.zellenradschleuse.parameter_stream_client import ParameterStreamFrame, _FRAME_STRUCT
+from metexon.zellenradschleuse.parameter_stream_recording import (
+    ParameterStreamRecorder,
+    ParameterStreamRecording,
+)
+
+PARAMS = [
+    {"id": 102, "name": "pressure1", "type": "f32", "desc": "Pressure 1", "extra": 1},
+    {"id": 103, "name": "rpm", "type": "u32", "desc": "Blower RPM"},
+]
+
+
+def _frames(n):
+    for i in range(n):
+        if i % 2:
+            yield ParameterStreamFrame.from_bytes(_FRAME_STRUCT.pack(i * 150, 103, 3, 4, struct.pack('<I', i)))
+        else:
+            yield ParameterStreamFrame.from_bytes(_FRAME_STRUCT.pack(i * 150, 102, 6, 4, struct.pack('<f', i / 2)))
+
+
+def test_record_and_replay(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "session.mxps"
+    with ParameterStreamRecorder(path, PARAMS, metadata={"address": "AA"}) as rec:
+        for frame in _frames(10):
+            rec.write(frame)
+    assert rec.frames_written == 10
+
+    replay = ParameterStreamRecording(path)
+    assert len(replay) == 10
+    assert replay.parameters[0] == {"id": 102, "name": "pressure1", "type": "f32", "desc": "Pressure 1"}
+    assert replay.metadata == {"address": "AA"}
+    assert replay.parameter_names() == {102: "pressure1", 103: "rpm"}
+    assert list(replay.records.timestamp_us[:3]) == [0, 150, 300]
+    batch = replay.decode()
+    assert list(batch.value) == [f.value for f in _frames(10)]
+    assert replay.frame(3) == list(_frames(4))[3]
+
+
+def test_append_drops_truncated_record(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "session.mxps"
+    frames = list(_frames(4))
+    with ParameterStreamRecorder(path, PARAMS) as rec:
+        rec.write(frames[0])
+        rec.write_raw(frames[1].to_bytes())
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+    assert len(ParameterStreamRecording(path)) == 2
+    with ParameterStreamRecorder(path, append=True) as rec:
+        rec.write(frames[2])
+    replay = ParameterStreamRecording(path)
+    assert len(replay) == 3
+    assert replay.frame(2) == frames[2]
+    assert replay.parameters[1]["name"] == "rpm"
+
+
+def test_host_time_is_recorded(tmp_path):
+    pytest.importorskip("numpy")
+    frames = list(_frames(3))
+    frames[1].host_time_ns = 123_456_789
+    with ParameterStreamRecorder(tmp_path / "a.mxps", PARAMS) as rec:
+        for frame in frames:
+            rec.write(frame)
+    with ParameterStreamRecorder(tmp_path / "b.mxps", PARAMS, host_time=False) as rec:
+        for frame in frames:
+            rec.write(frame)
+
+    with_time = ParameterStreamRecording(tmp_path / "a.mxps")
+    assert with_time.has_host_time
+    assert list(with_time.decode().host_time_ns) == [-1, 123_456_789, -1]
+    assert with_time.frame(1).host_time_ns == 123_456_789
+    assert with_time.monotonic_to_unix_ns is not None
+
+    without_time = ParameterStreamRecording(tmp_path / "b.mxps")
+    assert not without_time.has_host_time
+    assert without_time.decode().host_time_ns is None
+    assert list(without_time.decode().value) == list(with_time.decode().value)
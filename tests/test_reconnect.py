@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from metexon.exceptions import ConnectionLostError
+from metexon.supervisor import ReconnectPolicy
+from metexon.zellenradschleuse.constants import NVS_LIST_UUID
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+FAST = ReconnectPolicy(initial_delay_s=0.01, max_delay_s=0.05, wait_timeout_s=2.0)
+
+
+def test_policy_backoff_is_capped_and_jittered():
+    policy = ReconnectPolicy(initial_delay_s=1.0, max_delay_s=8.0, jitter=0.5)
+    delays = [policy.delay(n) for n in range(6)]
+    assert 0.5 <= delays[0] <= 1.0
+    assert all(4.0 <= d <= 8.0 for d in delays[3:])
+
+
+def test_pending_call_waits_for_reconnect():
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim, reconnect=FAST) as zr:
+        sim.fail_next(2)  # the first two reconnect attempts fail
+        sim.drop_connections()
+        assert zr.read_system_state().state == 1
+        assert zr.reconnect_count == 1
+
+
+def test_stream_and_notifications_are_restored():
+    sim = SimulatedZellenradschleuse()
+    frames = []
+    got_frame = threading.Event()
+
+    def on_frame(frame):
+        frames.append(frame)
+        got_frame.set()
+
+    with ZellenradschleuseClient("SIM", client_factory=sim, reconnect=FAST) as zr:
+        zr.parameter_stream_list()
+        zr.parameter_stream_start(interval_ms=10, ids=[102])
+        assert zr.parameter_stream_subscribe(on_frame) == "notify"
+        assert got_frame.wait(1.0)
+        sim.drop_connections(reboot=True)
+        assert not sim.stream["running"]
+        zr.device_type()  # waits until the session is restored
+        got_frame.clear()
+        assert got_frame.wait(1.0)
+        assert sim.stream["running"] and sim.stream["ids"] == [102] and sim.stream["interval_ms"] == 10
+        zr.parameter_stream_unsubscribe()
+        zr.parameter_stream_stop()
+    assert {f.parameter_id for f in frames} == {102}
+
+
+def test_gives_up_after_max_attempts():
+    sim = SimulatedZellenradschleuse()
+    policy = ReconnectPolicy(initial_delay_s=0.01, max_attempts=2, wait_timeout_s=5.0)
+    with ZellenradschleuseClient("SIM", client_factory=sim, reconnect=policy) as zr:
+        sim.fail_next(10)
+        sim.drop_connections()
+        t0 = time.perf_counter()
+        with pytest.raises(ConnectionLostError):
+            zr.read_system_state()
+        assert time.perf_counter() - t0 < 2.0
+
+
+def test_link_loss_between_list_write_and_read_repeats_the_page():
+    sim = SimulatedZellenradschleuse(page_size=2)
+    write = sim._write
+    list_writes = []
+
+    def drop_after_second_page_write(client, key, data):
+        write(client, key, data)
+        if key == str(NVS_LIST_UUID).lower():
+            list_writes.append(data)
+            if len(list_writes) == 2:
+                sim.drop_connections()  # the device forgets the offset before it is read
+
+    sim._write = drop_after_second_page_write
+    with ZellenradschleuseClient("SIM", client_factory=sim, reconnect=FAST) as zr:
+        keys = [entry["key"] for entry in zr.nvs_list()]
+        assert zr.reconnect_count == 1
+    assert keys == list(sim.nvs)
+    assert list_writes[1] == list_writes[2]  # the offset was written again after the reconnect
+
+
+def test_deadline_while_link_is_down():
+    sim = SimulatedZellenradschleuse()
+    policy = ReconnectPolicy(initial_delay_s=10.0, wait_timeout_s=0.1)
+    with ZellenradschleuseClient("SIM", client_factory=sim, reconnect=policy) as zr:
+        sim.drop_connections()
+        time.sleep(0.05)
+        with pytest.raises(ConnectionLostError):
+            zr.read_blower_pid()
+
+
+def test_only_reads_and_idempotent_writes_are_retried():
+    sim = SimulatedZellenradschleuse(latency_s=0.1)
+    with ZellenradschleuseClient("SIM", client_factory=sim, reconnect=FAST) as zr:
+        threading.Timer(0.03, sim.drop_connections).start()
+        with pytest.raises(ConnectionLostError, match="not retried"):
+            zr.nvs_set("feeder_rpm", 900)  # may have been applied; never sent twice
+        assert zr.nvs_get("feeder_rpm")["value"] == "1200"
+
+        threading.Timer(0.03, sim.drop_connections).start()
+        assert zr.read_blower_pid().kp == pytest.approx(1.5)  # re-issued after reconnect
+
+        pid = zr.read_blower_pid()
+        pid.kp = 2.5
+        threading.Timer(0.03, sim.drop_connections).start()
+        zr.write_blower_pid(pid)  # complete structure: safe to repeat
+        assert zr.read_blower_pid().kp == pytest.approx(2.5)
+        assert zr.reconnect_count == 3
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+from bleak.exc import BleakError
+
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+from metexon.zellenradschleuse.update_helpers import partial_system_state
+
+
+def test_typed_reads_and_partial_writes():
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        assert zr.device_type() == "Zellenradschleuse"
+        zr.write_system_state(partial_system_state(blowerPWM=700))
+        zr.write_rgb_led([(10, 20, 30)])
+        state = zr.read_system_state()
+        assert state.blowerPWM == 700
+        assert state.getriebemotorPWM == 0
+        assert zr.read_rgb_led() == [(10, 20, 30), (0, 0, 0)]
+        assert zr.read_blower_pid().kp == pytest.approx(1.5)
+        zr.set_wifi(ssid="lab")
+        assert zr.wifi_status()["ssid"] == "lab"
+
+
+def test_nvs_protocol_pages_and_errors():
+    sim = SimulatedZellenradschleuse(page_size=2)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        values = zr.nvs_read_all()
+        assert values["feeder_rpm"] == 1200
+        assert len(values) == len(sim.nvs)
+        zr.nvs_set("feeder_rpm", 900)
+        assert zr.nvs_get("feeder_rpm")["value"] == "900"
+        with pytest.raises(KeyError):
+            zr.nvs_get("missing")
+        with pytest.raises(RuntimeError):
+            zr.nvs_set("blower_kp", "abc")
+
+
+@pytest.mark.parametrize("notify", [True, False])
+def test_parameter_stream(notify):
+    sim = SimulatedZellenradschleuse(notify=notify)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        params = zr.parameter_stream_list()
+        assert [p["id"] for p in params] == [p["id"] for p in sim.stream_parameters]
+        assert zr.parameter_stream_supports_notify() is notify
+        zr.parameter_stream_start(interval_ms=10, ids=[102, 108])
+        frames = list(zr.iter_parameter_stream_frames(duration_s=0.2, poll_interval_s=0.005))
+        zr.parameter_stream_stop()
+    assert frames
+    assert {f.parameter_id for f in frames} <= {102, 108}
+    assert frames[0].name in ("pressure1", "encoder")
+
+
+@pytest.mark.parametrize("notify", [True, False])
+def test_parameter_stream_subscription_ends_on_disconnect(notify):
+    sim = SimulatedZellenradschleuse(notify=notify)
+    zr = ZellenradschleuseClient("SIM", client_factory=sim)
+    try:
+        zr.connect()
+        assert zr.parameter_stream_subscribe(lambda frame: None) == ("notify" if notify else "poll")
+        task = zr._stream_subscription[1]
+        zr.disconnect()
+        assert zr._stream_subscription is None
+        assert task is None or task.cancelled() or task.done()
+        zr.connect()
+        zr.parameter_stream_subscribe(lambda frame: None)
+        zr.parameter_stream_unsubscribe()
+    finally:
+        zr.disconnect()
+
+
+def test_parameter_stream_poll_failure_ends_subscription(caplog):
+    sim = SimulatedZellenradschleuse(notify=False)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        sim.fail_next()
+        zr.parameter_stream_subscribe(lambda frame: None, poll_interval_s=0.001)
+        deadline = time.monotonic() + 2.0
+        while zr._stream_subscription is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert zr._stream_subscription is None
+        assert "polling failed" in caplog.text
+        assert zr.parameter_stream_subscribe(lambda frame: None) == "poll"
+
+
+def test_failure_injection_and_latency():
+    sim = SimulatedZellenradschleuse(latency_s=0.02, mtu=23)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        sim.fail_next()
+        with pytest.raises(BleakError):
+            zr.read_system_state()
+        t0 = time.perf_counter()
+        zr.read_blower_pid()  # 72 bytes at 20 bytes per packet -> 4 packets
+        assert time.perf_counter() - t0 >= 0.08
+
+
+def test_drop_connections_invokes_disconnected_callback():
+    sim = SimulatedZellenradschleuse()
+    dropped = []
+
+    async def main():
+        client = sim("SIM", disconnected_callback=dropped.append)
+        async with client:
+            sim.drop_connections()
+            assert not client.is_connected
+            with pytest.raises(BleakError):
+                await client.read_gatt_char(sim.services.get_characteristic(1 + 1))
+
+    asyncio.run(main())
+    assert len(dropped) == 1
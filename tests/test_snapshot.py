@@ -0,0 +1,22 @@
+import time
+
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def test_snapshot_reads_concurrently_and_timestamps_each_value():
+    sim = SimulatedZellenradschleuse(latency_s=0.05)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        t0 = time.perf_counter()
+        snap = zr.snapshot(wifi=True)
+        assert time.perf_counter() - t0 < 0.15  # four reads, one round trip
+        assert snap.system_state.state == 1
+        assert snap.blower_pid.update_interval_ms == 50
+        assert snap.manual_control is not None
+        assert "ssid" in snap.wifi
+        assert set(snap.timestamps_ns) == {"system_state", "blower_pid", "manual_control", "wifi"}
+        assert all(ts >= snap.started_ns for ts in snap.timestamps_ns.values())
+        assert set(snap.to_json()) >= {"system_state", "wifi", "timestamps_ns"}
+
+        partial = zr.snapshot(blower_pid=False, manual_control=False)
+        assert partial.blower_pid is None and set(partial.timestamps_ns) == {"system_state"}
@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from metexon.zellenradschleuse.parameter_stream_client import ParameterStreamFrame
+from metexon.zellenradschleuse.telemetry import ParameterRingBuffer, ParameterTelemetryStore
+
+
+def test_ring_buffer_wraps_and_keeps_latest():
+    buf = ParameterRingBuffer(4)
+    for i in range(10):
+        buf.append(i * 100, float(i))
+    ts, vals = buf.last()
+    assert list(ts) == [600, 700, 800, 900]
+    assert list(vals) == [6.0, 7.0, 8.0, 9.0]
+    assert list(buf.last(2)[1]) == [8.0, 9.0]
+    assert buf.latest() == (900, 9.0)
+
+
+def test_ring_buffer_views_are_zero_copy():
+    buf = ParameterRingBuffer(8)
+    for i in range(5):
+        buf.append(i, float(i))
+    ts, vals = buf.last(3)
+    assert np.shares_memory(vals, buf._values)
+    assert list(buf.since(3)[0]) == [3, 4]
+
+
+def test_ring_buffer_extend_matches_append():
+    a = ParameterRingBuffer(5)
+    b = ParameterRingBuffer(5)
+    a.append(0, 0.0)
+    b.append(0, 0.0)
+    ts = np.arange(1, 13, dtype=np.uint64)
+    for t in ts:
+        a.append(int(t), float(t))
+    b.extend(ts, ts.astype(float))
+    assert list(a.last()[0]) == list(b.last()[0])
+    assert list(a.last()[1]) == list(b.last()[1])
+
+
+def test_store_keys_by_parameter_id():
+    store = ParameterTelemetryStore(capacity=3, capacities={2: 1})
+    for i in range(5):
+        store.add_frame(ParameterStreamFrame(i, 1, 6, 4, b'', float(i)))
+        store.add_frame(ParameterStreamFrame(i, 2, 6, 4, b'', float(-i)))
+    assert store.parameter_ids() == [1, 2]
+    assert list(store.last(1)[1]) == [2.0, 3.0, 4.0]
+    assert list(store.last(2)[1]) == [-4.0]
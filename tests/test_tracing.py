@@ -0,0 +1,88 @@
+import pytest
+
+from metexon import tracing
+from metexon.constants import SYSTEM_STATE_UUID
+from metexon.tracing import RecordingTracer, set_tracer, span
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+@pytest.fixture
+def recorder():
+    rec = RecordingTracer()
+    previous = set_tracer(rec)
+    try:
+        yield rec
+    finally:
+        set_tracer(previous)
+
+
+def test_method_spans_parent_gatt_spans_across_threads(recorder):
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        with span("calibrate", run=1) as root:
+            zr.read_system_state()
+            zr.write_rgb_led([(1, 2, 3)])
+
+    names = [s.name for s in recorder.spans]
+    assert names[0] == "connect" and names[-1] == "disconnect"
+    read, write = recorder.children(root)
+    assert (read.name, write.name) == ("read_system_state", "write_rgb_led")
+    assert read.attributes["address"] == "SIM"
+    (gatt_read,) = recorder.children(read)
+    assert gatt_read.name == "gatt.read"
+    assert gatt_read.attributes["uuid"] == str(SYSTEM_STATE_UUID).lower()
+    assert gatt_read.attributes["bytes"] > 0 and gatt_read.depth == 2
+    (nested,) = recorder.children(write)
+    assert nested.name == "write_system_state"
+    assert [s.name for s in recorder.children(nested)] == ["gatt.write"]
+    assert root.duration_s >= read.duration_s >= gatt_read.duration_s > 0
+
+
+def test_paged_list_spans_carry_offsets(recorder):
+    sim = SimulatedZellenradschleuse(page_size=2)
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        entries = zr.nvs_list()
+    (listing,) = [s for s in recorder.spans if s.name == "nvs_list"]
+    pages = recorder.children(listing)
+    assert [p.name for p in pages] == ["nvs_list.page"] * len(pages)
+    assert [p.attributes["offset"] for p in pages] == list(range(0, 2 * len(pages), 2))
+    assert sum(p.attributes["entries"] for p in pages) == len(entries)
+    assert all(len(recorder.children(p)) == 2 for p in pages)  # write offset + read page
+
+
+def test_errors_are_recorded_on_spans(recorder):
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        sim.fail_next(1)
+        with pytest.raises(Exception) as info:
+            zr.read_blower_pid()
+    (failed,) = [s for s in recorder.spans if s.name == "read_blower_pid"]
+    assert failed.error is info.value
+    assert recorder.children(failed)[0].attributes["error"] == type(info.value).__name__
+
+
+def test_legacy_client_coroutines_are_traced(recorder):
+    from metexon import Zellenradschleuse
+
+    sim = SimulatedZellenradschleuse()
+    with Zellenradschleuse("SIM", client_factory=sim) as zr:
+        state = zr._run(zr.asystem_state())
+        zr._run(zr.aset_system_state(state))
+        assert zr._run(zr.adevice_type()) == "Zellenradschleuse"
+    by_name = {s.name: s for s in recorder.spans}
+    for name, op in [("system_state", "gatt.read"), ("set_system_state", "gatt.write"),
+                     ("device_type", "gatt.read")]:
+        assert by_name[name].attributes["address"] == "SIM"
+        assert [c.name for c in recorder.children(by_name[name])] == [op]
+    assert all(s.parent is not None for s in recorder.spans if s.name.startswith("gatt."))
+
+
+def test_disabled_tracing_records_nothing():
+    assert tracing.tracer is None
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        with span("outer") as s:
+            assert s is None
+            zr.read_system_state()
+    assert tracing.current_span.get() is None
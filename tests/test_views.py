@@ -0,0 +1,58 @@
+import pytest
+
+from metexon.zellenradschleuse import ZellenradschleuseClient
+from metexon.zellenradschleuse.structures import RGB, BlowerPID, ManualControl, SystemState
+from metexon.zellenradschleuse.views import BlowerPIDView, ManualControlView, SystemStateView
+from metexon.zellenradschleuse.simulator import SimulatedZellenradschleuse
+
+
+def _state(p1=1.5, p2=2.5):
+    return SystemState(3, p1, p2, 1013.0, 0.75, 512, 128, 800, 1500.5, [RGB(10, 20, 30), RGB(40, 50, 60)], -7, 9999)
+
+
+def test_views_decode_fields_in_place():
+    ss = _state()
+    buf = bytearray(ss.to_bytes())
+    view = SystemStateView(memoryview(buf))
+    assert (view.state, view.pressure1, view.pressure2, view.encoderCount) == (3, 1.5, 2.5, -7)
+    assert view.pressures() == (1.5, 2.5)
+    assert view.rgb == ss.rgb and view.rgb1_blue == 60
+    assert view.to_json() == ss.to_json() and view.to_dataclass() == ss
+    assert SystemStateView.pressure2.offset == 5
+
+    # No copy: the view follows its buffer, and assignments pack in place.
+    buf[:] = _state(p1=4.0).to_bytes()
+    assert view.pressure1 == 4.0
+    view.blowerPWM = 900
+    assert SystemState.from_bytes(buf).blowerPWM == 900
+    with pytest.raises(TypeError):
+        SystemStateView(ss.to_bytes()).state = 1  # bytes are read-only
+
+    view.rebind(_state(p2=8.0).to_bytes())
+    assert view.pressures() == (1.5, 8.0)
+    with pytest.raises(ValueError):
+        view.rebind(b"\x00" * 3)
+
+    pid = BlowerPID(1.0, 0.5, 0.25, 100.0, 95.0, 5.0, 10.0, 111, 222, 10, 1023, 50, 3, 123456, 0.0, 25.0,
+                    (1.0, 2.0, 3.0, 4.0))
+    pview = BlowerPIDView(pid.to_bytes())
+    assert (pview.kp, pview.max_pwm_output, pview.reserved_floats) == (1.0, 1023, (1.0, 2.0, 3.0, 4.0))
+    assert pview.to_dataclass() == pid
+
+    mc = ManualControl(1200.0, 55.5, 66.5, 1, 5.0, b"abcdefgh")
+    mview = ManualControlView(bytearray(mc.to_bytes()))
+    assert (mview.enable_getriebemotor_nvs, mview.reserved) == (1, b"abcdefgh")
+    mview.feeder_seconds = 7.0
+    assert ManualControl.from_bytes(mview.buffer).feeder_seconds == 7.0
+    assert "feeder_seconds=7.0" in repr(mview)
+
+
+def test_client_reads_and_rebinds_system_state_view():
+    sim = SimulatedZellenradschleuse()
+    with ZellenradschleuseClient("SIM", client_factory=sim) as zr:
+        full = zr.read_system_state()
+        view = zr.read_system_state_view()
+        assert view.pressures() == (full.pressure1, full.pressure2)
+        again = zr.read_system_state_view(view)
+        assert again is view
+        assert view.to_json() == zr.read_system_state().to_json()
@@ -49,3 +49,33 @@ def test_zellenradschleuse_blower_pid_roundtrip():
             assert math.isnan(a)
         else:
             assert a == b
+
+
+def test_records_match_dataclasses():
+    from metexon.zellenradschleuse.structures import (
+        RGB, ManualControl, ManualControlRecord, SystemState, SystemStateRecord, BlowerPIDRecord,
+    )
+
+    ss = SystemState(3, 1.5, 2.5, 1013.0, 0.75, 512, 128, 800, 1500.5, [RGB(10, 20, 30), RGB(40, 50, 60)], -7, 9999)
+    rec = SystemStateRecord.from_bytes(bytearray(ss.to_bytes()))
+    assert not hasattr(rec, "__dict__")
+    assert rec.to_json() == ss.to_json()
+    assert rec.rgb == ss.rgb and rec.rgb1_blue == 60
+    assert rec.to_bytes() == ss.to_bytes()
+    assert rec.to_dataclass() == ss
+    assert SystemStateRecord.from_dataclass(ss) == rec
+    assert SystemStateRecord.from_json(ss.to_json()) == rec
+    empty = SystemStateRecord.from_json({})
+    assert math.isnan(empty.pressure1) and empty.rgb == SystemState.from_json({}).rgb
+
+    mc = ManualControl(1200.0, 55.5, 66.5, 1, 5.0)
+    mrec = ManualControlRecord.from_bytes(mc.to_bytes())
+    assert mrec.to_json() == mc.to_json() and mrec.to_dataclass() == mc
+    assert ManualControlRecord.from_json(mc.to_json()) == mrec
+
+    pid = BlowerPID(1.0, 0.5, 0.25, 100.0, 95.0, 5.0, 10.0, 111, 222, 10, 1023, 50, 3, 123456, 0.0, 25.0,
+                    (1.0, 2.0, 3.0, 4.0))
+    prec = BlowerPIDRecord.from_bytes(pid.to_bytes())
+    assert prec.to_json() == pid.to_json() and prec.to_bytes() == pid.to_bytes()
+    assert prec.to_dataclass() == pid and BlowerPIDRecord.from_dataclass(pid) == prec
+    assert "kp=1.0" in repr(prec)